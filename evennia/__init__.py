@@ -30,88 +30,89 @@ Flat-API shortcut names:
 {}
 """
 
-# Delayed loading of properties
-
-# Typeclasses
-
-DefaultAccount = None
-DefaultGuest = None
-DefaultObject = None
-DefaultCharacter = None
-DefaultRoom = None
-DefaultExit = None
-DefaultChannel = None
-DefaultScript = None
-
-# Database models
-ObjectDB = None
-AccountDB = None
-ScriptDB = None
-ChannelDB = None
-Msg = None
-ServerConfig = None
-
-# Properties
-AttributeProperty = None
-TagProperty = None
-TagCategoryProperty = None
-
-# commands
-Command = None
-CmdSet = None
-default_cmds = None
-syscmdkeys = None
-InterruptCommand = None
-
-# search functions
-search_object = None
-search_script = None
-search_account = None
-search_channel = None
-search_message = None
-search_help = None
-search_tag = None
-
-# create functions
-create_object = None
-create_script = None
-create_account = None
-create_channel = None
-create_message = None
-create_help_entry = None
+# Delayed loading of properties. The flat-API names below are imported the first
+# time they are accessed (see `__getattr__` at the end of this module), which
+# keeps starting and reloading the Server and Portal fast. Before `_init` has run,
+# they are all `None`. Values are `(module, attribute)`, where an attribute of
+# `None` means the module itself.
+
+_LAZY_API = {
+    # Typeclasses
+    "DefaultAccount": ("evennia.accounts.accounts", "DefaultAccount"),
+    "DefaultGuest": ("evennia.accounts.accounts", "DefaultGuest"),
+    "DefaultObject": ("evennia.objects.objects", "DefaultObject"),
+    "DefaultCharacter": ("evennia.objects.objects", "DefaultCharacter"),
+    "DefaultRoom": ("evennia.objects.objects", "DefaultRoom"),
+    "DefaultExit": ("evennia.objects.objects", "DefaultExit"),
+    "DefaultChannel": ("evennia.comms.comms", "DefaultChannel"),
+    "DefaultScript": ("evennia.scripts.scripts", "DefaultScript"),
+    # Database models
+    "ObjectDB": ("evennia.objects.models", "ObjectDB"),
+    "AccountDB": ("evennia.accounts.models", "AccountDB"),
+    "ScriptDB": ("evennia.scripts.models", "ScriptDB"),
+    "ChannelDB": ("evennia.comms.models", "ChannelDB"),
+    "Msg": ("evennia.comms.models", "Msg"),
+    "ServerConfig": ("evennia.server.models", "ServerConfig"),
+    # Properties
+    "AttributeProperty": ("evennia.typeclasses.attributes", "AttributeProperty"),
+    "TagProperty": ("evennia.typeclasses.tags", "TagProperty"),
+    "TagCategoryProperty": ("evennia.typeclasses.tags", "TagCategoryProperty"),
+    # commands
+    "Command": ("evennia.commands.command", "Command"),
+    "CmdSet": ("evennia.commands.cmdset", "CmdSet"),
+    "InterruptCommand": ("evennia.commands.command", "InterruptCommand"),
+    # search functions
+    "search_object": ("evennia.utils.search", "search_object"),
+    "search_script": ("evennia.utils.search", "search_script"),
+    "search_account": ("evennia.utils.search", "search_account"),
+    "search_channel": ("evennia.utils.search", "search_channel"),
+    "search_message": ("evennia.utils.search", "search_message"),
+    "search_help": ("evennia.utils.search", "search_help"),
+    "search_tag": ("evennia.utils.search", "search_tag"),
+    # create functions
+    "create_object": ("evennia.utils.create", "create_object"),
+    "create_script": ("evennia.utils.create", "create_script"),
+    "create_account": ("evennia.utils.create", "create_account"),
+    "create_channel": ("evennia.utils.create", "create_channel"),
+    "create_message": ("evennia.utils.create", "create_message"),
+    "create_help_entry": ("evennia.utils.create", "create_help_entry"),
+    # utilities
+    "lockfuncs": ("evennia.locks.lockfuncs", None),
+    "logger": ("evennia.utils.logger", None),
+    "gametime": ("evennia.utils.gametime", None),
+    "ansi": ("evennia.utils.ansi", None),
+    "spawn": ("evennia.prototypes.spawner", "spawn"),
+    "contrib": ("evennia.contrib", None),
+    "EvMenu": ("evennia.utils.evmenu", "EvMenu"),
+    "EvTable": ("evennia.utils.evtable", "EvTable"),
+    "EvForm": ("evennia.utils.evform", "EvForm"),
+    "EvEditor": ("evennia.utils.eveditor", "EvEditor"),
+    "EvMore": ("evennia.utils.evmore", "EvMore"),
+    "ANSIString": ("evennia.utils.ansi", "ANSIString"),
+    "signals": ("evennia.server.signals", None),
+    "FuncParser": ("evennia.utils.funcparser", "FuncParser"),
+    "OnDemandTask": ("evennia.scripts.ondemandhandler", "OnDemandTask"),
+    # Handlers
+    "TASK_HANDLER": ("evennia.scripts.taskhandler", "TASK_HANDLER"),
+    "TICKER_HANDLER": ("evennia.scripts.tickerhandler", "TICKER_HANDLER"),
+    "MONITOR_HANDLER": ("evennia.scripts.monitorhandler", "MONITOR_HANDLER"),
+    "ON_DEMAND_HANDLER": ("evennia.scripts.ondemandhandler", "ON_DEMAND_HANDLER"),
+    # Containers (not available in the Portal)
+    "GLOBAL_SCRIPTS": ("evennia.utils.containers", "GLOBAL_SCRIPTS"),
+    "OPTION_CLASSES": ("evennia.utils.containers", "OPTION_CLASSES"),
+}
+
+# names only available in the Server
+_SERVER_ONLY_API = ("GLOBAL_SCRIPTS", "OPTION_CLASSES")
 
 # utilities
 settings = None
-lockfuncs = None
 inputhandler = None
-logger = None
-gametime = None
-ansi = None
-spawn = None
-managers = None
-contrib = None
-EvMenu = None
-EvTable = None
-EvForm = None
-EvEditor = None
-EvMore = None
-ANSIString = None
-signals = None
-FuncParser = None
-OnDemandTask = None
 
 # Handlers
 SESSION_HANDLER = None
 PORTAL_SESSION_HANDLER = None
 SERVER_SESSION_HANDLER = None
-TASK_HANDLER = None
-TICKER_HANDLER = None
-MONITOR_HANDLER = None
-ON_DEMAND_HANDLER = None
-
-# Containers
-GLOBAL_SCRIPTS = None
-OPTION_CLASSES = None
 
 PROCESS_ID = None
 
@@ -165,90 +166,16 @@ def _init(portal_mode=False):
     if _LOADED:
         return
     _LOADED = True
-    global DefaultAccount, DefaultObject, DefaultGuest, DefaultCharacter
-    global DefaultRoom, DefaultExit, DefaultChannel, DefaultScript
-    global ObjectDB, AccountDB, ScriptDB, ChannelDB, Msg
-    global Command, CmdSet, default_cmds, syscmdkeys, InterruptCommand
-    global search_object, search_script, search_account, search_channel
-    global search_help, search_tag, search_message
-    global create_object, create_script, create_account, create_channel
-    global create_message, create_help_entry, OnDemandTask
-    global signals
-    global settings, lockfuncs, logger, utils, gametime, ansi, spawn, managers
-    global contrib, TICKER_HANDLER, MONITOR_HANDLER, SESSION_HANDLER, PROCESS_ID
-    global TASK_HANDLER, PORTAL_SESSION_HANDLER, SERVER_SESSION_HANDLER, ON_DEMAND_HANDLER
-    global GLOBAL_SCRIPTS, OPTION_CLASSES, EVENNIA_PORTAL_SERVICE, EVENNIA_SERVER_SERVICE, TWISTED_APPLICATION
-    global EvMenu, EvTable, EvForm, EvMore, EvEditor
-    global ANSIString, FuncParser
-    global AttributeProperty, TagProperty, TagCategoryProperty, ServerConfig
+    global settings, SESSION_HANDLER, PORTAL_SESSION_HANDLER, SERVER_SESSION_HANDLER
+    global PROCESS_ID, EVENNIA_PORTAL_SERVICE, EVENNIA_SERVER_SERVICE, TWISTED_APPLICATION
     global PORTAL_MODE
     PORTAL_MODE = portal_mode
 
-    # Parent typeclasses
-    # utilities
+    # the rest of the flat API is loaded on first access, see `__getattr__`
     import os
 
     from django.conf import settings
 
-    from . import contrib
-    from .accounts.accounts import DefaultAccount, DefaultGuest
-    from .accounts.models import AccountDB
-    from .commands.cmdset import CmdSet
-    from .commands.command import Command, InterruptCommand
-    from .comms.comms import DefaultChannel
-    from .comms.models import ChannelDB, Msg
-    from .locks import lockfuncs
-    from .objects.models import ObjectDB
-    from .objects.objects import (
-        DefaultCharacter,
-        DefaultExit,
-        DefaultObject,
-        DefaultRoom,
-    )
-    from .prototypes.spawner import spawn
-    from .scripts.models import ScriptDB
-    from .scripts.monitorhandler import MONITOR_HANDLER
-    from .scripts.ondemandhandler import ON_DEMAND_HANDLER, OnDemandTask
-    from .scripts.scripts import DefaultScript
-    from .scripts.taskhandler import TASK_HANDLER
-    from .scripts.tickerhandler import TICKER_HANDLER
-    from .server import signals
-    from .server.models import ServerConfig
-    from .typeclasses.attributes import AttributeProperty
-    from .typeclasses.tags import TagCategoryProperty, TagProperty
-    from .utils import ansi, class_from_module, gametime, logger
-    from .utils.ansi import ANSIString
-
-    if not PORTAL_MODE:
-        # containers
-        from .utils.containers import GLOBAL_SCRIPTS, OPTION_CLASSES
-
-    # create functions
-    from .utils.create import (
-        create_account,
-        create_channel,
-        create_help_entry,
-        create_message,
-        create_object,
-        create_script,
-    )
-    from .utils.eveditor import EvEditor
-    from .utils.evform import EvForm
-    from .utils.evmenu import EvMenu
-    from .utils.evmore import EvMore
-    from .utils.evtable import EvTable
-    from .utils.funcparser import FuncParser
-
-    # search functions
-    from .utils.search import (
-        search_account,
-        search_channel,
-        search_help,
-        search_message,
-        search_object,
-        search_script,
-        search_tag,
-    )
     from .utils.utils import class_from_module
 
     PROCESS_ID = os.getpid()
@@ -292,21 +219,30 @@ def _init(portal_mode=False):
         EVENNIA_SERVER_SERVICE = _evennia_service_class()
         EVENNIA_SERVER_SERVICE.setServiceParent(TWISTED_APPLICATION)
 
-    # API containers
 
-    class _EvContainer(object):
-        """
-        Parent for other containers
+# API containers
 
-        """
 
-        def _help(self):
-            "Returns list of contents"
-            names = [name for name in self.__class__.__dict__ if not name.startswith("_")]
-            names += [name for name in self.__dict__ if not name.startswith("_")]
-            print(self.__doc__ + "-" * 60 + "\n" + ", ".join(names))
+class _EvContainer(object):
+    """
+    Parent for other containers
+
+    """
+
+    def _help(self):
+        "Returns list of contents"
+        names = [name for name in self.__class__.__dict__ if not name.startswith("_")]
+        names += [name for name in self.__dict__ if not name.startswith("_")]
+        print(self.__doc__ + "-" * 60 + "\n" + ", ".join(names))
+
+    help = property(_help)
+
+
+def _create_managers():
+    """
+    Create the `evennia.managers` container.
 
-        help = property(_help)
+    """
 
     class DBmanagers(_EvContainer):
         """
@@ -350,8 +286,14 @@ def _init(portal_mode=False):
         # del ExternalChannelConnection
         del ObjectDB, ServerConfig, Tag, Attribute
 
-    managers = DBmanagers()
-    del DBmanagers
+    return DBmanagers()
+
+
+def _create_default_cmds():
+    """
+    Create the `evennia.default_cmds` container.
+
+    """
 
     class DefaultCmds(_EvContainer):
         """
@@ -401,8 +343,14 @@ def _init(portal_mode=False):
             add_cmds(system)
             add_cmds(unloggedin)
 
-    default_cmds = DefaultCmds()
-    del DefaultCmds
+    return DefaultCmds()
+
+
+def _create_syscmdkeys():
+    """
+    Create the `evennia.syscmdkeys` container.
+
+    """
 
     class SystemCmds(_EvContainer):
         """
@@ -431,9 +379,44 @@ def _init(portal_mode=False):
         CMD_LOGINSTART = cmdhandler.CMD_LOGINSTART
         del cmdhandler
 
-    syscmdkeys = SystemCmds()
-    del SystemCmds
-    del _EvContainer
+    return SystemCmds()
+
+
+_LAZY_CONTAINERS = {
+    "managers": _create_managers,
+    "default_cmds": _create_default_cmds,
+    "syscmdkeys": _create_syscmdkeys,
+}
+
+
+def __getattr__(name):
+    """
+    Load a flat-API name the first time it is accessed, as `evennia.<name>` or with
+    `from evennia import <name>`. The result is stored on the module, so this is
+    only called once per name.
+
+    """
+    if name not in _LAZY_API and name not in _LAZY_CONTAINERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if not _LOADED or (PORTAL_MODE and name in _SERVER_ONLY_API):
+        # not available (yet)
+        return None
+
+    if name in _LAZY_CONTAINERS:
+        value = _LAZY_CONTAINERS[name]()
+    else:
+        from importlib import import_module
+
+        modpath, attrname = _LAZY_API[name]
+        value = import_module(modpath)
+        if attrname:
+            value = getattr(value, attrname)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_API) | set(_LAZY_CONTAINERS))
 
 
 def set_trace(term_size=(140, 80), debugger="auto"):
@@ -497,7 +480,7 @@ __doc__ = DOCSTRING.format(
     "\n- "
     + "\n- ".join(
         f"evennia.{key}"
-        for key in sorted(globals())
+        for key in __dir__()
         if not key.startswith("_") and key not in ("DOCSTRING",)
     )
 )
@@ -28,11 +28,10 @@ command line. The processing of a command works as follows:
 """
 
 import types
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from copy import copy
 from itertools import chain
 from traceback import format_exc
-from weakref import WeakValueDictionary
 
 from django.conf import settings
 from django.utils.translation import gettext as _
@@ -40,6 +39,7 @@ from twisted.internet import reactor
 from twisted.internet.defer import inlineCallbacks
 from twisted.internet.task import deferLater
 
+from evennia.commands import cmdsethandler
 from evennia.commands.cmdset import CmdSet
 from evennia.commands.command import InterruptCommand
 from evennia.utils import logger, utils
@@ -49,7 +49,8 @@ _IN_GAME_ERRORS = settings.IN_GAME_ERRORS
 
 __all__ = ("cmdhandler", "InterruptCommand")
 _GA = object.__getattribute__
-_CMDSET_MERGE_CACHE = WeakValueDictionary()
+_BASE_AT_CMDSET_GET = None
+_CMDSET_MERGE_CACHE_SIZE = settings.CMDSET_MERGE_CACHE_SIZE
 
 # tracks recursive calls by each caller
 # to avoid infinite loops (commands calling themselves)
@@ -282,6 +283,151 @@ class ErrorReported(Exception):
         self.raw_string = raw_string
 
 
+class _CmdSetMergeCache:
+    """
+    Size-bounded LRU cache of merged cmdsets. The cache key is built from
+    the unique id and change-version of every cmdset going into the merger,
+    so a cmdset that is changed (or a cmdset-stack that is updated) will
+    never be served a stale merge.
+
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def get_key(cmdsets):
+        """
+        Build a merge-key from a list of cmdsets.
+
+        Args:
+            cmdsets (list): The CmdSets to merge, in merge order.
+
+        Returns:
+            tuple: The hashable key.
+
+        """
+        return tuple(
+            [
+                (cmdset.merge_uid, cmdset.merge_version, cmdset.priority, cmdset.duplicates)
+                for cmdset in cmdsets
+            ]
+        )
+
+    def get(self, key):
+        cmdset = self.cache.get(key)
+        if cmdset is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.cache.move_to_end(key)
+        return cmdset
+
+    def set(self, key, cmdset):
+        if self.maxsize <= 0:
+            return
+        self.cache[key] = cmdset
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.cache.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        return {
+            "size": len(self.cache),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+_CMDSET_MERGE_CACHE = _CmdSetMergeCache(_CMDSET_MERGE_CACHE_SIZE)
+
+
+def get_cmdset_merge_cache_stats():
+    """
+    Inspect the cmdset merge-cache.
+
+    Returns:
+        dict: Holds `size`, `maxsize`, `hits`, `misses` and `evictions`.
+
+    """
+    return _CMDSET_MERGE_CACHE.stats()
+
+
+def clear_cmdset_merge_cache():
+    """
+    Empty the cmdset merge-cache and reset its counters.
+
+    """
+    _CMDSET_MERGE_CACHE.clear()
+
+
+def _has_cmdsets(obj):
+    """
+    Check if an object may contribute cmdsets to the merge.
+
+    Args:
+        obj (Object): The object to check.
+
+    Returns:
+        bool: If `obj` has any non-empty cmdsets or customizes its
+            `at_cmdset_get` hook (which may add cmdsets on the fly).
+
+    """
+    global _BASE_AT_CMDSET_GET
+    if not _BASE_AT_CMDSET_GET:
+        from evennia.objects.objects import DefaultObject
+
+        _BASE_AT_CMDSET_GET = DefaultObject.at_cmdset_get
+    if getattr(type(obj), "at_cmdset_get", None) is not _BASE_AT_CMDSET_GET:
+        return True
+    return any(cset.key != "_EMPTY_CMDSET" for cset in obj.cmdset.cmdset_stack)
+
+
+def get_cmdset_objects(obj):
+    """
+    Get the objects inside `obj` that may contribute cmdsets when
+    merging. Objects without cmdsets (usually most of them) are skipped,
+    so they cost nothing when a command is run.
+
+    Args:
+        obj (Object): The location or object whose contents to check.
+
+    Returns:
+        list: The objects inside `obj` that have cmdsets.
+
+    Notes:
+        The result is cached on the contents-handler of `obj` and is reused
+        until its contents change or any cmdset changes anywhere.
+
+    """
+    contents_cache = obj.contents_cache
+    snapshot = contents_cache.cmdset_objects
+    if snapshot and snapshot[0] == (contents_cache.version, cmdsethandler.CMDSET_CHANGES):
+        try:
+            return [contents_cache._idcache[pk] for pk in snapshot[1]]
+        except KeyError:
+            # an object was flushed from the idmapper cache - rebuild
+            pass
+    cmdset_objects = [lobj for lobj in contents_cache.get() if _has_cmdsets(lobj)]
+    # get the versions after the check, since it may load cmdsets for the first time
+    contents_cache.cmdset_objects = (
+        (contents_cache.version, cmdsethandler.CMDSET_CHANGES),
+        [lobj.pk for lobj in cmdset_objects],
+    )
+    return cmdset_objects
+
+
 # Helper function
 def generate_cmdset_providers(called_by, session=None):
     cmdset_providers = dict()
@@ -359,8 +505,11 @@ def get_and_merge_cmdsets(
                 if location:
                     # Gather all cmdsets stored on objects in the room and
                     # also in the caller's inventory and the location itself
+                    # only objects with cmdsets are relevant
                     local_objlist = yield (
-                        location.contents_get(exclude=obj) + obj.contents_get() + [location]
+                        [lobj for lobj in get_cmdset_objects(location) if lobj != obj]
+                        + get_cmdset_objects(obj)
+                        + [location]
                     )
                     local_objlist = [
                         o
@@ -447,12 +596,9 @@ def get_and_merge_cmdsets(
             ]
 
         if cmdsets:
-            # faster to do tuple on list than to build tuple directly
-            mergehash = tuple([id(cmdset) for cmdset in cmdsets])
-            if mergehash in _CMDSET_MERGE_CACHE:
-                # cached merge exist; use that
-                cmdset = _CMDSET_MERGE_CACHE[mergehash]
-            else:
+            mergehash = _CMDSET_MERGE_CACHE.get_key(cmdsets)
+            cmdset = _CMDSET_MERGE_CACHE.get(mergehash)
+            if cmdset is None:
                 # we group and merge all same-prio cmdsets separately (this avoids
                 # order-dependent clashes in certain cases, such as
                 # when duplicates=True)
@@ -475,7 +621,7 @@ def get_and_merge_cmdsets(
                 # store the original, ungrouped set for diagnosis
                 cmdset.merged_from = cmdsets
                 # cache
-                _CMDSET_MERGE_CACHE[mergehash] = cmdset
+                _CMDSET_MERGE_CACHE.set(mergehash, cmdset)
         else:
             cmdset = None
         for cset in (cset for cset in local_obj_cmdsets if cset):
@@ -10,10 +10,118 @@ import re
 
 from django.conf import settings
 
+from evennia.commands import command as _command_module
+from evennia.commands.command import Command
 from evennia.utils.logger import log_trace
 
 _MULTIMATCH_REGEX = re.compile(settings.SEARCH_MULTIMATCH_REGEX, re.I + re.U)
 _CMD_IGNORE_PREFIXES = settings.CMD_IGNORE_PREFIXES
+_DEFAULT_MATCH = Command.match
+
+
+class CmdMatchIndex:
+    """
+    Prefix-index over the keys and aliases of all commands in a cmdset. This is
+    built once per (merged) cmdset and then re-used for every input string parsed
+    against that cmdset. Instead of calling `Command.match` on every command, the
+    input is only looked up once for every distinct key-length in the set, making
+    the lookup cost depend on the length of the input rather than on the number
+    of commands.
+
+    Commands overriding `Command.match` can't be indexed and are always checked
+    individually.
+
+    """
+
+    def __init__(self, cmdset):
+        """
+        Build the index.
+
+        Args:
+            cmdset (CmdSet or list): The Commands to index.
+
+        """
+        self.prefix_table, self.prefix_lengths = {}, set()
+        self.noprefix_table, self.noprefix_lengths = {}, set()
+        self.custom = []
+        for pos, cmd in enumerate(cmdset):
+            if type(cmd).match is not _DEFAULT_MATCH:
+                self.custom.append((pos, cmd))
+                continue
+            # rank mimics the order Command.match would test the keys in
+            for rank, cmd_key in enumerate(cmd._keyaliases):
+                self.prefix_table.setdefault(cmd_key, []).append((pos, rank, cmd, cmd_key))
+                self.prefix_lengths.add(len(cmd_key))
+            for rank, (cmd_key, raw_key) in enumerate(cmd._noprefix_aliases.items()):
+                self.noprefix_table.setdefault(cmd_key, []).append((pos, rank, cmd, raw_key))
+                self.noprefix_lengths.add(len(cmd_key))
+        self.prefix_lengths = sorted(self.prefix_lengths)
+        self.noprefix_lengths = sorted(self.noprefix_lengths)
+
+    def match(self, search_string, include_prefixes=True):
+        """
+        Find all commands matching the start of an input string.
+
+        Args:
+            search_string (str): The (lower-case) input to match against.
+            include_prefixes (bool, optional): If unset, match against the
+                prefix-stripped versions of keys/aliases.
+
+        Returns:
+            list: A list of `(cmd, cmdname, raw_cmdname)`, in the same order as
+                the commands were found in the cmdset.
+
+        """
+        if include_prefixes:
+            table, lengths = self.prefix_table, self.prefix_lengths
+        else:
+            table, lengths = self.noprefix_table, self.noprefix_lengths
+        strlen = len(search_string)
+        found = {}
+        for keylen in lengths:
+            if keylen > strlen:
+                break
+            entries = table.get(search_string[:keylen])
+            if not entries:
+                continue
+            rest = search_string[keylen:]
+            for pos, rank, cmd, raw_key in entries:
+                if pos in found and found[pos][0] < rank:
+                    continue
+                if not cmd.arg_regex or cmd.arg_regex.match(rest):
+                    found[pos] = (rank, cmd, search_string[:keylen], raw_key)
+        for pos, cmd in self.custom:
+            cmdname, raw_cmdname = cmd.match(search_string, include_prefixes=include_prefixes)
+            if cmdname:
+                found[pos] = (0, cmd, cmdname, raw_cmdname)
+        return [found[pos][1:] for pos in sorted(found)]
+
+
+def get_match_index(cmdset):
+    """
+    Get the (cached) match-index for a cmdset, (re)building it if the cmdset
+    or the keys/aliases of any Command changed since it was last built.
+
+    Args:
+        cmdset (CmdSet): The cmdset to get the index for.
+
+    Returns:
+        CmdMatchIndex: The index.
+
+    """
+    commands = cmdset.commands
+    version = (
+        cmdset.merge_version,
+        id(commands),
+        len(commands),
+        _command_module.KEYALIAS_CHANGES,
+    )
+    index = cmdset.match_index
+    if index is None or cmdset.match_index_version != version:
+        index = CmdMatchIndex(cmdset)
+        cmdset.match_index = index
+        cmdset.match_index_version = version
+    return index
 
 
 def create_match(cmdname, string, cmdobj, raw_cmdname):
@@ -66,10 +174,16 @@ def build_matches(raw_string, cmdset, include_prefixes=False):
         if not include_prefixes and len(raw_string) > 1:
             raw_string = raw_string.lstrip(_CMD_IGNORE_PREFIXES)
         search_string = raw_string.lower()
-        for cmd in cmdset:
-            cmdname, raw_cmdname = cmd.match(search_string, include_prefixes=include_prefixes)
-            if cmdname:
+        if hasattr(cmdset, "match_index"):
+            for cmd, cmdname, raw_cmdname in get_match_index(cmdset).match(
+                search_string, include_prefixes=include_prefixes
+            ):
                 matches.append(create_match(cmdname, raw_string, cmd, raw_cmdname))
+        else:
+            for cmd in cmdset:
+                cmdname, raw_cmdname = cmd.match(search_string, include_prefixes=include_prefixes)
+                if cmdname:
+                    matches.append(create_match(cmdname, raw_string, cmd, raw_cmdname))
     except Exception:
         log_trace("cmdhandler error. raw_input:%s" % raw_string)
     return matches
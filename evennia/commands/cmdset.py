@@ -27,6 +27,7 @@ Set theory.
 
 """
 
+from itertools import count
 from weakref import WeakKeyDictionary
 
 from django.utils.translation import gettext as _
@@ -35,6 +36,10 @@ from evennia.utils.utils import inherits_from, is_iter
 
 __all__ = ("CmdSet",)
 
+# unique, never-recycled identifiers for cmdset instances, used
+# by the cmdhandler's merge cache (id() values can be reused)
+_CMDSET_UID = count(1)
+
 
 class _CmdSetMeta(type):
     """
@@ -220,6 +225,12 @@ class CmdSet(object, metaclass=_CmdSetMeta):
         # this is set only on merged sets, in cmdhandler.py, in order to
         # track, list and debug mergers correctly.
         self.merged_from = []
+        # identity and change-counter, used as key by the cmdhandler merge cache
+        self.merge_uid = next(_CMDSET_UID)
+        self.merge_version = 0
+        # command-lookup index, lazily built by the cmdparser
+        self.match_index = None
+        self.match_index_version = None
 
         # initialize system
         self.at_cmdset_creation()
@@ -317,6 +328,14 @@ class CmdSet(object, metaclass=_CmdSetMeta):
         cmdset_c.commands = [cmd for cmd in cmdset_b if cmd not in cmdset_a]
         return cmdset_c
 
+    def bump_version(self):
+        """
+        Mark this cmdset as changed. This invalidates all cached mergers
+        that this cmdset was part of.
+
+        """
+        self.merge_version += 1
+
     def _instantiate(self, cmd):
         """
         checks so that object is an instantiated command and not, say
@@ -565,6 +584,7 @@ class CmdSet(object, metaclass=_CmdSetMeta):
             # extra run to make sure to avoid doublets
             commands = list(set(commands))
         self.commands = commands
+        self.merge_version += 1
 
     def remove(self, cmd):
         """
@@ -594,6 +614,7 @@ class CmdSet(object, metaclass=_CmdSetMeta):
                 pass
         else:
             self.commands = [oldcmd for oldcmd in self.commands if oldcmd != cmd]
+        self.merge_version += 1
 
     def get(self, cmd):
         """
@@ -675,6 +696,7 @@ class CmdSet(object, metaclass=_CmdSetMeta):
             else:
                 unique[cmd.key] = cmd
         self.commands = list(unique.values())
+        self.merge_version += 1
 
     def get_all_cmd_keys_and_aliases(self, caller=None):
         """
@@ -80,6 +80,8 @@ from evennia.utils import logger, utils
 __all__ = ("import_cmdset", "CmdSetHandler")
 
 _CACHED_CMDSETS = {}
+# increased whenever any cmdset stack changes, to invalidate caches depending on it
+CMDSET_CHANGES = 0
 _CMDSET_PATHS = utils.make_iter(settings.CMDSET_PATHS)
 _IN_GAME_ERRORS = settings.IN_GAME_ERRORS
 _CMDSET_FALLBACKS = settings.CMDSET_FALLBACKS
@@ -412,10 +414,15 @@ class CmdSetHandler(object):
                             cmdset.persistent = cmdset.key != "_CMDSET_ERROR"
                             self.cmdset_stack.append(cmdset)
 
+        global CMDSET_CHANGES
+        CMDSET_CHANGES += 1
+
         # merge the stack into a new merged cmdset
         new_current = None
         self.mergetype_stack = []
         for cmdset in self.cmdset_stack:
+            # the stack changed; make sure cached mergers using these sets are not reused
+            cmdset.bump_version()
             try:
                 # for cmdset's '+' operator, order matters.
                 new_current = cmdset + new_current
@@ -20,6 +20,9 @@ from evennia.utils.utils import fill, is_iter, lazy_property, make_iter
 
 CMD_IGNORE_PREFIXES = settings.CMD_IGNORE_PREFIXES
 _RE_CMD_LOCKFUNC_IN_LOCKSTRING = re.compile(r"(^|;|\s)cmd\:\w+", re.DOTALL)
+# counts run-time changes of command keys/aliases; lets the cmdparser
+# know when its cached match-indexes must be rebuilt
+KEYALIAS_CHANGES = 0
 
 
 class InterruptCommand(Exception):
@@ -329,8 +332,10 @@ class Command(metaclass=CommandMeta):
             caches are properly updated as well.
 
         """
+        global KEYALIAS_CHANGES
         self.key = new_key.lower()
         self._optimize()
+        KEYALIAS_CHANGES += 1
 
     def set_aliases(self, new_aliases):
         """
@@ -346,11 +351,13 @@ class Command(metaclass=CommandMeta):
             caches are properly updated as well.
 
         """
+        global KEYALIAS_CHANGES
         if isinstance(new_aliases, str):
             new_aliases = new_aliases.split(";")
         aliases = (str(alias).strip().lower() for alias in make_iter(new_aliases))
         self.aliases = list(set(alias for alias in aliases if alias != self.key))
         self._optimize()
+        KEYALIAS_CHANGES += 1
 
     def match(self, cmdname, include_prefixes=True):
         """
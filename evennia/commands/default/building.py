@@ -6,7 +6,6 @@ import re
 import typing
 
 from django.conf import settings
-from django.core.paginator import Paginator
 from django.db.models import Max, Min, Q
 
 import evennia
@@ -3415,8 +3414,9 @@ class ScriptEvMore(EvMore):
 
     def init_pages(self, scripts):
         """Prepare the script list pagination"""
-        script_pages = Paginator(scripts, max(1, int(self.height / 2)))
-        super().init_pages(script_pages)
+        # scripts may take more than one line each
+        self.height = max(1, int(self.height / 2))
+        super().init_pages(scripts)
 
     def page_formatter(self, scripts):
         """Takes a page of scripts and formats the output
@@ -4344,15 +4344,33 @@ class CmdSpawn(COMMAND_DEFAULT_CLASS):
                     "Use spawn/update <key> to apply later as needed.|n"
                 )
                 return
-            try:
-                n_updated = spawner.batch_update_objects_with_prototype(
-                    prototype,
-                    objects=existing_objects,
-                    caller=caller,
+
+            progress = {"nprocessed": 0, "nchanged": 0}
+
+            def _report_progress(nprocessed, ntotal, nchanged):
+                progress.update(nprocessed=nprocessed, nchanged=nchanged)
+                if nprocessed < ntotal:
+                    caller.msg(f"Checked {nprocessed}/{ntotal} objects, {nchanged} updated ...")
+
+            def _report_error(failure):
+                logger.log_err(failure.getTraceback())
+                caller.msg(
+                    f"|rThe update stopped with an error after checking {progress['nprocessed']}"
+                    f"/{len(existing_objects)} objects ({progress['nchanged']} updated). "
+                    "See the server log for details.|n"
                 )
-            except Exception:
-                logger.log_trace()
-            caller.msg(f"{n_updated} objects were updated.")
+
+            # many objects are updated in chunks, letting the server do other things in between
+            deferred = spawner.batch_update_objects_with_prototype(
+                prototype,
+                objects=existing_objects,
+                caller=caller,
+                progress_callback=_report_progress,
+                yield_to_reactor=True,
+            )
+            deferred.addCallbacks(
+                lambda n_updated: caller.msg(f"{n_updated} objects were updated."), _report_error
+            )
         return
 
     def _parse_key_desc_tags(self, argstring, desc=True):
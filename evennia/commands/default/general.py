@@ -7,7 +7,8 @@ import re
 from django.conf import settings
 
 from evennia.objects.objects import DefaultObject
-from evennia.typeclasses.attributes import NickTemplateInvalid
+from evennia.typeclasses.attributes import NickTemplateInvalid, prefetch_attributes
+from evennia.typeclasses.tags import prefetch_tags
 from evennia.utils import utils
 
 COMMAND_DEFAULT_CLASS = utils.class_from_module(settings.COMMAND_DEFAULT_CLASS)
@@ -371,6 +372,9 @@ class CmdInventory(COMMAND_DEFAULT_CLASS):
         else:
             from evennia.utils.ansi import raw as raw_ansi
 
+            # load descs and (plural) aliases of all items in one go
+            prefetch_attributes(items, keys="desc")
+            prefetch_tags(items, tagtype="alias")
             table = self.styled_table(border="header")
             for key, desc, _ in utils.group_objects_by_key_and_desc(items, caller=self.caller):
                 table.add_row(
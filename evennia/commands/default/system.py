@@ -924,15 +924,21 @@ class CmdServerLoad(COMMAND_DEFAULT_CLASS):
         string = "|wServer CPU and Memory load:|n\n%s" % loadtable
 
         # object cache count (note that sys.getsiseof is not called so this works for pypy too.
-        total_num, cachedict = _IDMAPPER.cache_size()
+        total_num, cachedict = _IDMAPPER.cache_size(stats=True)
         sorted_cache = sorted(
-            [(key, num) for key, num in cachedict.items() if num > 0],
+            [
+                (key, stat["cached"], stat["evicted"])
+                for key, stat in cachedict.items()
+                if stat["cached"] > 0
+            ],
             key=lambda tup: tup[1],
             reverse=True,
         )
-        memtable = self.styled_table("entity name", "number", "idmapper %", align="l")
+        memtable = self.styled_table("entity name", "number", "idmapper %", "evicted", align="l")
         for tup in sorted_cache:
-            memtable.add_row(tup[0], "%i" % tup[1], "%.2f" % (float(tup[1]) / total_num * 100))
+            memtable.add_row(
+                tup[0], "%i" % tup[1], "%.2f" % (float(tup[1]) / total_num * 100), "%i" % tup[2]
+            )
 
         string += "\n|w Entity idmapper cache:|n %i items\n%s" % (total_num, memtable)
 
@@ -990,6 +990,7 @@ class TestOptionTransferReplace(TestCase):
 
 
 import sys
+from unittest.mock import MagicMock
 
 from twisted.trial.unittest import TestCase as TwistedTestCase
 
@@ -1139,6 +1140,64 @@ class TestGetAndMergeCmdSets(TwistedTestCase, BaseEvenniaTest):
         deferred.addCallback(_callback)
         return deferred
 
+    def test_merge_cache(self):
+        a, b = self.cmdset_a, self.cmdset_b
+        self.set_cmdsets(self.obj1, a, b)
+        cmdhandler.clear_cmdset_merge_cache()
+        command_objects_list = cmdhandler.generate_cmdset_providers(self.obj1)[1]
+
+        def _merge():
+            return cmdhandler.get_and_merge_cmdsets(
+                self.obj1, command_objects_list, "object", "", None
+            )
+
+        def _first(cmdset):
+            self.assertEqual(cmdhandler.get_cmdset_merge_cache_stats()["misses"], 1)
+            return _merge().addCallback(_second, cmdset)
+
+        def _second(cmdset, first_cmdset):
+            # unchanged sets re-use the cached merger
+            self.assertIs(cmdset, first_cmdset)
+            self.assertEqual(cmdhandler.get_cmdset_merge_cache_stats()["hits"], 1)
+            # changing a cmdset must invalidate the cached merger
+            b.add(_CmdEe(b))
+            return _merge().addCallback(_third, first_cmdset)
+
+        def _third(cmdset, first_cmdset):
+            self.assertIsNot(cmdset, first_cmdset)
+            self.assertTrue(any(cmd.key == "e" for cmd in cmdset.commands))
+            stats = cmdhandler.get_cmdset_merge_cache_stats()
+            self.assertEqual(stats["misses"], 2)
+            cmdhandler.clear_cmdset_merge_cache()
+            self.assertEqual(cmdhandler.get_cmdset_merge_cache_stats()["size"], 0)
+
+        return _merge().addCallback(_first)
+
+    def test_merge_cache_bounded(self):
+        cache = cmdhandler._CmdSetMergeCache(2)
+        cmdsets = [CmdSet() for _ in range(3)]
+        for cmdset in cmdsets:
+            cache.set(cache.get_key([cmdset]), cmdset)
+        self.assertEqual(cache.stats()["size"], 2)
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertIsNone(cache.get(cache.get_key(cmdsets[:1])))
+        self.assertIs(cache.get(cache.get_key(cmdsets[2:])), cmdsets[2])
+
+    def test_get_cmdset_objects(self):
+        cmdset_objects = cmdhandler.get_cmdset_objects(self.room1)
+        self.assertIn(self.exit, cmdset_objects)
+        self.assertNotIn(self.obj1, cmdset_objects)
+        # the snapshot is reused as long as nothing changed
+        self.room1.contents_cache.get = MagicMock()
+        self.assertEqual(cmdhandler.get_cmdset_objects(self.room1), cmdset_objects)
+        self.room1.contents_cache.get.assert_not_called()
+        del self.room1.contents_cache.get
+        # cmdset and contents changes take effect immediately
+        self.obj1.cmdset.add(self.cmdset_a)
+        self.assertIn(self.obj1, cmdhandler.get_cmdset_objects(self.room1))
+        self.obj1.location = self.room2
+        self.assertNotIn(self.obj1, cmdhandler.get_cmdset_objects(self.room1))
+
     def test_command_replace_different_aliases(self):
         cmdset_ee = _CmdSetEe_Ef()
         self.assertEqual(len(cmdset_ee.commands), 1)
@@ -1217,6 +1276,41 @@ class TestCmdParser(TestCase):
             [("the third command", "", bcmd, 17, 1.0, "&the third command")],
         )
 
+    def test_match_index(self):
+        a_cmdset = _CmdSetTest()
+        a_cmdset.add(_CmdTest4)
+        for raw_string in ("test1 rock", "test2", "another command x", "&the third", "nomatch"):
+            for include_prefixes in (True, False):
+                expected = []
+                for cmd in a_cmdset:
+                    cmdname, raw_cmdname = cmd.match(raw_string, include_prefixes=include_prefixes)
+                    if cmdname:
+                        expected.append((cmd, cmdname, raw_cmdname))
+                self.assertEqual(
+                    cmdparser.get_match_index(a_cmdset).match(
+                        raw_string, include_prefixes=include_prefixes
+                    ),
+                    expected,
+                )
+
+    def test_match_index_invalidation(self):
+        a_cmdset = _CmdSetTest()
+        index = cmdparser.get_match_index(a_cmdset)
+        self.assertIs(cmdparser.get_match_index(a_cmdset), index)
+        self.assertEqual(cmdparser.build_matches("test2", a_cmdset), [])
+
+        # adding a command rebuilds the index
+        a_cmdset.add(_CmdTest4)
+        self.assertEqual(len(cmdparser.build_matches("test2", a_cmdset)), 1)
+
+        # so does changing aliases at run-time
+        bcmd = [cmd for cmd in a_cmdset.commands if cmd.key == "test1"][0]
+        bcmd.set_aliases(["t1"])
+        self.assertEqual(
+            cmdparser.build_matches("t1 rock", a_cmdset),
+            [("t1", " rock", bcmd, 2, 2 / 7, "t1")],
+        )
+
     @override_settings(SEARCH_MULTIMATCH_REGEX=r"(?P<number>[0-9]+)-(?P<name>.*)")
     def test_num_differentiators(self):
         self.assertEqual(cmdparser.try_num_differentiators("look me"), (None, None))
@@ -9,6 +9,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.urls import reverse
 from django.utils.text import slugify
 
+from evennia.accounts.accounts import DefaultAccount
 from evennia.comms.managers import ChannelManager
 from evennia.comms.models import ChannelDB
 from evennia.objects.objects import DefaultObject
@@ -186,6 +187,8 @@ class DefaultChannel(ChannelDB, metaclass=TypeclassBase):
     # helper methods, for easy overloading
 
     _log_file = None
+    # in-memory set of muted subscribers, kept in sync by mute/unmute
+    _mute_set = None
 
     def get_log_filename(self):
         """
@@ -241,6 +244,20 @@ class DefaultChannel(ChannelDB, metaclass=TypeclassBase):
     def mutelist(self):
         return self.db.mute_list or []
 
+    def _get_mute_set(self):
+        """
+        Get the muted subscribers as a set. This is cached in memory and kept in
+        sync by `mute` and `unmute`, so use those rather than changing the
+        `mute_list` Attribute directly.
+
+        Returns:
+            set: The muted subscribers.
+
+        """
+        if self._mute_set is None:
+            self._mute_set = set(self.mutelist)
+        return self._mute_set
+
     @property
     def banlist(self):
         return self.db.ban_list or []
@@ -248,7 +265,7 @@ class DefaultChannel(ChannelDB, metaclass=TypeclassBase):
     @property
     def wholist(self):
         subs = self.subscriptions.all()
-        muted = list(self.mutelist)
+        muted = self._get_mute_set()
         listening = [ob for ob in subs if ob.is_connected and ob not in muted]
         if subs:
             # display listening subscribers in bold
@@ -282,6 +299,7 @@ class DefaultChannel(ChannelDB, metaclass=TypeclassBase):
         if subscriber not in mutelist:
             mutelist.append(subscriber)
             self.db.mute_list = mutelist
+            self._mute_set = set(mutelist)
             return True
         return False
 
@@ -303,6 +321,7 @@ class DefaultChannel(ChannelDB, metaclass=TypeclassBase):
         mutelist = self.mutelist
         if subscriber in mutelist:
             mutelist.remove(subscriber)
+            self._mute_set = set(mutelist)
             return True
         return False
 
@@ -634,6 +653,10 @@ class DefaultChannel(ChannelDB, metaclass=TypeclassBase):
             (where the senders/bypass_mute are embedded into **kwargs for
             later access in hooks)
 
+            Receivers using the default `DefaultAccount.at_pre_channel_msg` who
+            see the same display names for the senders share a single call of
+            that hook.
+
         """
         senders = make_iter(senders) if senders else []
         if self.send_to_online_only:
@@ -641,7 +664,9 @@ class DefaultChannel(ChannelDB, metaclass=TypeclassBase):
         else:
             receivers = self.subscriptions.all()
         if not bypass_mute:
-            receivers = [receiver for receiver in receivers if receiver not in self.mutelist]
+            muted = self._get_mute_set()
+            if muted:
+                receivers = [receiver for receiver in receivers if receiver not in muted]
 
         send_kwargs = {"senders": senders, "bypass_mute": bypass_mute, **kwargs}
 
@@ -650,13 +675,24 @@ class DefaultChannel(ChannelDB, metaclass=TypeclassBase):
         if message in (None, False):
             return
 
+        # The default at_pre_channel_msg output only depends on how the receiver
+        # sees the senders' names, so receivers seeing the same names share it.
+        formatted = {}
         for receiver in receivers:
             # send to each individual subscriber
 
             try:
-                recv_message = receiver.at_pre_channel_msg(message, self, **send_kwargs)
+                if type(receiver).at_pre_channel_msg is DefaultAccount.at_pre_channel_msg:
+                    format_key = tuple(sender.get_display_name(receiver) for sender in senders)
+                    if format_key not in formatted:
+                        formatted[format_key] = receiver.at_pre_channel_msg(
+                            message, self, **send_kwargs
+                        )
+                    recv_message = formatted[format_key]
+                else:
+                    recv_message = receiver.at_pre_channel_msg(message, self, **send_kwargs)
                 if recv_message in (None, False):
-                    return
+                    continue
 
                 receiver.channel_msg(recv_message, self, **send_kwargs)
 
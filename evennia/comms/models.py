@@ -647,11 +647,11 @@ class SubscriptionHandler:
             subscribers (list): Subscribers who are online or
                 are puppeted by an online account.
         """
+        from django.core.exceptions import ObjectDoesNotExist
+
         subs = []
         recache_needed = False
         for obj in self.all():
-            from django.core.exceptions import ObjectDoesNotExist
-
             try:
                 if not obj.is_connected:
                     continue
@@ -1,5 +1,8 @@
+from unittest.mock import MagicMock, patch
+
 from django.test import SimpleTestCase
 
+from evennia.accounts.accounts import DefaultAccount
 from evennia.commands.default.comms import CmdChannel
 from evennia.comms.comms import DefaultChannel
 from evennia.utils.create import create_message
@@ -86,3 +89,39 @@ class ChannelWholistTests(BaseEvenniaTest):
         expected = "Obj, |wChar|n"
         result = self.default_channel.wholist
         self.assertEqual(expected, result)
+
+
+@patch("evennia.utils.logger.log_file", MagicMock())
+class ChannelMsgTests(BaseEvenniaTest):
+    def setUp(self):
+        super().setUp()
+        self.default_channel, _ = DefaultChannel.create(
+            "teatalk", description="A place to talk about tea."
+        )
+        self.default_channel.send_to_online_only = False
+        self.default_channel.connect(self.account)
+        self.default_channel.connect(self.account2)
+
+    @patch.object(DefaultAccount, "channel_msg")
+    def test_msg_muted(self, mock_channel_msg):
+        self.default_channel.mute(self.account2)
+        self.default_channel.msg("Hello", senders=self.account)
+        mock_channel_msg.assert_called_once_with(
+            "[teatalk] |cTestAccount|n: Hello",
+            self.default_channel,
+            senders=[self.account],
+            bypass_mute=False,
+        )
+        self.default_channel.unmute(self.account2)
+        self.default_channel.msg("Hello again", senders=self.account)
+        self.assertEqual(mock_channel_msg.call_count, 3)
+
+    @patch.object(DefaultAccount, "channel_msg")
+    def test_msg_formatted_once(self, mock_channel_msg):
+        with patch.object(
+            DefaultAccount, "at_pre_channel_msg", autospec=True, return_value="formatted"
+        ) as mock_pre_channel_msg:
+            self.default_channel.msg("Hello", senders=self.account)
+        mock_pre_channel_msg.assert_called_once()
+        self.assertEqual(mock_channel_msg.call_count, 2)
+        self.assertEqual(mock_channel_msg.call_args[0][0], "formatted")
@@ -121,7 +121,8 @@ initpath
     Recreates the pathfinder matrices for the entire grid. These are used for all shortest-path
     calculations. The result will be cached to disk (in mygame/server/.cache/). If not run, each
     map will run this automatically first time it's used. Running this will always force to
-    respawn the cache.
+    respawn the cache. The time and memory used per node is reported for each map. Maps using
+    the 'lazy' pathfinding mode only build their link-graph here; nothing is cached to disk.
 
 initpath Z|mapname
 
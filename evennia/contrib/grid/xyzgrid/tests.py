@@ -1209,6 +1209,13 @@ class TestMap11(_MapTest):
         self.assertEqual(xyzroom.XYZExit.objects.all().count(), 6)
 
 
+class HeavyMapNode(xymap_legend.MapNode):
+    """Node with all its links ten times heavier than their link-weights."""
+
+    def linkweights(self, nnodes):
+        return super().linkweights(nnodes) * 10
+
+
 class TestMapStressTest(TestCase):
     """
     Performance test of map patfinder and visualizer.
@@ -1293,6 +1300,53 @@ class TestMapStressTest(TestCase):
         #     print(f"Pathfinding for ({Xmax}x{Ymax}) grid slower "
         #           f"than expected {max_time}s.")
 
+    def test_grid_pathfind_linkweights(self):
+        """
+        Test that nodes overriding `linkweights` decide the weights used for pathfinding.
+
+        """
+        grid = self._get_grid(3, 3)
+        mapobj = xymap.XYMap({"map": grid}, Z="testmap")
+        mapobj.parse()
+        mapobj.calculate_path_matrix(force=True)
+        heavymap = xymap.XYMap({"map": grid, "legend": {"#": HeavyMapNode}}, Z="testmap")
+        heavymap.parse()
+        heavymap.calculate_path_matrix(force=True)
+
+        istart = mapobj.get_node_from_coord((0, 0)).node_index
+        iend = mapobj.get_node_from_coord((2, 2)).node_index
+        self.assertEqual(mapobj.dist_matrix[istart, iend], 2)
+        self.assertEqual(heavymap.dist_matrix[istart, iend], 20)
+
+    def test_grid_pathfind_lazy(self):
+        """
+        Test that the lazy pathfinding mode finds the same routes as the full matrix.
+
+        """
+        Xmax, Ymax = 10, 10
+        grid = self._get_grid(Xmax, Ymax)
+        matrixmap = xymap.XYMap({"map": grid}, Z="testmap")
+        matrixmap.parse()
+        matrixmap.calculate_path_matrix(force=True)
+        lazymap = xymap.XYMap({"map": grid}, Z="testmap")
+        lazymap.pathfinding_mode = "lazy"
+        lazymap.pathfinding_cache_size = 5
+        lazymap.parse()
+
+        start_end_points = [((0, 0), (Xmax - 1, Ymax - 1))]
+        for _ in range(19):
+            start_end_points.append(
+                ((randint(0, Xmax), randint(0, Ymax)), (randint(0, Xmax), randint(0, Ymax)))
+            )
+        for startcoord, endcoord in start_end_points:
+            self.assertEqual(
+                matrixmap.get_shortest_path(startcoord, endcoord)[0],
+                lazymap.get_shortest_path(startcoord, endcoord)[0],
+            )
+        self.assertIsNone(lazymap.pathfinding_routes)
+        self.assertLessEqual(len(lazymap.pathfinding_cache), 5)
+        self.assertEqual(lazymap.pathfinding_stats["nnodes"], (Xmax + 1) * (Ymax + 1))
+
     @parameterized.expand(
         [
             ((10, 10), 4, 0.01),
@@ -94,13 +94,19 @@ See `./example.py` for a full grid example.
 """
 
 import pickle
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from os import mkdir
 from os.path import isdir, isfile
 from os.path import join as pathjoin
+from time import time
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
 
 try:
-    from numpy import zeros
     from scipy.sparse import csr_matrix
     from scipy.sparse.csgraph import dijkstra
 except ImportError as err:
@@ -122,6 +128,10 @@ _NO_DB_PROTOTYPES = True
 if hasattr(settings, "XYZGRID_USE_DB_PROTOTYPES"):
     _NO_DB_PROTOTYPES = not settings.XYZGRID_USE_DB_PROTOTYPES
 
+_PATHFINDING_MODE = "matrix"
+if hasattr(settings, "XYZGRID_PATHFINDING_MODE"):
+    _PATHFINDING_MODE = settings.XYZGRID_PATHFINDING_MODE
+
 _CACHE_DIR = settings.CACHE_DIR
 _LOADED_PROTOTYPES = None
 _XYZROOMCLASS = None
@@ -177,6 +187,12 @@ class XYMap:
 
     mapcorner_symbol = "+"
     max_pathfinding_length = 500
+    # "matrix" solves the routes between all nodes up front and bakes them to disk. This
+    # makes lookups fast, but memory use and bake-time grows as nnodes**2. "lazy" only
+    # solves the routes out of a node when first pathfinding from it, keeping the
+    # `pathfinding_cache_size` most recently used results. Use "lazy" for very large maps.
+    pathfinding_mode = _PATHFINDING_MODE
+    pathfinding_cache_size = 200
     empty_symbol = " "
     # we normally only accept one single character for the legend key
     legend_key_exceptions = "\\"
@@ -246,6 +262,11 @@ class XYMap:
         self.node_index_map = None
         self.dist_matrix = None
         self.pathfinding_routes = None
+        # used by 'lazy' pathfinding mode
+        self.pathfinding_graph = None
+        self.pathfinding_cache = OrderedDict()
+        # bake-time and memory measurements from last calculate_path_matrix
+        self.pathfinding_stats = {}
 
         self.pathfinder_baked_filename = None
         if Z:
@@ -542,6 +563,10 @@ class XYMap:
         # store
         self.display_map = display_map
 
+        # the node indices may have changed; lazy routes must be re-solved
+        self.pathfinding_graph = None
+        self.pathfinding_cache.clear()
+
     def _get_topology_around_coord(self, xy, dist=2):
         """
         Get all links and nodes up to a certain distance from an XY coordinate.
@@ -597,6 +622,63 @@ class XYMap:
         points, xmin, xmax, ymin, ymax = _scan_neighbors(center_node, [], dist=dist)
         return list(set(points)), xmin, xmax, ymin, ymax
 
+    def _build_pathfinding_graph(self):
+        """
+        Build the sparse graph of weighted links between all nodes, directly from
+        each node's link-weights. Nodes overriding `linkweights` are asked for
+        their full row of weights instead.
+
+        Returns:
+            csr_matrix: A `nnodes x nnodes` sparse matrix, where a non-zero element
+            `[i, j]` is the weight of the direct link from node `i` to node `j`.
+
+        """
+        nnodes = len(self.node_index_map)
+        rows, cols, weights = [], [], []
+        for inode, node in self.node_index_map.items():
+            if type(node).linkweights is xymap_legend.MapNode.linkweights:
+                node_weights = node.weights.items()
+            else:
+                linkweights = node.linkweights(nnodes)
+                node_weights = ((jnode, linkweights[jnode]) for jnode in linkweights.nonzero()[0])
+            for jnode, weight in node_weights:
+                if weight:
+                    rows.append(inode)
+                    cols.append(jnode)
+                    weights.append(weight)
+        return csr_matrix((weights, (rows, cols)), shape=(nnodes, nnodes))
+
+    def _report_pathfinding_stats(self, bake_time, data_size):
+        """
+        Store and log measurements of the last pathfinding bake.
+
+        Args:
+            bake_time (float): Time in seconds it took to solve the pathfinding.
+            data_size (int): The memory size, in bytes, of the stored pathfinding data.
+
+        """
+        nnodes = len(self.node_index_map)
+        peak_rss = 0
+        if resource:
+            # ru_maxrss is in kB on Linux
+            peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        self.pathfinding_stats = {
+            "mode": self.pathfinding_mode,
+            "nnodes": nnodes,
+            "bake_time": bake_time,
+            "bake_time_per_node": bake_time / max(1, nnodes),
+            "data_size": data_size,
+            "data_size_per_node": data_size / max(1, nnodes),
+            "peak_rss": peak_rss,
+        }
+        self.log(
+            f"  XYMap Z={self.Z} ({self.pathfinding_mode}): {nnodes} nodes solved in "
+            f"{bake_time:.3f}s ({bake_time / max(1, nnodes) * 1000:.3f}ms/node), "
+            f"pathfinding data {data_size / 1024:.1f}kB "
+            f"({data_size / max(1, nnodes):.0f}B/node), "
+            f"peak process RSS {peak_rss / 1024**2:.1f}MB."
+        )
+
     def calculate_path_matrix(self, force=False):
         """
         Solve the pathfinding problem using Dijkstra's algorithm. This will try to
@@ -605,7 +687,21 @@ class XYMap:
         Args:
             force (bool, optional): If the cache should always be rebuilt.
 
+        Notes:
+            In `lazy` pathfinding-mode, this only builds the link-graph; the routes out of
+            each node are then solved on demand by `get_pathfinding_routes`.
+
         """
+        if self.pathfinding_mode == "lazy":
+            t0 = time()
+            self.pathfinding_graph = self._build_pathfinding_graph()
+            self.pathfinding_cache.clear()
+            graph = self.pathfinding_graph
+            self._report_pathfinding_stats(
+                time() - t0, graph.data.nbytes + graph.indices.nbytes + graph.indptr.nbytes
+            )
+            return
+
         if not force and self.pathfinder_baked_filename and isfile(self.pathfinder_baked_filename):
             # check if the solution for this grid was already solved previously.
 
@@ -624,16 +720,12 @@ class XYMap:
                 # we can re-use the stored data!
                 self.dist_matrix = dist_matrix
                 self.pathfinding_routes = pathfinding_routes
+                return
 
-        # build a matrix representing the map graph, with 0s as impassable areas
-
-        nnodes = len(self.node_index_map)
-        pathfinding_graph = zeros((nnodes, nnodes))
-        for inode, node in self.node_index_map.items():
-            pathfinding_graph[inode, :] = node.linkweights(nnodes)
+        t0 = time()
 
         # create a sparse matrix to represent link relationships from each node
-        pathfinding_matrix = csr_matrix(pathfinding_graph)
+        pathfinding_matrix = self._build_pathfinding_graph()
 
         # solve using Dijkstra's algorithm
         self.dist_matrix, self.pathfinding_routes = dijkstra(
@@ -643,6 +735,10 @@ class XYMap:
             limit=self.max_pathfinding_length,
         )
 
+        self._report_pathfinding_stats(
+            time() - t0, self.dist_matrix.nbytes + self.pathfinding_routes.nbytes
+        )
+
         if self.pathfinder_baked_filename:
             # try to cache the results
             with open(self.pathfinder_baked_filename, "wb") as fil:
@@ -650,6 +746,43 @@ class XYMap:
                     (self.mapstring, self.dist_matrix, self.pathfinding_routes), fil, protocol=4
                 )
 
+    def get_pathfinding_routes(self, inode):
+        """
+        Get the shortest-path predecessors for all routes starting at a given node.
+
+        Args:
+            inode (int): The node-index of the start node.
+
+        Returns:
+            ndarray: An array of length `nnodes` where element `j` is the node-index
+            preceding node `j` on the shortest route from `inode` to `j`. This is
+            `-9999` for the start node and for nodes that can't be reached.
+
+        """
+        if self.pathfinding_mode == "lazy":
+            if self.pathfinding_graph is None:
+                self.calculate_path_matrix()
+            cache = self.pathfinding_cache
+            routes = cache.get(inode)
+            if routes is None:
+                _, routes = dijkstra(
+                    self.pathfinding_graph,
+                    directed=True,
+                    indices=inode,
+                    return_predecessors=True,
+                    limit=self.max_pathfinding_length,
+                )
+                cache[inode] = routes
+                if len(cache) > self.pathfinding_cache_size:
+                    cache.popitem(last=False)
+            else:
+                cache.move_to_end(inode)
+            return routes
+
+        if self.pathfinding_routes is None:
+            self.calculate_path_matrix()
+        return self.pathfinding_routes[inode]
+
     def spawn_nodes(self, xy=("*", "*")):
         """
         Convert the nodes of this XYMap into actual in-world rooms by spawning their
@@ -797,20 +930,17 @@ class XYMap:
                 f"{endnode}. They must both be MapNodes (not Links)"
             )
 
-        if self.pathfinding_routes is None:
-            self.calculate_path_matrix()
-
-        pathfinding_routes = self.pathfinding_routes
+        pathfinding_routes = self.get_pathfinding_routes(istartnode)
         node_index_map = self.node_index_map
 
         path = [endnode]
         directions = []
 
-        while pathfinding_routes[istartnode, inextnode] != -9999:
+        while pathfinding_routes[inextnode] != -9999:
             # the -9999 is set by algorithm for unreachable nodes or if trying
             # to go a node we are already at (the start node in this case since
             # we are working backwards).
-            inextnode = pathfinding_routes[istartnode, inextnode]
+            inextnode = pathfinding_routes[inextnode]
             nextnode = node_index_map[inextnode]
             shortest_route_to = nextnode.shortest_route_to_node[path[-1].node_index]
 
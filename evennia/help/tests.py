@@ -4,6 +4,8 @@ command test-suite).
 
 """
 
+import os
+import tempfile
 from unittest import mock
 
 from parameterized import parameterized
@@ -195,3 +197,40 @@ class HelpUtils(TestCase):
         entries, _ = help_utils.help_search_with_index(search_term, self.candidate_entries)
 
         self.assertEqual(entries, expected_entry, error_msg)
+
+    def test_cached_index(self):
+        """Test the index is only rebuilt when the entries change"""
+        lunr_search = help_utils.LunrSearch()
+        lunr_search.clear_cache()
+        with mock.patch.object(
+            help_utils.LunrSearch, "index", wraps=lunr_search.index
+        ) as mock_index:
+            help_utils.help_search_with_index("inv*", self.candidate_entries)
+            entries, _ = help_utils.help_search_with_index("@examine", self.candidate_entries)
+            self.assertEqual(mock_index.call_count, 1)
+            self.assertEqual(entries, self.candidate_entries[:1])
+            # changing a searched field rebuilds the index
+            self.candidate_entries[1].aliases = ["stuff"]
+            entries, _ = help_utils.help_search_with_index("stuff", self.candidate_entries)
+            self.assertEqual(mock_index.call_count, 2)
+            self.assertEqual(entries, self.candidate_entries[1:2])
+            # a different set of entries gets its own index
+            help_utils.help_search_with_index("inv*", self.candidate_entries[1:])
+            self.assertEqual(mock_index.call_count, 3)
+            help_utils.help_search_with_index("inv*", self.candidate_entries)
+            self.assertEqual(mock_index.call_count, 3)
+
+    def test_cached_index_on_disk(self):
+        """Test indexes can be stored to and loaded from disk"""
+        lunr_search = help_utils.LunrSearch()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with mock.patch.object(help_utils, "_INDEX_CACHE_DIR", tmpdir):
+                lunr_search.clear_cache()
+                expected = help_utils.help_search_with_index("*word", self.candidate_entries)
+                self.assertEqual(len(os.listdir(tmpdir)), 1)
+                lunr_search.clear_cache()
+                with mock.patch.object(help_utils.LunrSearch, "index") as mock_index:
+                    result = help_utils.help_search_with_index("*word", self.candidate_entries)
+                mock_index.assert_not_called()
+                self.assertEqual(result, expected)
+        lunr_search.clear_cache()
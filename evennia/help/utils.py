@@ -6,17 +6,26 @@ This is used primarily by the default `help` command.
 
 """
 
+import hashlib
+import json
+import os
 import re
+from collections import OrderedDict
 
 from django.conf import settings
 from lunr.stemmer import stemmer
 
+from evennia.utils import logger
+
 _RE_HELP_SUBTOPICS_START = re.compile(r"^\s*?#\s*?subtopics\s*?$", re.I + re.M)
 _RE_HELP_SUBTOPIC_SPLIT = re.compile(r"^\s*?(\#{2,6}\s*?\w+?[a-z0-9 \-\?!,\.]*?)$", re.M + re.I)
 _RE_HELP_SUBTOPIC_PARSE = re.compile(r"^(?P<nesting>\#{2,6})\s*?(?P<name>.*?)$", re.I + re.M)
 
 MAX_SUBTOPIC_NESTING = 5
 
+_INDEX_CACHE_SIZE = settings.HELP_SEARCH_INDEX_CACHE_SIZE
+_INDEX_CACHE_DIR = settings.HELP_SEARCH_INDEX_CACHE_DIR
+
 
 def wildcard_stemmer(token, i, tokens):
     """
@@ -45,6 +54,13 @@ def wildcard_stemmer(token, i, tokens):
 class LunrSearch:
     """
     Singleton class for managing Lunr search index configuration and initialization.
+
+    Indexes built with `cached_index` are kept in memory (and optionally on
+    disk, see `settings.HELP_SEARCH_INDEX_CACHE_DIR`), keyed on the documents they
+    were built from. Callers seeing the same help entries (such as all callers
+    passing the same lock checks) will so share the same index, and an index is
+    only rebuilt when the entries it covers change, such as when a `HelpEntry` is
+    edited, a file-help module is reloaded or a cmdset changes.
     """
 
     # these are words that Lunr normally ignores but which we want to find
@@ -97,6 +113,9 @@ class LunrSearch:
         # Register custom stemmer if we want to serialize.
         Pipeline.register_function(wildcard_stemmer, "wildcard_stemmer")
 
+        # {key: lunr.Index}, with the most recently used last
+        self._index_cache = OrderedDict()
+
     def _setup_stop_words_filter(self):
         """
         Create a custom stop words filter, removing specified exceptions
@@ -132,6 +151,104 @@ class LunrSearch:
 
         return self.lunr(ref, fields, documents, builder=builder)
 
+    def _get_index_key(self, ref, fields, documents):
+        """
+        Get a key uniquely identifying the index built from the given input.
+        Only the parts of the documents used by the index affect the key.
+
+        """
+        field_names = [ref] + [field["field_name"] for field in fields]
+        data = [
+            self._LUNR_STOP_WORD_FILTER_EXCEPTIONS,
+            ref,
+            fields,
+            [[document.get(name) for name in field_names] for document in documents],
+        ]
+        return hashlib.sha1(json.dumps(data, default=str).encode("utf-8")).hexdigest()
+
+    def _load_index(self, key):
+        """
+        Load a stored index from the disk cache.
+
+        Returns:
+            lunr.Index or None: The index, or None if it was not found.
+
+        """
+        from lunr.index import Index
+
+        path = os.path.join(_INDEX_CACHE_DIR, f"{key}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as fil:
+                return Index.load(json.load(fil))
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.log_trace(f"Could not load cached help index {path}. Rebuilding.")
+            return None
+
+    def _save_index(self, key, index):
+        """
+        Store an index to the disk cache, removing the oldest stored indexes if
+        there are more than `settings.HELP_SEARCH_INDEX_CACHE_SIZE` of them.
+
+        """
+        try:
+            os.makedirs(_INDEX_CACHE_DIR, exist_ok=True)
+            path = os.path.join(_INDEX_CACHE_DIR, f"{key}.json")
+            with open(f"{path}.tmp", "w", encoding="utf-8") as fil:
+                json.dump(index.serialize(), fil)
+            os.replace(f"{path}.tmp", path)
+            paths = sorted(
+                (
+                    os.path.join(_INDEX_CACHE_DIR, fname)
+                    for fname in os.listdir(_INDEX_CACHE_DIR)
+                    if fname.endswith(".json")
+                ),
+                key=os.path.getmtime,
+            )
+            for path in paths[:-_INDEX_CACHE_SIZE]:
+                os.remove(path)
+        except OSError:
+            logger.log_trace(f"Could not store help index in {_INDEX_CACHE_DIR}.")
+
+    def cached_index(self, ref, fields, documents):
+        """
+        Get a Lunr searchable index, re-using a previously built index if the
+        documents have not changed since. Takes the same arguments as `index`.
+
+        Args:
+            ref (str): Unique identifier field within a document
+            fields (list): A list of Lunr field mappings
+              ``{"field_name": str, "boost": int}``.
+            documents (list[dict]): This is the body of possible entities to search.
+              Each dict should have all keys in the `fields` arg.
+        Returns: A lunr.Index object
+
+        """
+        key = self._get_index_key(ref, fields, documents)
+        index = self._index_cache.get(key)
+        if index is not None:
+            self._index_cache.move_to_end(key)
+            return index
+
+        index = self._load_index(key) if _INDEX_CACHE_DIR else None
+        if index is None:
+            index = self.index(ref, fields, documents)
+            if _INDEX_CACHE_DIR:
+                self._save_index(key, index)
+
+        self._index_cache[key] = index
+        while len(self._index_cache) > _INDEX_CACHE_SIZE:
+            self._index_cache.popitem(last=False)
+        return index
+
+    def clear_cache(self):
+        """
+        Empty the in-memory index cache.
+
+        """
+        self._index_cache.clear()
+
 
 def help_search_with_index(query, candidate_entries, suggestion_maxnum=5, fields=None):
     """
@@ -168,7 +285,7 @@ def help_search_with_index(query, candidate_entries, suggestion_maxnum=5, fields
 
     lunr_search = LunrSearch()
 
-    search_index = lunr_search.index(ref="key", fields=fields, documents=indx)
+    search_index = lunr_search.cached_index(ref="key", fields=fields, documents=indx)
 
     try:
         matches = search_index.search(query)[:suggestion_maxnum]
@@ -116,6 +116,31 @@ __all__ = ("LockHandler", "LockException")
 
 WARNING_LOG = settings.LOCKWARNING_LOG_FILE
 _LOCK_HANDLER = None
+_LOCK_RESULT_CACHE = settings.LOCK_RESULT_CACHE
+_LOCK_RESULT_CACHE_SIZE = 100  # max cached results per lockhandler
+# default lockfuncs that only depend on permissions, tags and ids, whose
+# results can be cached until any of those change
+_CACHEABLE_LOCKFUNC_NAMES = (
+    "true",
+    "all",
+    "false",
+    "none",
+    "superuser",
+    "self",
+    "perm",
+    "perm_above",
+    "pperm",
+    "pperm_above",
+    "dbref",
+    "pdbref",
+    "id",
+    "pid",
+    "tag",
+    "objtag",
+)
+_CACHEABLE_LOCKFUNCS = None
+# increased to invalidate all cached lock results
+_LOCK_CHANGES = 0
 
 
 #
@@ -161,6 +186,132 @@ _RE_SEPS = re.compile(r"(?<=[ )])AND(?=\s)|(?<=[ )])OR(?=\s)|(?<=[ )])NOT(?=\s)"
 _RE_OK = re.compile(r"%s|and|or|not")
 
 
+#
+# Compiling lock definitions
+#
+
+_COMPILED_EVALSTRINGS = {}
+
+
+def _compile_evalstring(evalstring):
+    """
+    Compile an evalstring (like `"%s or not %s and %s"`) into a tree of
+    closures, so it can be evaluated without `eval`. Each `%s` is the result
+    of a lock function, which is only called if needed to get the result
+    (the same short-circuiting as Python's `and`/`or`). The compiled result
+    is cached, since there are typically only a few distinct evalstrings.
+
+    Args:
+        evalstring (str): The evalstring, made up of `%s`, `and`, `or` and
+            `not`, separated by spaces.
+
+    Returns:
+        callable: A function `func(call)`, where `call(index)` gets the
+            result of the index:th lock function in the evalstring. It
+            returns the combined result.
+
+    Raises:
+        SyntaxError: If the evalstring is not valid.
+
+    """
+    try:
+        return _COMPILED_EVALSTRINGS[evalstring]
+    except KeyError:
+        pass
+
+    tokens = evalstring.split()
+    pos = 0
+    nfuncs = 0
+
+    def _parse_or():
+        nonlocal pos
+        operands = [_parse_and()]
+        while pos < len(tokens) and tokens[pos] == "or":
+            pos += 1
+            operands.append(_parse_and())
+        if len(operands) == 1:
+            return operands[0]
+
+        def _or(call):
+            for operand in operands:
+                result = operand(call)
+                if result:
+                    return result
+            return result
+
+        return _or
+
+    def _parse_and():
+        nonlocal pos
+        operands = [_parse_not()]
+        while pos < len(tokens) and tokens[pos] == "and":
+            pos += 1
+            operands.append(_parse_not())
+        if len(operands) == 1:
+            return operands[0]
+
+        def _and(call):
+            for operand in operands:
+                result = operand(call)
+                if not result:
+                    return result
+            return result
+
+        return _and
+
+    def _parse_not():
+        nonlocal pos, nfuncs
+        if pos >= len(tokens):
+            raise SyntaxError(f"Lock: unexpected end of '{evalstring}'.")
+        token = tokens[pos]
+        pos += 1
+        if token == "not":
+            operand = _parse_not()
+            return lambda call: not operand(call)
+        if token == "%s":
+            index = nfuncs
+            nfuncs += 1
+            return lambda call: call(index)
+        raise SyntaxError(f"Lock: unexpected '{token}' in '{evalstring}'.")
+
+    compiled = _parse_or()
+    if pos < len(tokens):
+        raise SyntaxError(f"Lock: unexpected '{tokens[pos]}' in '{evalstring}'.")
+    _COMPILED_EVALSTRINGS[evalstring] = compiled
+    return compiled
+
+
+def _is_cacheable(lock_funcs):
+    """
+    Check if the result of a lock made up of the given lock functions can be
+    cached until permissions, tags or locks change.
+
+    Args:
+        lock_funcs (tuple): The `(func, args, kwargs)` of the lock.
+
+    Returns:
+        bool: If the lock is cacheable.
+
+    """
+    global _CACHEABLE_LOCKFUNCS
+    if _CACHEABLE_LOCKFUNCS is None:
+        from evennia.locks import lockfuncs
+
+        _CACHEABLE_LOCKFUNCS = {getattr(lockfuncs, name) for name in _CACHEABLE_LOCKFUNC_NAMES}
+    return all(func in _CACHEABLE_LOCKFUNCS for func, _, _ in lock_funcs)
+
+
+def invalidate_lock_cache():
+    """
+    Invalidate all cached lock results (see `settings.LOCK_RESULT_CACHE`).
+    This is called automatically whenever permissions or tags change and
+    when objects are puppeted.
+
+    """
+    global _LOCK_CHANGES
+    _LOCK_CHANGES += 1
+
+
 #
 #
 # Lock handler
@@ -188,8 +339,11 @@ class LockHandler:
             _cache_lockfuncs()
         self.obj = obj
         self.locks = {}
+        self._result_cache = {}
         try:
-            self.reset()
+            # like reset(), but a new handler can't invalidate any cached results
+            self._cache_locks(self.obj.lock_storage)
+            self.lock_bypass = hasattr(obj, "is_superuser") and obj.is_superuser
         except LockException as err:
             logger.log_trace(err)
 
@@ -257,10 +411,10 @@ class LockHandler:
             if len(lock_funcs) < nfuncs:
                 continue
             try:
-                # purge the eval string of any superfluous items, then test it
+                # purge the eval string of any superfluous items, then compile it
                 evalstring = " ".join(_RE_OK.findall(evalstring))
-                eval(evalstring % tuple(True for func in funclist), {}, {})
-            except Exception:
+                _compile_evalstring(evalstring)
+            except SyntaxError:
                 elist.append(
                     _("Lock: definition '{lock_string}' has syntax errors.").format(
                         lock_string=raw_lockstring
@@ -296,6 +450,7 @@ class LockHandler:
 
         """
         self.locks = self._parse_lockstring(storage_lockstring)
+        self._result_cache = {}
 
     def _save_locks(self):
         """
@@ -319,6 +474,8 @@ class LockHandler:
 
         """
         self.lock_bypass = hasattr(obj, "is_superuser") and obj.is_superuser
+        # this is called when (un)puppeting, which affects lock results
+        invalidate_lock_cache()
 
     def add(self, lockstring, validate_only=False):
         """
@@ -473,6 +630,7 @@ class LockHandler:
         """
         if access_type in self.locks:
             del self.locks[access_type]
+            self._result_cache = {}
             self._save_locks()
             return True
         return False
@@ -485,6 +643,7 @@ class LockHandler:
 
         """
         self.locks = {}
+        self._result_cache = {}
         self.lock_storage = ""
         self._save_locks()
 
@@ -539,18 +698,23 @@ class LockHandler:
 
             Parsing the lockstring, we (during cache) extract the valid
             lock functions and store their function objects in the right
-            order along with their args/kwargs. These are now executed in
-            sequence, creating a list of True/False values. This is put
-            into the evalstring, which is a string of AND/OR/NOT entries
-            separated by placeholders where each function result should
-            go. We just put those results in and evaluate the string to
-            get a final, combined True/False value for the lockstring.
+            order along with their args/kwargs. The evalstring, a string of
+            AND/OR/NOT entries separated by placeholders where each
+            function result should go, is compiled (once) into a tree of
+            closures combining the function results. The lock functions
+            are called in sequence, but only as long as their results are
+            needed to get the final, combined True/False value for the
+            lockstring.
 
             The important bit with this solution is that the full
-            lockstring is never blindly evaluated, and thus there (should
+            lockstring is never evaluated, and thus there (should
             be) no way to sneak in malign code in it. Only "safe" lock
             functions (as defined by your settings) are executed.
 
+            With `settings.LOCK_RESULT_CACHE`, results of locks only
+            depending on permissions, tags and ids are cached until any
+            of those change.
+
         """
         try:
             # check if the lock should be bypassed (e.g. superuser status)
@@ -577,31 +741,50 @@ class LockHandler:
         # no superuser or bypass -> normal lock operation
         if access_type in self.locks:
             # we have a lock, test it.
-            evalstring, func_tup, raw_string = self.locks[access_type]
-            # execute all lock funcs in the correct order, producing a tuple of True/False results.
-            true_false = tuple(
-                bool(tup[0](accessing_obj, self.obj, *tup[1], access_type=access_type, **tup[2]))
-                for tup in func_tup
-            )
-            # the True/False tuple goes into evalstring, which combines them
-            # with AND/OR/NOT in order to get the final result.
-            return eval(evalstring % true_false)
+            if _LOCK_RESULT_CACHE:
+                cachekey = (accessing_obj, access_type)
+                try:
+                    version, result = self._result_cache[cachekey]
+                    if version == _LOCK_CHANGES:
+                        return result
+                except KeyError:
+                    pass
+                except TypeError:
+                    # unhashable accessing_obj
+                    return self._eval_access_type(accessing_obj, self.locks, access_type)
+                result = self._eval_access_type(accessing_obj, self.locks, access_type)
+                if _is_cacheable(self.locks[access_type][1]):
+                    if len(self._result_cache) >= _LOCK_RESULT_CACHE_SIZE:
+                        self._result_cache = {}
+                    self._result_cache[cachekey] = (_LOCK_CHANGES, result)
+                return result
+            return self._eval_access_type(accessing_obj, self.locks, access_type)
         else:
             return default
 
     def _eval_access_type(self, accessing_obj, locks, access_type):
         """
-        Helper method for evaluating the access type using eval().
+        Helper method for evaluating the access type. Lock functions are
+        called in order, but only as long as their results are needed to
+        determine the final result.
 
         Args:
             accessing_obj (object): Object seeking access.
             locks (dict): The pre-parsed representation of all access-types.
             access_type (str): An access-type key to evaluate.
 
+        Returns:
+            bool: The result of the lock.
+
         """
         evalstring, func_tup, raw_string = locks[access_type]
-        true_false = tuple(tup[0](accessing_obj, self.obj, *tup[1], **tup[2]) for tup in func_tup)
-        return eval(evalstring % true_false)
+        accessed_obj = self.obj
+
+        def _call(index):
+            func, args, kwargs = func_tup[index]
+            return bool(func(accessing_obj, accessed_obj, *args, access_type=access_type, **kwargs))
+
+        return _compile_evalstring(evalstring)(_call)
 
     def check_lockstring(
         self, accessing_obj, lockstring, no_superuser_bypass=False, default=False, access_type=None
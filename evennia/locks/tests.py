@@ -15,8 +15,12 @@ try:
 except ImportError:
     from django.test import TestCase, override_settings
 
+from unittest.mock import patch
+
+from parameterized import parameterized
+
 from evennia import settings_default
-from evennia.locks import lockfuncs
+from evennia.locks import lockfuncs, lockhandler
 from evennia.utils.create import create_object
 
 # ------------------------------------------------------------
@@ -42,6 +46,64 @@ class TestLockCheck(BaseEvenniaTest):
         self.assertEqual(True, self.obj1.locks.check(self.obj2, "not_exist", default=True))
 
 
+class TestLockCompile(TestCase):
+    @parameterized.expand(
+        [
+            "%s",
+            "not %s",
+            "%s and %s",
+            "%s or %s",
+            "not %s and %s",
+            "%s or not %s and %s",
+            "%s and %s or %s and not %s",
+            "not not %s or %s",
+        ]
+    )
+    def test_compile_evalstring(self, evalstring):
+        compiled = lockhandler._compile_evalstring(evalstring)
+        nfuncs = evalstring.count("%s")
+        for num in range(2**nfuncs):
+            results = tuple(bool(num & (1 << ibit)) for ibit in range(nfuncs))
+            self.assertEqual(
+                compiled(lambda index: results[index]), eval(evalstring % results), results
+            )
+
+    def test_compile_evalstring__short_circuit(self):
+        called = []
+
+        def _call(index):
+            called.append(index)
+            return index == 0
+
+        self.assertTrue(lockhandler._compile_evalstring("%s or %s")(_call))
+        self.assertEqual(called, [0])
+
+    @parameterized.expand(["", "and", "%s %s", "%s and", "not", "%s or or %s"])
+    def test_compile_evalstring__errors(self, evalstring):
+        with self.assertRaises(SyntaxError):
+            lockhandler._compile_evalstring(evalstring)
+
+
+@patch("evennia.locks.lockhandler._LOCK_RESULT_CACHE", True)
+class TestLockResultCache(BaseEvenniaTest):
+    def test_cache(self):
+        self.obj1.locks.add("edit:perm(Admin);get:attr(heavy)")
+        self.assertFalse(self.obj1.locks.check(self.obj2, "edit"))
+        self.assertEqual(self.obj1.locks._result_cache[(self.obj2, "edit")][1], False)
+        self.assertFalse(self.obj1.locks.check(self.obj2, "edit"))
+        # permission changes invalidate the cache
+        self.obj2.permissions.add("Admin")
+        self.assertTrue(self.obj1.locks.check(self.obj2, "edit"))
+        # lock changes too
+        self.obj1.locks.add("edit:false()")
+        self.assertFalse(self.obj1.locks.check(self.obj2, "edit"))
+        # locks not only depending on permissions, tags or ids are not cached
+        self.assertFalse(self.obj1.locks.check(self.obj2, "get"))
+        self.assertNotIn((self.obj2, "get"), self.obj1.locks._result_cache)
+        self.obj2.db.heavy = True
+        self.assertTrue(self.obj1.locks.check(self.obj2, "get"))
+
+
 class TestLockfuncs(BaseEvenniaTest):
     def setUp(self):
         super().setUp()
@@ -10,6 +10,7 @@ from django.db.models.fields import exceptions
 
 from evennia.server import signals
 from evennia.typeclasses.managers import TypeclassManager, TypedObjectManager
+from evennia.typeclasses.tags import prefetch_tags
 from evennia.utils.utils import (
     class_from_module,
     dbid_to_obj,
@@ -25,6 +26,7 @@ _GA = object.__getattribute__
 _ATTR = None
 
 _MULTIMATCH_REGEX = re.compile(settings.SEARCH_MULTIMATCH_REGEX, re.I + re.U)
+_TYPECLASS_AGGRESSIVE_CACHE = settings.TYPECLASS_AGGRESSIVE_CACHE
 
 # Try to use a custom way to parse id-tagged multimatches.
 
@@ -341,6 +343,73 @@ class ObjectDBManager(TypedObjectManager):
             .order_by("id")
         )
 
+    def _match_candidates(self, ostring, candidates, exact=True, typeclasses=None):
+        """
+        In-memory version of `get_objs_with_key_or_alias` for when all
+        candidates are already loaded. Matches against the keys and the
+        cached aliases of the candidates, without querying the database.
+
+        Args:
+            ostring (str): A search criterion.
+            candidates (list): Candidates to match among, sorted by id and
+                with their alias caches filled (see `prefetch_tags`).
+            exact (bool, optional): Require exact (case-insensitive) match of
+                `ostring`. If `False`, match the beginning of words in order.
+            typeclasses (list, optional): Only match objects having these
+                typeclass paths.
+
+        Returns:
+            list: The matching candidates, in the same order as the
+                queryset returned by `get_objs_with_key_or_alias`.
+
+        """
+        if not isinstance(ostring, str):
+            if hasattr(ostring, "key"):
+                ostring = ostring.key
+            else:
+                return []
+        if exact:
+            ostring = ostring.lower()
+
+            def _match(string):
+                return string.lower() == ostring
+
+        else:
+            search_regex = re.compile(
+                r".* ".join(r"\b" + re.escape(word) for word in ostring.split()) + r".*", re.I
+            )
+
+            def _match(string):
+                return search_regex.search(string) is not None
+
+        matches = []
+        for obj in candidates:
+            if typeclasses and obj.db_typeclass_path not in typeclasses:
+                continue
+            if _match(obj.db_key) or any(_match(alias) for alias in obj.aliases.all()):
+                matches.append(obj)
+        return matches
+
+    def _queryset_from_matches(self, matches):
+        """
+        Wrap in-memory matches in a queryset that is already evaluated, so
+        iterating, indexing or counting it does not hit the database.
+
+        Args:
+            matches (list): Objects to wrap, sorted by id.
+
+        Returns:
+            QuerySet: A queryset holding `matches`. Chaining it (such as
+                with `.filter`) builds a new, regular query for these ids.
+
+        """
+        if not matches:
+            return self.none()
+        queryset = self.filter(id__in=[obj.id for obj in matches]).order_by("id")
+        queryset._result_cache = list(matches)
+        queryset._prefetch_done = True
+        return queryset
+
     # main search methods and helper functions
 
     def search_object(
@@ -399,6 +468,11 @@ class ObjectDBManager(TypedObjectManager):
             """
             Helper method for searching objects.
             """
+            if in_memory:
+                # all candidates are loaded - match their keys and cached aliases
+                return self._match_candidates(
+                    searchdata, candidates, exact=exact, typeclasses=typeclass
+                )
             if attribute_name:
                 # attribute/property search (always exact).
                 matches = self.get_objs_with_db_property_value(
@@ -429,7 +503,26 @@ class ObjectDBManager(TypedObjectManager):
             # Convenience check to make sure candidates are really dbobjs
             candidates = [cand for cand in make_iter(candidates) if cand]
 
+        # a plain key/alias search among loaded candidates is done in memory, so the
+        # database is only queried for global searches
+        in_memory = (
+            _TYPECLASS_AGGRESSIVE_CACHE
+            and candidates is not None
+            and not attribute_name
+            and not tags
+            and all(isinstance(cand, self.model) and cand.pk for cand in candidates)
+        )
+        if in_memory:
+            candidates = sorted(
+                {cand.id: cand for cand in candidates}.values(), key=lambda cand: cand.id
+            )
+            prefetch_tags(candidates, tagtype="alias")
+
         dbref = not attribute_name and exact and use_dbref and self.dbref(searchdata)
+        if in_memory and dbref:
+            dbref_match = [cand for cand in candidates if cand.id == int(dbref)]
+            if dbref_match:
+                return self._queryset_from_matches(dbref_match)
         if dbref:
             # Easiest case - dbref matching (always exact)
             dbref_match = self.dbref_search(dbref)
@@ -478,6 +571,10 @@ class ObjectDBManager(TypedObjectManager):
             matches = _searcher(stripped_searchdata, candidates, typeclass, exact=False)
 
         # deal with result
+        if in_memory:
+            if match_number is not None:
+                matches = matches[match_number : match_number + 1] if match_number >= 0 else []
+            return self._queryset_from_matches(matches)
         if match_number is not None:
             if 0 <= match_number < len(matches):
                 # limit to one match (we still want a queryset back)
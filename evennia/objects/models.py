@@ -52,6 +52,10 @@ class ContentsHandler:
         self._pkcache = {}
         self._idcache = obj.__class__.__instance_cache__
         self._typecache = defaultdict(dict)
+        # increased whenever the contents change
+        self.version = 0
+        # snapshot of the contents with cmdsets, maintained by the cmdhandler
+        self.cmdset_objects = None
         self.init()
 
     def load(self):
@@ -69,6 +73,7 @@ class ContentsHandler:
 
         """
         objects = self.load()
+        self.version += 1
         self._typecache = defaultdict(dict)
         self._pkcache = {obj.pk: True for obj in objects}
         for obj in objects:
@@ -125,6 +130,7 @@ class ContentsHandler:
 
         """
         self._pkcache[obj.pk] = obj
+        self.version += 1
         for ctype in obj._content_types:
             self._typecache[ctype][obj.pk] = True
 
@@ -137,6 +143,7 @@ class ContentsHandler:
 
         """
         self._pkcache.pop(obj.pk, None)
+        self.version += 1
         for ctype in obj._content_types:
             if obj.pk in self._typecache[ctype]:
                 self._typecache[ctype].pop(obj.pk, None)
@@ -22,6 +22,7 @@ from evennia.scripts.scripthandler import ScriptHandler
 from evennia.server.signals import SIGNAL_EXIT_TRAVERSED
 from evennia.typeclasses.attributes import ModelAttributeBackend, NickHandler
 from evennia.typeclasses.models import TypeclassBase
+from evennia.typeclasses.tags import prefetch_tags
 from evennia.utils import ansi, create, funcparser, logger, search
 from evennia.utils.utils import (
     class_from_module,
@@ -48,6 +49,8 @@ _SESSID_MAX = 16 if _MULTISESSION_MODE in (1, 3) else 1
 
 # init the actor-stance funcparser for msg_contents
 _MSG_CONTENTS_PARSER = funcparser.FuncParser(funcparser.ACTOR_STANCE_CALLABLES)
+# callables giving a new result every call; msg_contents parses these per receiver
+_MSG_CONTENTS_RANDOM_CALLABLES = ("random", "randint", "choice")
 
 
 class ObjectSessionHandler:
@@ -1098,6 +1101,13 @@ class DefaultObject(ObjectDB, metaclass=TypeclassBase):
             `mapping[key].get_display_name(looker=recipient)` may be called
             depending on who the recipient is.
 
+            Recipients who would see the same text (because they see the
+            same display names of the mapped objects and are themselves
+            the same ones of those objects, if any) share a single parse
+            of `text`. Inline callables are expected to give the same
+            result for the same receiver; the exceptions are `$random`,
+            `$randint` and `$choice`, which are parsed for every recipient.
+
         Examples:
 
             Let's assume:
@@ -1144,30 +1154,46 @@ class DefaultObject(ObjectDB, metaclass=TypeclassBase):
             exclude = make_iter(exclude)
             contents = [obj for obj in contents if obj not in exclude]
 
-        for receiver in contents:
-            # actor-stance replacements
-            outmessage = _MSG_CONTENTS_PARSER.parse(
-                inmessage,
-                raise_errors=raise_funcparse_errors,
-                return_string=True,
-                caller=you,
-                receiver=receiver,
-                mapping=mapping,
+        # Receivers seeing the same output share a single render. Beyond the
+        # mapped objects' display names, the output only depends on which of
+        # the mapped objects (if any) is the receiver - unless random results
+        # are involved, which must be rolled for each receiver.
+        start_char = _MSG_CONTENTS_PARSER.start_char
+        share_renders = not (
+            isinstance(inmessage, str)
+            and any(
+                f"{start_char}{funcname}(" in inmessage
+                for funcname in _MSG_CONTENTS_RANDOM_CALLABLES
             )
-
-            # director-stance replacements
-            outmessage = outmessage.format_map(
-                {
-                    key: (
-                        obj.get_display_name(looker=receiver)
-                        if hasattr(obj, "get_display_name")
-                        else str(obj)
-                    )
-                    for key, obj in mapping.items()
-                }
+        )
+        renders = {}
+        for receiver in contents:
+            display_names = {
+                key: (
+                    obj.get_display_name(looker=receiver)
+                    if hasattr(obj, "get_display_name")
+                    else str(obj)
+                )
+                for key, obj in mapping.items()
+            }
+            render_key = (
+                tuple(obj == receiver for obj in mapping.values()),
+                tuple(display_names.values()),
             )
+            if not share_renders or render_key not in renders:
+                # actor-stance replacements
+                outmessage = _MSG_CONTENTS_PARSER.parse(
+                    inmessage,
+                    raise_errors=raise_funcparse_errors,
+                    return_string=True,
+                    caller=you,
+                    receiver=receiver,
+                    mapping=mapping,
+                )
+                # director-stance replacements
+                renders[render_key] = outmessage.format_map(display_names)
 
-            receiver.msg(text=(outmessage, outkwargs), from_obj=from_obj, **kwargs)
+            receiver.msg(text=(renders[render_key], outkwargs), from_obj=from_obj, **kwargs)
 
     def move_to(
         self,
@@ -1830,6 +1856,8 @@ class DefaultObject(ObjectDB, metaclass=TypeclassBase):
         """
         # sort and handle same-named things
         things = self.filter_visible(self.contents_get(content_type="object"), looker, **kwargs)
+        # load the (plural) aliases used by get_numbered_name in one go
+        prefetch_tags(things, tagtype="alias")
 
         grouped_things = defaultdict(list)
         for thing in things:
@@ -1,4 +1,5 @@
 from unittest import skip
+from unittest.mock import MagicMock, patch
 
 from evennia.objects.models import ObjectDB
 from evennia.objects.objects import (
@@ -240,6 +241,43 @@ class DefaultObjectTest(BaseEvenniaTest):
             self.obj1.get_numbered_name(1, self.char1, return_string=True, no_article=True), "Obj"
         )
 
+    def test_msg_contents__shared_render(self):
+        from evennia.objects import objects
+
+        receivers = self.room1.contents
+        for receiver in receivers:
+            receiver.msg = MagicMock()
+
+        with patch.object(
+            objects._MSG_CONTENTS_PARSER, "parse", wraps=objects._MSG_CONTENTS_PARSER.parse
+        ) as mock_parse:
+            self.room1.msg_contents(
+                "$You() $conj(smile) at {target}.",
+                from_obj=self.char1,
+                mapping={"target": self.obj1},
+            )
+
+        outputs = {receiver: receiver.msg.call_args[1]["text"][0] for receiver in receivers}
+        self.assertEqual(outputs[self.char1], "You smile at Obj.")
+        self.assertEqual(outputs[self.obj2], "Char smiles at Obj.")
+        # one parse each for the actor, the target and all other onlookers
+        self.assertLess(mock_parse.call_count, len(receivers))
+        self.assertEqual(mock_parse.call_count, 3)
+
+    def test_msg_contents__random_not_shared(self):
+        from evennia.objects import objects
+
+        receivers = self.room1.contents
+        for receiver in receivers:
+            receiver.msg = MagicMock()
+
+        with patch.object(
+            objects._MSG_CONTENTS_PARSER, "parse", wraps=objects._MSG_CONTENTS_PARSER.parse
+        ) as mock_parse:
+            self.room1.msg_contents("The die shows $randint(1, 6).", from_obj=self.char1)
+        # rolled for every receiver
+        self.assertEqual(mock_parse.call_count, len(receivers))
+
 
 class TestObjectManager(BaseEvenniaTest):
     "Test object manager methods"
@@ -348,6 +386,49 @@ class TestObjectManager(BaseEvenniaTest):
         )
         self.assertEqual(list(query), [self.char1])
 
+    def test_search_object_candidates_in_memory(self):
+        self.obj1.key = "big sword"
+        self.obj2.key = "shiny sword"
+        self.obj2.aliases.add("Blade")
+        candidates = [self.char2, self.obj2, self.obj1, self.char1, self.obj1]
+        searches = (
+            ("big sword", {}),
+            ("BLADE", {}),
+            ("sword", {}),
+            ("sw", {"exact": False}),
+            ("b sw", {"exact": False}),
+            ("wor", {"exact": False}),
+            ("bla", {"exact": False}),
+            ("", {"exact": False}),
+            ("sword-2", {"exact": False}),
+            ("sw-2", {"exact": False}),
+            ("sword-3", {"exact": False}),
+            ("sword-0", {"exact": False}),
+            ("Char", {"typeclass": DefaultCharacter}),
+            ("Char", {"typeclass": "evennia.objects.objects.DefaultObject"}),
+            (self.obj1.dbref, {}),
+            (self.char1, {}),
+        )
+        # the first search loads the aliases of all candidates at once
+        with self.assertNumQueries(1):
+            ObjectDB.objects.search_object("sword", candidates=candidates)
+        for searchdata, kwargs in searches:
+            with patch("evennia.objects.manager._TYPECLASS_AGGRESSIVE_CACHE", False):
+                expected = list(
+                    ObjectDB.objects.search_object(searchdata, candidates=candidates, **kwargs)
+                )
+            with self.assertNumQueries(0):
+                result = list(
+                    ObjectDB.objects.search_object(searchdata, candidates=candidates, **kwargs)
+                )
+            self.assertEqual(result, expected, searchdata)
+
+        # a dbref outside the candidates still needs the database to tell it exists
+        self.assertFalse(ObjectDB.objects.search_object(self.room1.dbref, candidates=candidates))
+        query = ObjectDB.objects.search_object("sw-2", candidates=candidates, exact=False)
+        self.assertEqual(list(query), [self.obj2])
+        self.assertEqual(list(query.filter(db_key="shiny sword")), [self.obj2])
+
     def test_get_objs_with_attr(self):
         self.obj1.db.testattr = "testval1"
         query = ObjectDB.objects.get_objs_with_attr("testattr")
@@ -134,12 +134,19 @@ prototype, override its name with an empty dict.
 
 import copy
 import hashlib
+import pickle
 import time
+from collections import defaultdict
 
 from django.conf import settings
+from django.db import connection, transaction
 from django.utils.translation import gettext as _
+from twisted.internet import reactor
+from twisted.internet.defer import inlineCallbacks
+from twisted.internet.task import deferLater
 
 import evennia
+from evennia.locks.lockhandler import invalidate_lock_cache
 from evennia.objects.models import ObjectDB
 from evennia.prototypes import prototypes as protlib
 from evennia.prototypes.prototypes import (
@@ -149,9 +156,19 @@ from evennia.prototypes.prototypes import (
     value_to_obj,
     value_to_obj_or_any,
 )
+from evennia.typeclasses.attributes import Attribute, prefetch_attributes
+from evennia.typeclasses.tags import prefetch_tags
 from evennia.utils import logger
+from evennia.utils.dbserialize import discard_pending_save, get_pending_value, to_pickle
 from evennia.utils.utils import class_from_module, is_iter, make_iter
 
+# delayed imports
+_DEFAULT_OBJECT = None
+_MONITOR_HANDLER = None
+
+# how many objects `batch_update_objects_with_prototype` updates in one go
+_UPDATE_CHUNK_SIZE = 500
+
 _CREATE_OBJECT_KWARGS = ("key", "location", "home", "destination")
 _PROTOTYPE_META_NAMES = (
     "prototype_key",
@@ -635,7 +652,15 @@ def format_diff(diff, minimal=True):
 
 
 def batch_update_objects_with_prototype(
-    prototype, diff=None, objects=None, exact=False, caller=None, protfunc_raise_errors=True
+    prototype,
+    diff=None,
+    objects=None,
+    exact=False,
+    caller=None,
+    protfunc_raise_errors=True,
+    chunk_size=None,
+    progress_callback=None,
+    yield_to_reactor=False,
 ):
     """
     Update existing objects with the latest version of the prototype.
@@ -644,7 +669,8 @@ def batch_update_objects_with_prototype(
         prototype (str or dict): Either the `prototype_key` to use or the
             prototype dict itself.
         diff (dict, optional): This a diff structure that describes how to update the protototype.
-            If not given this will be constructed from the first object found.
+            If not given, a diff is calculated for every object. Objects in the same state share
+            their diff, so this is only done once for each distinct object state.
         objects (list, optional): List of objects to update. If not given, query for these
             objects using the prototype's `prototype_key`.
         exact (bool, optional): By default (`False`), keys not explicitly in the prototype will
@@ -656,8 +682,21 @@ def batch_update_objects_with_prototype(
         caller (Object or Account, optional): This may be used by protfuncs to do permission checks.
         protfunc_raise_errors (bool): Have protfuncs raise explicit errors if malformed/not found.
             This is highly recommended.
+        chunk_size (int, optional): How many objects to update in one go. Defaults to 500.
+        progress_callback (callable, optional): Called after each chunk of objects as
+            `progress_callback(nprocessed, ntotal, nchanged)`.
+        yield_to_reactor (bool, optional): Let the server do other things between the chunks,
+            rather than blocking until all objects are updated. This makes this function
+            return a `Deferred`.
+
     Returns:
-        changed (int): The number of objects that had changes applied to them.
+        changed (int or Deferred): The number of objects that had changes applied to them. If
+            `yield_to_reactor` is set, this is a `Deferred` firing with this number.
+
+    Notes:
+        The changes to each chunk of objects are written to the database with bulk queries. A
+        prototype containing protfuncs that fail for an object leaves that object unchanged,
+        beyond tagging it with the prototype.
 
     """
     prototype = protlib.homogenize_prototype(prototype)
@@ -673,140 +712,742 @@ def batch_update_objects_with_prototype(
 
     if not objects:
         objects = ObjectDB.objects.get_by_tag(prototype_key, category=PROTOTYPE_TAG_CATEGORY)
+    objects = list(objects)
+
+    chunks = _update_chunks(
+        objects,
+        prototype,
+        new_prototype,
+        flatten_diff(diff) if diff else None,
+        exact,
+        chunk_size or _UPDATE_CHUNK_SIZE,
+        progress_callback,
+        caller,
+        protfunc_raise_errors,
+    )
+    if yield_to_reactor:
+        return _run_chunks_in_reactor(chunks)
+    changed = 0
+    for _, _, changed in chunks:
+        pass
+    return changed
 
-    if not objects:
-        return 0
 
-    if not diff:
-        diff, _ = prototype_diff_from_object(new_prototype, objects[0])
+@inlineCallbacks
+def _run_chunks_in_reactor(chunks):
+    """
+    Run the chunks of an object update, giving the reactor a chance to do
+    other things in between them.
+
+    Args:
+        chunks (generator): The update, as returned from `_update_chunks`.
 
-    # make sure the diff is flattened
-    diff = flatten_diff(diff)
+    Returns:
+        Deferred: Fires with the number of changed objects.
 
+    """
     changed = 0
-    for obj in objects:
-        do_save = False
+    for nprocessed, ntotal, changed in chunks:
+        if nprocessed < ntotal:
+            yield deferLater(reactor, 0, lambda: None)
+    return changed
 
-        old_prot_key = obj.tags.get(category=PROTOTYPE_TAG_CATEGORY, return_list=True)
-        old_prot_key = old_prot_key[0] if old_prot_key else None
 
+def _object_fingerprint(obj, keys):
+    """
+    Summarize the state of an object that `prototype_diff_from_object` looks
+    at. Objects with the same fingerprint get the same diff.
+
+    Args:
+        obj (Object): The object to fingerprint.
+        keys (tuple): The prototype keys to consider, out of
+            `_PROTOTYPE_ROOT_NAMES`.
+
+    Returns:
+        tuple: The fingerprint.
+
+    """
+    # the prototype tag decides what the object's prototype meta keys are
+    state = [tuple(obj.tags.get(category=PROTOTYPE_TAG_CATEGORY, return_list=True))]
+    for key in keys:
+        if key == "key":
+            state.append(obj.db_key)
+        elif key == "typeclass":
+            state.append(obj.db_typeclass_path)
+        elif key in ("location", "home", "destination"):
+            state.append(getattr(obj, "db_%s_id" % key))
+        elif key == "locks":
+            state.append(obj.db_lock_storage)
+        elif key in ("permissions", "aliases"):
+            state.append(tuple(sorted(getattr(obj, key).get(return_list=True))))
+        elif key == "tags":
+            state.append(
+                tuple(
+                    sorted(
+                        (tag.db_key, tag.db_category or "", tag.db_data or "")
+                        for tag in obj.tags.all(return_objs=True)
+                    )
+                )
+            )
+        elif key == "attrs":
+            attrs = []
+            for attr in obj.attributes.all():
+                value = get_pending_value(attr)
+                value = attr.db_value if value is None else to_pickle(value)
+                # compare on the pickled value, since the repr may not show the full value
+                try:
+                    value = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                except Exception:
+                    # never equal to the value of another object
+                    value = obj.id
+                attrs.append((attr.db_key, attr.db_category or "", value, attr.db_lock_storage))
+            state.append(tuple(sorted(attrs)))
+    return tuple(state)
+
+
+def _update_chunks(
+    objects,
+    prototype,
+    new_prototype,
+    diff,
+    exact,
+    chunk_size,
+    progress_callback,
+    caller,
+    protfunc_raise_errors,
+):
+    """
+    Update objects with a prototype, one chunk of objects at a time.
+
+    Args:
+        objects (list): The objects to update.
+        prototype (str or dict): The prototype, as given to `batch_update_objects_with_prototype`.
+        new_prototype (dict): The prototype to apply.
+        diff (dict or None): A flattened diff to apply to all objects. If `None`, calculate
+            the diff for each distinct object state.
+        exact (bool): If keys not in the prototype should be removed from the objects.
+        chunk_size (int): How many objects to update in one go.
+        progress_callback (callable or None): Called with the progress after each chunk.
+        caller (Object or Account or None): Passed on to protfuncs.
+        protfunc_raise_errors (bool): Have protfuncs raise errors.
+
+    Yields:
+        tuple: `(nprocessed, ntotal, nchanged)` after each chunk.
+
+    """
+    ntotal = len(objects)
+    keys = tuple(key for key in _PROTOTYPE_ROOT_NAMES if exact or key in new_prototype)
+    diffs = {}
+    nchanged = 0
+    for start in range(0, ntotal, chunk_size):
+        # skip objects deleted since the update started
+        chunk = [obj for obj in objects[start : start + chunk_size] if obj.pk]
+        prefetch_tags(chunk)
+        prefetch_tags(chunk, tagtype="alias")
+        prefetch_tags(chunk, tagtype="permission")
+        prefetch_attributes(chunk)
+
+        objdiffs = []
+        for obj in chunk:
+            objdiff = diff
+            if objdiff is None:
+                fingerprint = _object_fingerprint(obj, keys)
+                objdiff = diffs.get(fingerprint)
+                if objdiff is None:
+                    objdiff = flatten_diff(prototype_diff_from_object(new_prototype, obj)[0])
+                    diffs[fingerprint] = objdiff
+            objdiffs.append((obj, objdiff))
+
+        nchanged += _bulk_update_objects(
+            objdiffs, prototype, new_prototype, exact, caller, protfunc_raise_errors
+        )
+        nprocessed = min(start + chunk_size, ntotal)
+        if progress_callback:
+            progress_callback(nprocessed, ntotal, nchanged)
+        yield nprocessed, ntotal, nchanged
+
+
+def _plan_update(obj, diff, new_prototype, exact, init):
+    """
+    Work out the changes a diff makes to an object, without applying them.
+
+    Args:
+        obj (Object): The object to update.
+        diff (dict): The flattened diff to apply.
+        new_prototype (dict): The prototype to apply.
+        exact (bool): If keys not in the prototype should be removed from the object.
+        init (callable): Called as `init(value, type)` to get the value to set.
+
+    Returns:
+        dict or None: The changes, or `None` if the diff changes nothing.
+
+    """
+    changes = {
+        "fields": {},
+        "locks": None,
+        "tagclears": [],
+        "tags": [],
+        "attrclear": False,
+        "attrremoves": [],
+        "attrs": [],
+    }
+    do_save = False
+    for key, directive in diff.items():
+        if key not in new_prototype and not exact:
+            # we don't update the object if the prototype does not actually
+            # contain the key (the diff will report REMOVE but we ignore it
+            # since exact=False)
+            continue
+
+        if directive in ("UPDATE", "REPLACE"):
+            if key in _PROTOTYPE_META_NAMES:
+                # prototype meta keys are not stored on-object
+                continue
+
+            val = new_prototype[key]
+            do_save = True
+
+            if key == "key":
+                changes["fields"]["db_key"] = init(val, str)
+            elif key == "typeclass":
+                changes["fields"]["db_typeclass_path"] = init(val, str)
+            elif key in ("location", "home", "destination"):
+                changes["fields"]["db_%s" % key] = init(val, value_to_obj)
+            elif key == "locks":
+                changes["locks"] = (init(val, str), directive == "REPLACE")
+            elif key in ("permissions", "aliases"):
+                handler = getattr(obj, key)
+                if directive == "REPLACE":
+                    changes["tagclears"].append(handler)
+                changes["tags"].append((handler, [init(tag, str) for tag in val]))
+            elif key == "tags":
+                if directive == "REPLACE":
+                    changes["tagclears"].append(obj.tags)
+                changes["tags"].append(
+                    (
+                        obj.tags,
+                        [(init(ttag, str), tcategory, tdata) for ttag, tcategory, tdata in val],
+                    )
+                )
+            elif key == "attrs":
+                if directive == "REPLACE":
+                    changes["attrclear"] = True
+                changes["attrs"].extend(
+                    (init(akey, str), init(aval, value_to_obj), acategory, alocks)
+                    for akey, aval, acategory, alocks in val
+                )
+            elif key == "exec":
+                # we don't auto-rerun exec statements, it would be huge security risk!
+                pass
+            else:
+                # None for the lockstring keeps the locks of an existing Attribute
+                changes["attrs"].append((key, init(val, value_to_obj), None, None))
+        elif directive == "REMOVE":
+            do_save = True
+            if key == "key":
+                changes["fields"]["db_key"] = ""
+            elif key == "typeclass":
+                # fall back to default
+                changes["fields"]["db_typeclass_path"] = settings.BASE_OBJECT_TYPECLASS
+            elif key in ("location", "home", "destination"):
+                changes["fields"]["db_%s" % key] = None
+            elif key == "locks":
+                changes["locks"] = ("", True)
+            elif key in ("permissions", "aliases", "tags"):
+                changes["tagclears"].append(getattr(obj, key))
+            elif key == "attrs":
+                changes["attrclear"] = True
+            elif key == "exec":
+                # we don't auto-rerun exec statements, it would be huge security risk!
+                pass
+            else:
+                changes["attrremoves"].append(key)
+    return changes if do_save else None
+
+
+def _bulk_update_objects(objdiffs, prototype, new_prototype, exact, caller, protfunc_raise_errors):
+    """
+    Apply prototype diffs to many objects, writing the changes of all of them
+    to the database with a few bulk queries.
+
+    Args:
+        objdiffs (list): Tuples `(obj, diff)` with the flattened diff to apply to each object.
+        prototype (str or dict): The prototype, as given to `batch_update_objects_with_prototype`.
+        new_prototype (dict): The prototype to apply.
+        exact (bool): If keys not in the prototype should be removed from the objects.
+        caller (Object or Account or None): Passed on to protfuncs.
+        protfunc_raise_errors (bool): Have protfuncs raise errors.
+
+    Returns:
+        int: The number of objects that had changes applied to them.
+
+    """
+    global _MONITOR_HANDLER
+    if not _MONITOR_HANDLER:
+        from evennia.scripts.monitorhandler import MONITOR_HANDLER as _MONITOR_HANDLER
+
+    prototype_key = new_prototype["prototype_key"]
+
+    def _init(val, typ):
+        return init_spawn_value(
+            val,
+            typ,
+            caller=caller,
+            prototype=new_prototype,
+            protfunc_raise_errors=protfunc_raise_errors,
+        )
+
+    planned = []
+    for obj, diff in objdiffs:
         try:
-            for key, directive in diff.items():
-                if key not in new_prototype and not exact:
-                    # we don't update the object if the prototype does not actually
-                    # contain the key (the diff will report REMOVE but we ignore it
-                    # since exact=False)
-                    continue
-
-                if directive in ("UPDATE", "REPLACE"):
-                    if key in _PROTOTYPE_META_NAMES:
-                        # prototype meta keys are not stored on-object
-                        continue
-
-                    val = new_prototype[key]
-                    do_save = True
-
-                    def _init(val, typ):
-                        return init_spawn_value(
-                            val,
-                            typ,
-                            caller=caller,
-                            prototype=new_prototype,
-                            protfunc_raise_errors=protfunc_raise_errors,
-                        )
-
-                    if key == "key":
-                        obj.db_key = _init(val, str)
-                    elif key == "typeclass":
-                        obj.db_typeclass_path = _init(val, str)
-                    elif key == "location":
-                        obj.db_location = _init(val, value_to_obj)
-                    elif key == "home":
-                        obj.db_home = _init(val, value_to_obj)
-                    elif key == "destination":
-                        obj.db_destination = _init(val, value_to_obj)
-                    elif key == "locks":
-                        if directive == "REPLACE":
-                            obj.locks.clear()
-                        obj.locks.add(_init(val, str))
-                    elif key == "permissions":
-                        if directive == "REPLACE":
-                            obj.permissions.clear()
-                        obj.permissions.batch_add(*(_init(perm, str) for perm in val))
-                    elif key == "aliases":
-                        if directive == "REPLACE":
-                            obj.aliases.clear()
-                        obj.aliases.batch_add(*(_init(alias, str) for alias in val))
-                    elif key == "tags":
-                        if directive == "REPLACE":
-                            obj.tags.clear()
-                        obj.tags.batch_add(
-                            *(
-                                (_init(ttag, str), tcategory, tdata)
-                                for ttag, tcategory, tdata in val
-                            )
-                        )
-                    elif key == "attrs":
-                        if directive == "REPLACE":
-                            obj.attributes.clear()
-                        obj.attributes.batch_add(
-                            *(
-                                (
-                                    _init(akey, str),
-                                    _init(aval, value_to_obj),
-                                    acategory,
-                                    alocks,
-                                )
-                                for akey, aval, acategory, alocks in val
-                            )
-                        )
-                    elif key == "exec":
-                        # we don't auto-rerun exec statements, it would be huge security risk!
-                        pass
-                    else:
-                        obj.attributes.add(key, _init(val, value_to_obj))
-                elif directive == "REMOVE":
-                    do_save = True
-                    if key == "key":
-                        obj.db_key = ""
-                    elif key == "typeclass":
-                        # fall back to default
-                        obj.db_typeclass_path = settings.BASE_OBJECT_TYPECLASS
-                    elif key == "location":
-                        obj.db_location = None
-                    elif key == "home":
-                        obj.db_home = None
-                    elif key == "destination":
-                        obj.db_destination = None
-                    elif key == "locks":
-                        obj.locks.clear()
-                    elif key == "permissions":
-                        obj.permissions.clear()
-                    elif key == "aliases":
-                        obj.aliases.clear()
-                    elif key == "tags":
-                        obj.tags.clear()
-                    elif key == "attrs":
-                        obj.attributes.clear()
-                    elif key == "exec":
-                        # we don't auto-rerun exec statements, it would be huge security risk!
-                        pass
-                    else:
-                        obj.attributes.remove(key)
+            changes = _plan_update(obj, diff, new_prototype, exact, _init)
         except Exception:
             logger.log_trace(f"Failed to apply prototype '{prototype_key}' to {obj}.")
-        finally:
-            # we must always make sure to re-add the prototype tag
-            obj.tags.clear(category=PROTOTYPE_TAG_CATEGORY)
-            obj.tags.add(prototype_key, category=PROTOTYPE_TAG_CATEGORY)
+            continue
+        if changes:
+            planned.append((obj, changes))
+
+    # we must always make sure the objects are tagged with (only) this prototype
+    prototag = _clean_tags([(prototype_key, PROTOTYPE_TAG_CATEGORY)])
+    tagclears = [handler for _, changes in planned for handler in changes["tagclears"]]
+    cleared = {id(handler.obj) for handler in tagclears if handler is handler.obj.tags}
+    retagged = []
+    untagged = []
+    for obj, _ in objdiffs:
+        if id(obj) in cleared:
+            retagged.append(obj)
+        elif obj.tags.get(category=PROTOTYPE_TAG_CATEGORY, return_list=True) != [prototag[0][0]]:
+            untagged.append(obj.tags)
+            retagged.append(obj)
+
+    with transaction.atomic():
+        _bulk_clear_tags(tagclears)
+        _bulk_clear_tags(untagged, category=PROTOTYPE_TAG_CATEGORY)
+        objtags = [(obj, obj.tags, prototag) for obj in retagged]
+        for obj, changes in planned:
+            objtags.extend(
+                (obj, handler, _clean_tags(make_iter(tags))) for handler, tags in changes["tags"]
+            )
+        _bulk_add_tags(objtags)
+
+        objattrs = []
+        for obj, changes in planned:
+            if changes["attrclear"]:
+                objattrs.append((obj, obj.attributes.all()))
+            elif changes["attrremoves"]:
+                objattrs.append(
+                    (
+                        obj,
+                        [
+                            attr
+                            for key in changes["attrremoves"]
+                            for attr in obj.attributes.backend.get(key, None)
+                        ],
+                    )
+                )
+        _bulk_delete_attributes(objattrs)
+        _bulk_add_attributes([(obj, changes["attrs"]) for obj, changes in planned])
+
+        moved = []
+        objs_by_fields = defaultdict(list)
+        for obj, changes in planned:
+            fields = changes["fields"]
+            if "db_location" in fields and fields["db_location"] != obj.db_location:
+                moved.append((obj, obj.db_location))
+            for fieldname, value in fields.items():
+                setattr(obj, fieldname, value)
+            if changes["locks"]:
+                lockstring, replace = changes["locks"]
+                if _merge_locks(obj, lockstring, replace=replace):
+                    fields = dict(fields, db_lock_storage=obj.db_lock_storage)
+            if fields:
+                objs_by_fields[tuple(fields)].append(obj)
+        for fieldnames, objs in objs_by_fields.items():
+            _bulk_save_fields(objs, fieldnames)
+
+    # update contents caches the way the location setter does
+    for obj, old_location in moved:
+        if old_location:
+            old_location.contents_cache.remove(obj)
+        if obj.db_location:
+            obj.db_location.contents_cache.add(obj)
+    for fieldnames, objs in objs_by_fields.items():
+        for obj in objs:
+            # the contents caches are already up to date
+            obj._safe_contents_update = True
+            for fieldname in fieldnames:
+                _MONITOR_HANDLER.at_update(obj, fieldname)
+                hook = getattr(obj, "at_%s_postsave" % fieldname, None)
+                if callable(hook):
+                    hook(False)
+            del obj._safe_contents_update
+
+    for obj, _ in planned:
+        if spawn_hook := getattr(obj, "at_object_post_spawn", None):
+            spawn_hook(prototype=prototype)
+    return len(planned)
 
-        if do_save:
-            changed += 1
-            obj.save()
-            if spawn_hook := getattr(obj, "at_object_post_spawn", None):
-                spawn_hook(prototype=prototype)
 
-    return changed
+def _bulk_save_fields(instances, fieldnames):
+    """
+    Save fields of many database instances of the same model, with one
+    UPDATE query for each distinct combination of values. Objects spawned
+    from the same prototype mostly get the same values, which makes this a
+    lot faster than Django's `bulk_update`.
+
+    Args:
+        instances (list): The instances to save.
+        fieldnames (list): The names of the fields to save.
+
+    """
+    if not instances:
+        return
+    model = instances[0].__dbclass__
+    attnames = [model._meta.get_field(fieldname).attname for fieldname in fieldnames]
+    groups = {}
+    for instance in instances:
+        values = tuple(getattr(instance, attname) for attname in attnames)
+        # group on the pickled values, since values like Attribute values may not be
+        # hashable, and equal values may still differ (like 1 and True)
+        try:
+            groupkey = pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # save on its own
+            groupkey = instance.id
+        groups.setdefault(groupkey, (values, []))[1].append(instance.id)
+    for values, ids in groups.values():
+        model.objects.filter(id__in=ids).update(**dict(zip(attnames, values)))
+
+
+def _bulk_clear_tags(handlers, category=None):
+    """
+    Remove the Tags of many objects, with one query per type of Tag.
+
+    Args:
+        handlers (list): The Tag handlers to clear, such as `obj.aliases`.
+        category (str, optional): Only clear Tags of this category.
+
+    """
+    by_tagtype = defaultdict(list)
+    for handler in handlers:
+        by_tagtype[handler._tagtype].append(handler)
+    for tagtype, tagtype_handlers in by_tagtype.items():
+        query = {
+            "objectdb_id__in": [handler._objid for handler in tagtype_handlers],
+            "tag__db_model": tagtype_handlers[0]._model,
+            "tag__db_tagtype": tagtype,
+        }
+        if category:
+            query["tag__db_category"] = category.strip().lower()
+        ObjectDB.db_tags.through.objects.filter(**query).delete()
+        for handler in tagtype_handlers:
+            handler.reset_cache()
+
+
+def _bulk_delete_attributes(objattrs):
+    """
+    Delete Attributes from many objects with a single query.
+
+    Args:
+        objattrs (list): Tuples `(obj, attrs)` with the Attributes to delete
+            from each object.
+
+    """
+    attr_ids = set()
+    for obj, attrs in objattrs:
+        for attr in attrs:
+            discard_pending_save(attr)
+            backend = obj.attributes.backend
+            complete = backend._cache_complete
+            backend._delete_cache(attr.db_key, attr.db_category)
+            # the cache still holds all other Attributes of the object
+            backend._cache_complete = complete
+            attr_ids.add(attr.id)
+    if attr_ids:
+        Attribute.objects.filter(id__in=attr_ids).delete()
+
+
+def _create_object(obj, objparam):
+    """
+    Create one object by saving it normally, which runs `at_first_save` and
+    adds its properties one by one.
+
+    Args:
+        obj (Object): The new, unsaved object.
+        objparam (tuple): The parameters for the object, as described in
+            `batch_create_object`.
+
+    """
+    # setup
+    obj._createdict = {
+        "permissions": make_iter(objparam[1]),
+        "locks": objparam[2],
+        "aliases": make_iter(objparam[3]),
+        "nattributes": objparam[4],
+        "attributes": objparam[5],
+        "tags": make_iter(objparam[6]),
+    }
+    # this triggers all hooks
+    obj.save()
+
+
+def _clean_tags(tags):
+    """
+    Clean Tag input the same way as `TagHandler.batch_add` does.
+
+    Args:
+        tags (list): Tag keys or tuples `(key, category[, data])`.
+
+    Returns:
+        list: Tuples `(key, category, data)` with cleaned keys and categories.
+
+    """
+    keys = defaultdict(list)
+    data = {}
+    for tup in tags:
+        tup = make_iter(tup)
+        if len(tup) == 1:
+            keys[None].append(tup[0])
+        else:
+            keys[tup[1]].append(tup[0])
+            if len(tup) > 2:
+                data[tup[1]] = tup[2]
+    cleaned = []
+    for category, tagkeys in keys.items():
+        tagdata = data.get(category, None)
+        tagdata = str(tagdata) if tagdata is not None else None
+        category = str(category).strip().lower() if category else category
+        for key in tagkeys:
+            if key:
+                cleaned.append((str(key).strip().lower(), category, tagdata))
+    return cleaned
+
+
+def _bulk_add_tags(objtags):
+    """
+    Add Tags to many objects, with one query per distinct Tag and a single
+    insert of all the new object-Tag relations.
+
+    Args:
+        objtags (list): Tuples `(obj, handler, tags)` where `handler` is the
+            Tag handler (such as `obj.aliases`) and `tags` are cleaned
+            `(key, category, data)` tuples.
+
+    """
+    # as with repeated calls to `TagHandler.add`, the last data given wins
+    tagdata = {}
+    for obj, handler, tags in objtags:
+        for key, category, data in tags:
+            tagkey = (key, category, handler._tagtype)
+            if data is not None or tagkey not in tagdata:
+                tagdata[tagkey] = data
+    tagobjs = {
+        (key, category, tagtype): ObjectDB.objects.create_tag(
+            key=key, category=category, data=data, tagtype=tagtype
+        )
+        for (key, category, tagtype), data in tagdata.items()
+    }
+
+    through = ObjectDB.db_tags.through
+    rows = {}
+    for obj, handler, tags in objtags:
+        for key, category, _ in tags:
+            tagobj = tagobjs[(key, category, handler._tagtype)]
+            rows[(obj.id, tagobj.id)] = through(objectdb_id=obj.id, tag_id=tagobj.id)
+            handler._setcache(key, category, tagobj)
+    if not rows:
+        return
+    # creation hooks may already have added some of the Tags
+    existing = set(
+        through.objects.filter(
+            objectdb_id__in={objid for objid, _ in rows}, tag_id__in={tagid for _, tagid in rows}
+        ).values_list("objectdb_id", "tag_id")
+    )
+    through.objects.bulk_create([row for key, row in rows.items() if key not in existing])
+    # permissions and tags may affect lock results
+    invalidate_lock_cache()
+
+
+def _bulk_add_attributes(objattrs):
+    """
+    Add Attributes to many objects, inserting all new Attributes and their
+    relations to the objects, and updating the existing Attributes, in a few
+    bulk queries.
+
+    Args:
+        objattrs (list): Tuples `(obj, attributes)` where `attributes` are
+            tuples `(key, value[, category[, lockstring]])`, as for
+            `AttributeHandler.batch_add`. A lockstring of `None` keeps the
+            locks of an existing Attribute.
+
+    """
+    global _MONITOR_HANDLER
+    if not _MONITOR_HANDLER:
+        from evennia.scripts.monitorhandler import MONITOR_HANDLER as _MONITOR_HANDLER
+
+    cleaned = []
+    for obj, attributes in objattrs:
+        attrs = {}
+        for tup in attributes:
+            if not is_iter(tup) or len(tup) < 2:
+                raise RuntimeError("batch_add requires iterables as arguments (got %r)." % tup)
+            ntup = len(tup)
+            key = str(tup[0]).strip().lower()
+            category = str(tup[2]).strip().lower() if ntup > 2 and tup[2] is not None else None
+            lockstring = tup[3] if ntup > 3 else ""
+            # a later Attribute with the same key and category replaces an earlier one
+            attrs[(key, category)] = (tup[1], lockstring)
+        if attrs:
+            cleaned.append((obj, attrs))
+    if not cleaned:
+        return
+
+    # some Attributes may already exist, such as when set by creation hooks
+    existing = set()
+    uncached = []
+    for obj, attrs in cleaned:
+        backend = obj.attributes.backend
+        if backend._cache_complete:
+            existing.update(
+                (obj.id, key, category) for key, category in attrs if backend.get(key, category)
+            )
+        else:
+            uncached.append((obj, attrs))
+    if uncached:
+        existing.update(
+            ObjectDB.db_attributes.through.objects.filter(
+                objectdb_id__in=[obj.id for obj, _ in uncached],
+                attribute__db_key__in={key for _, attrs in uncached for key, _ in attrs},
+                attribute__db_attrtype=None,
+            ).values_list("objectdb_id", "attribute__db_key", "attribute__db_category")
+        )
+    new_attrs = []
+    updated_attrs = []
+    for obj, attrs in cleaned:
+        for (key, category), (value, lockstring) in attrs.items():
+            if (obj.id, key, category) in existing:
+                attr = obj.attributes.backend.get(key, category)[0]
+                discard_pending_save(attr)
+                attr.db_value = to_pickle(value)
+                attr.db_strvalue = None
+                if lockstring is not None:
+                    attr.db_lock_storage = lockstring
+                updated_attrs.append(attr)
+                continue
+            attr = Attribute(
+                db_key=key,
+                db_category=category,
+                db_model="objectdb",
+                db_lock_storage=lockstring if lockstring else "",
+                db_attrtype=None,
+                db_value=to_pickle(value),
+                db_strvalue=None,
+            )
+            new_attrs.append((obj, attr))
+
+    if updated_attrs:
+        _bulk_save_fields(updated_attrs, ["db_value", "db_strvalue", "db_lock_storage"])
+        for attr in updated_attrs:
+            # as saving the Attribute would
+            _MONITOR_HANDLER.at_update(attr, "db_value")
+    if not new_attrs:
+        return
+
+    Attribute.objects.bulk_create([attr for _, attr in new_attrs])
+    through = ObjectDB.db_attributes.through
+    through.objects.bulk_create(
+        [through(objectdb_id=obj.id, attribute_id=attr.id) for obj, attr in new_attrs]
+    )
+    for obj, attr in new_attrs:
+        Attribute.cache_instance(attr)
+        obj.attributes.backend._set_cache(attr.db_key, attr.db_category, attr)
+
+
+def _merge_locks(obj, lockstring, replace=False):
+    """
+    Add locks to an object the way `LockHandler.add` does, but without
+    saving the object.
+
+    Args:
+        obj (Object): The object to lock.
+        lockstring (str): The locks to add. An invalid lockstring is reported
+            by the lockhandler and not added.
+        replace (bool, optional): Remove the current locks of the object first.
+
+    Returns:
+        bool: If the `db_lock_storage` of the object was changed.
+
+    """
+    if lockstring and not obj.locks.add(lockstring, validate_only=True)[0]:
+        # let the lockhandler report the error
+        obj.locks.add(lockstring)
+        lockstring = ""
+    if not (lockstring or replace):
+        return False
+    current = "" if replace else obj.db_lock_storage
+    obj.locks._cache_locks(";".join(filter(None, (current, lockstring))))
+    obj.db_lock_storage = ";".join(tup[2] for tup in obj.locks.locks.values())
+    return True
+
+
+def _bulk_create_objects(objs, objparams):
+    """
+    Create many objects, inserting their database rows, Tags, Aliases,
+    Permissions and Attributes in bulk. The typeclass hooks run in the same
+    order as for `at_first_save`, but with the bulk steps done for all
+    objects at once.
+
+    Args:
+        objs (list): The new, unsaved objects. Their typeclasses must use the
+            default `at_first_save`.
+        objparams (list): Parameters for each object, as described in
+            `batch_create_object`.
+
+    """
+    try:
+        with transaction.atomic():
+            ObjectDB.objects.bulk_create(objs)
+
+            relocked = []
+            for obj, objparam in zip(objs, objparams):
+                # what the post_save signal would do for a new object
+                obj.__dbclass__.cache_instance(obj)
+                obj.basetype_setup()
+                obj.at_object_creation()
+                obj.init_evennia_properties()
+                if not obj.db_key:
+                    obj.db_key = "#%i" % obj.dbid
+                    obj.save(update_fields=["db_key"])
+                # saved together with the other objects below
+                if objparam[2] and _merge_locks(obj, objparam[2]):
+                    relocked.append(obj)
+            _bulk_save_fields([obj for obj in relocked if obj.pk], ["db_lock_storage"])
+
+            # creation hooks may have deleted their object
+            created = [(obj, objparam) for obj, objparam in zip(objs, objparams) if obj.pk]
+            objtags = []
+            for obj, objparam in created:
+                objtags.append((obj, obj.permissions, _clean_tags(make_iter(objparam[1]))))
+                objtags.append((obj, obj.aliases, _clean_tags(make_iter(objparam[3]))))
+                objtags.append((obj, obj.tags, _clean_tags(make_iter(objparam[6]))))
+            _bulk_add_tags(objtags)
+            _bulk_add_attributes([(obj, objparam[5]) for obj, objparam in created])
+
+            for obj, objparam in created:
+                for key, value in (objparam[4] or {}).items():
+                    obj.nattributes.add(key, value)
+                obj.at_object_post_creation()
+                obj.basetype_posthook_setup()
+                # the field hooks that the first save of the object would trigger
+                for field in obj._meta.fields:
+                    hook = getattr(obj, "at_%s_postsave" % field.name, None)
+                    if callable(hook):
+                        hook(True)
+    except Exception:
+        # the rolled-back objects must not linger in the idmapper cache
+        for obj in objs:
+            obj.flush_cached_instance(obj, force=True)
+        raise
 
 
 def batch_create_object(*objparams):
@@ -843,30 +1484,38 @@ def batch_create_object(*objparams):
         The `exec` list will execute arbitrary python code so don't allow this to be available to
         unprivileged users!
 
+        Objects are created in bulk, in one database transaction: their rows,
+        Tags, Aliases, Permissions and Attributes are inserted with a few
+        queries per batch instead of several queries per object. This needs a
+        database that returns the ids of bulk-inserted rows (such as
+        PostgreSQL, SQLite 3.35+ or MariaDB 10.5+). Objects whose typeclass
+        overrides `at_first_save`, or all objects if the database can't
+        return ids, are instead saved one by one. Bulk-created objects don't
+        send Django's `post_save` signal, and the `exec` code and
+        `at_object_post_spawn` hooks run after all objects have been created.
+
     """
+    global _DEFAULT_OBJECT
+    if not _DEFAULT_OBJECT:
+        from evennia.objects.objects import DefaultObject as _DEFAULT_OBJECT
+
+    objs = [ObjectDB(**objparam[0]) for objparam in objparams]
+    bulk, single = [], []
+    for obj, objparam in zip(objs, objparams):
+        if (
+            connection.features.can_return_rows_from_bulk_insert
+            and type(obj).at_first_save is _DEFAULT_OBJECT.at_first_save
+        ):
+            bulk.append((obj, objparam))
+        else:
+            single.append((obj, objparam))
 
-    # bulk create all objects in one go
-
-    # unfortunately this doesn't work since bulk_create doesn't creates pks;
-    # the result would be duplicate objects at the next stage, so we comment
-    # it out for now:
-    #  dbobjs = _ObjectDB.objects.bulk_create(dbobjs)
-
-    objs = []
-    for objparam in objparams:
-        obj = ObjectDB(**objparam[0])
-
-        # setup
-        obj._createdict = {
-            "permissions": make_iter(objparam[1]),
-            "locks": objparam[2],
-            "aliases": make_iter(objparam[3]),
-            "nattributes": objparam[4],
-            "attributes": objparam[5],
-            "tags": make_iter(objparam[6]),
-        }
-        # this triggers all hooks
-        obj.save()
+    if bulk:
+        _bulk_create_objects(*zip(*bulk))
+    for obj, objparam in single:
+        _create_object(obj, objparam)
+
+    for obj, objparam in zip(objs, objparams):
         # run eventual extra code
         for code in objparam[7]:
             if code:
@@ -874,7 +1523,6 @@ def batch_create_object(*objparams):
         # run the spawned hook
         if spawn_hook := getattr(obj, "at_object_post_spawn", None):
             spawn_hook()
-        objs.append(obj)
     return objs
 
 
@@ -9,15 +9,19 @@ from time import time
 
 import mock
 from anything import Something
-from django.test.utils import override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from twisted.internet import defer
 
 from evennia.commands.default import building
 from evennia.objects.models import ObjectDB
+from evennia.objects.objects import DefaultObject
 from evennia.prototypes import menus as olc_menus
 from evennia.prototypes import protfuncs as protofuncs
 from evennia.prototypes import prototypes as protlib
 from evennia.prototypes import spawner
 from evennia.prototypes.prototypes import _PROTOTYPE_TAG_META_CATEGORY
+from evennia.typeclasses.attributes import Attribute
 from evennia.utils.create import create_object
 from evennia.utils.test_resources import BaseEvenniaTest, EvenniaCommandTest
 from evennia.utils.tests.test_evmenu import TestEvMenu
@@ -97,6 +101,246 @@ class TestSpawner(BaseEvenniaTest):
         )
 
 
+class CreationHookObject(DefaultObject):
+    def at_object_creation(self):
+        self.db.health = 0
+        self.db.mana = 5
+        self.tags.add("hooked")
+        self.tags.add("monster", category="type")
+
+
+class RaisingHookObject(DefaultObject):
+    def at_object_post_creation(self):
+        raise RuntimeError("hook failed")
+
+
+class TestBatchCreateObject(BaseEvenniaTest):
+    def setUp(self):
+        super().setUp()
+        self.prot = {
+            "prototype_key": "bulkprototype",
+            "typeclass": "evennia.prototypes.tests.CreationHookObject",
+            "key": "goblin",
+            "location": self.room1,
+            "aliases": ["gob", "grunt"],
+            "permissions": ["Player"],
+            "locks": "get:false()",
+            "tags": [("monster", "type"), ("green", "color", "greenish")],
+            "attrs": [("weapon", "club", "gear", "attrread:all()")],
+            "health": 10,
+        }
+
+    def _state(self, obj):
+        obj = ObjectDB.objects.get(id=obj.id)
+        for handler in (obj.tags, obj.aliases, obj.permissions, obj.attributes):
+            handler.reset_cache()
+        return (
+            obj.key,
+            obj.location,
+            obj.lock_storage,
+            sorted(obj.tags.all(return_key_and_category=True)),
+            sorted(obj.aliases.all()),
+            sorted(obj.permissions.all()),
+            sorted(
+                (attr.key, attr.category, attr.value, attr.lock_storage)
+                for attr in obj.attributes.all()
+            ),
+            obj in self.room1.contents,
+        )
+
+    def test_bulk_matches_single(self):
+        objs = spawner.spawn(self.prot, self.prot, self.prot)
+        with mock.patch.object(
+            type(connection.features),
+            "can_return_rows_from_bulk_insert",
+            new_callable=mock.PropertyMock,
+            return_value=False,
+        ):
+            single = spawner.spawn(self.prot)[0]
+
+        self.assertEqual(len({obj.id for obj in objs}), 3)
+        for obj in objs:
+            self.assertEqual(self._state(obj), self._state(single))
+        # prototype values override those set by the creation hooks
+        self.assertEqual(objs[0].db.health, 10)
+        self.assertEqual(objs[0].db.mana, 5)
+        self.assertEqual(objs[0].attributes.get("weapon", category="gear"), "club")
+        self.assertEqual(ObjectDB.objects.search_object("gob", candidates=objs).count(), 3)
+
+    def test_bulk_inserts(self):
+        prot = {
+            "prototype_key": "coin",
+            "typeclass": "evennia.objects.objects.DefaultObject",
+            "key": "coin",
+            "aliases": ["money"],
+            "tags": [("loot", None)],
+            "value": 1,
+        }
+        # the first spawn creates the Tags shared by all the objects
+        spawner.spawn(prot)
+        ninserts = []
+        for nobjs in (2, 20):
+            with CaptureQueriesContext(connection) as ctx:
+                spawner.spawn(*([prot] * nobjs))
+            ninserts.append(
+                len([query for query in ctx.captured_queries if query["sql"].startswith("INSERT")])
+            )
+        # the rows of all objects and their properties are inserted together
+        self.assertEqual(ninserts[0], ninserts[1])
+
+    def test_bulk_hook_error(self):
+        prot = dict(self.prot, typeclass="evennia.prototypes.tests.RaisingHookObject")
+        ncached = len(ObjectDB.get_all_cached_instances())
+        nobjs = ObjectDB.objects.count()
+        with self.assertRaises(RuntimeError):
+            spawner.spawn(prot, prot)
+        # the rolled-back objects are neither in the database nor in the cache
+        self.assertEqual(ObjectDB.objects.count(), nobjs)
+        self.assertEqual(len(ObjectDB.get_all_cached_instances()), ncached)
+
+
+class SameRepr:
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return "<SameRepr>"
+
+
+class TestBatchUpdateObjects(BaseEvenniaTest):
+    def setUp(self):
+        super().setUp()
+        self.prot = {
+            "prototype_key": "updateprototype",
+            "typeclass": "evennia.objects.objects.DefaultObject",
+            "key": "goblin",
+            "location": self.room1,
+            "aliases": ["gob"],
+            "locks": "get:false()",
+            "tags": [("monster", "type")],
+            "health": 10,
+        }
+        self.new_prot = dict(
+            self.prot,
+            key="hobgoblin",
+            location=self.room2,
+            aliases=["hob"],
+            locks="get:true()",
+            tags=[("monster", "type"), ("elite", "rank")],
+            health=20,
+            mana=5,
+        )
+
+    def _assert_updated(self, obj):
+        obj = ObjectDB.objects.get(id=obj.id)
+        for handler in (obj.tags, obj.aliases, obj.attributes):
+            handler.reset_cache()
+        self.assertEqual(obj.key, "hobgoblin")
+        self.assertEqual(obj.location, self.room2)
+        self.assertIn(obj, self.room2.contents)
+        self.assertNotIn(obj, self.room1.contents)
+        self.assertTrue(obj.access(self.char1, "get"))
+        self.assertEqual(sorted(obj.aliases.all()), ["gob", "hob"])
+        self.assertEqual(
+            sorted(obj.tags.all(return_key_and_category=True)),
+            [("elite", "rank"), ("monster", "type"), ("updateprototype", "from_prototype")],
+        )
+        self.assertEqual(obj.db.health, 20)
+        self.assertEqual(obj.db.mana, 5)
+
+    def test_diff_per_object_state(self):
+        objs = spawner.spawn(*([self.prot] * 4))
+        objs[0].db.health = 3
+        with mock.patch(
+            "evennia.prototypes.spawner.prototype_diff_from_object",
+            wraps=spawner.prototype_diff_from_object,
+        ) as mock_diff:
+            count = spawner.batch_update_objects_with_prototype(self.new_prot, objects=objs)
+        self.assertEqual(count, 4)
+        # one diff for the changed object and one shared by the others
+        self.assertEqual(mock_diff.call_count, 2)
+        for obj in objs:
+            self._assert_updated(obj)
+
+    def test_diff_attribute_values(self):
+        objs = spawner.spawn(*([self.prot] * 3))
+        objs[0].db.gear = SameRepr(1)
+        objs[1].db.gear = SameRepr(2)
+        objs[2].db.gear = SameRepr(2)
+        with mock.patch(
+            "evennia.prototypes.spawner.prototype_diff_from_object",
+            wraps=spawner.prototype_diff_from_object,
+        ) as mock_diff:
+            spawner.batch_update_objects_with_prototype(self.new_prot, objects=objs)
+        # Attribute values with the same repr but different contents are told apart
+        self.assertEqual(mock_diff.call_count, 2)
+
+    def test_chunks(self):
+        objs = spawner.spawn(*([self.prot] * 5))
+        progress = mock.Mock()
+        with mock.patch(
+            "evennia.prototypes.spawner.deferLater", side_effect=lambda *args: defer.succeed(None)
+        ) as mock_defer:
+            deferred = spawner.batch_update_objects_with_prototype(
+                self.new_prot,
+                objects=objs,
+                chunk_size=2,
+                progress_callback=progress,
+                yield_to_reactor=True,
+            )
+        results = []
+        deferred.addCallback(results.append)
+        self.assertEqual(results, [5])
+        # the reactor gets a chance to do other things between the chunks
+        self.assertEqual(mock_defer.call_count, 2)
+        progress.assert_has_calls([mock.call(2, 5, 2), mock.call(4, 5, 4), mock.call(5, 5, 5)])
+        for obj in objs:
+            self._assert_updated(obj)
+
+    def test_deleted_between_chunks(self):
+        objs = spawner.spawn(*([self.prot] * 4))
+
+        def _delete_last(nprocessed, ntotal, nchanged):
+            if nprocessed == 2:
+                objs[3].delete()
+
+        count = spawner.batch_update_objects_with_prototype(
+            self.new_prot, objects=objs, chunk_size=2, progress_callback=_delete_last
+        )
+        self.assertEqual(count, 3)
+        for obj in objs[:3]:
+            self._assert_updated(obj)
+
+    def test_bulk_save_fields(self):
+        obj1, obj2 = spawner.spawn(self.prot, self.prot)
+        attr1 = obj1.attributes.get("health", return_obj=True)
+        attr2 = obj2.attributes.get("health", return_obj=True)
+        attr1.db_value, attr2.db_value = SameRepr(1), SameRepr(2)
+        spawner._bulk_save_fields([attr1, attr2], ["db_value"])
+        # read the saved values, not the cached instances
+        values = dict(
+            Attribute.objects.filter(id__in=(attr1.id, attr2.id)).values_list("id", "db_value")
+        )
+        self.assertEqual(values[attr1.id].value, 1)
+        self.assertEqual(values[attr2.id].value, 2)
+
+    def test_bulk_queries(self):
+        # the first update creates the Tags shared by all the objects
+        spawner.batch_update_objects_with_prototype(
+            self.new_prot, objects=spawner.spawn(self.prot)
+        )
+        nqueries = []
+        for nobjs in (2, 20):
+            objs = spawner.spawn(*([self.prot] * nobjs))
+            with CaptureQueriesContext(connection) as ctx:
+                spawner.batch_update_objects_with_prototype(self.new_prot, objects=objs)
+            nqueries.append(len(ctx.captured_queries))
+            for obj in objs:
+                obj.delete()
+        # the changes of all objects are written together
+        self.assertEqual(nqueries[0], nqueries[1])
+
+
 class TestUtils(BaseEvenniaTest):
     def test_prototype_from_object(self):
         self.maxDiff = None
@@ -9,11 +9,20 @@ functionality:
 - Attribute-monitor tracks an object's specific Attribute and perform
     an action whenever that Attribute *changes* for whatever reason.
 
+If `settings.MONITOR_COALESCE_UPDATES` is set, the callbacks are not called
+directly as the field/Attribute saves. Instead, all changes to the same field
+during the same reactor tick are merged into one callback, called once the
+current tick is done. Since the callback reads the field when it is called,
+it always sees the latest value.
+
 """
 
 import inspect
 from collections import defaultdict
 
+from django.conf import settings
+from twisted.internet import reactor
+
 from evennia.server.models import ServerConfig
 from evennia.utils import logger, variable_from_module
 from evennia.utils.dbserialize import dbserialize, dbunserialize
@@ -37,6 +46,30 @@ class MonitorHandler(object):
         """
         self.savekey = "_monitorhandler_save"
         self.monitors = defaultdict(lambda: defaultdict(dict))
+        # {obj: {fieldname, ...}} for all fields with at least one monitor
+        self._index = {}
+        self.coalesce = settings.MONITOR_COALESCE_UPDATES
+        self.clock = reactor
+        # {(obj, fieldname): True} for updates waiting to be dispatched
+        self._pending = {}
+        self._flush_call = None
+        self._stats = {"updates": 0, "merged": 0, "dropped": 0, "callbacks": 0}
+
+    def _reindex(self, obj):
+        """
+        Update the index of monitored fields for an object.
+
+        Args:
+            obj (any): The object (or Attribute) to re-index.
+
+        """
+        fieldnames = {
+            fieldname for fieldname, monitors in self.monitors.get(obj, {}).items() if monitors
+        }
+        if fieldnames:
+            self._index[obj] = fieldnames
+        else:
+            self._index.pop(obj, None)
 
     def save(self):
         """
@@ -90,6 +123,9 @@ class MonitorHandler(object):
                         self.monitors[obj][fieldname][idstring] = (callback, persistent, kwargs)
                 except Exception:
                     continue
+        self._index = {}
+        for obj in self.monitors:
+            self._reindex(obj)
         # make sure to clean data from database
         ServerConfig.objects.conf(key=self.savekey, delete=True)
 
@@ -106,23 +142,64 @@ class MonitorHandler(object):
         Called by the field/attribute as it saves.
 
         """
+        monitored = self._index.get(obj)
+        if not monitored:
+            # the fast path for all the objects without monitors
+            return
         # if this an Attribute with a category we should differentiate
         fieldname = self._attr_category_fieldname(
             fieldname,
             obj.db_category if fieldname == "db_value" and hasattr(obj, "db_category") else None,
         )
+        if fieldname not in monitored:
+            return
+
+        self._stats["updates"] += 1
+        if not self.coalesce:
+            self._dispatch(obj, fieldname)
+        elif (obj, fieldname) in self._pending:
+            self._stats["merged"] += 1
+        else:
+            self._pending[(obj, fieldname)] = True
+            if not self._flush_call:
+                self._flush_call = self.clock.callLater(0, self._flush)
+
+    def _flush(self):
+        """
+        Dispatch all updates coalesced during the last reactor tick.
+
+        """
+        pending, self._pending = self._pending, {}
+        self._flush_call = None
+        for obj, fieldname in pending:
+            if not obj.pk or fieldname not in self._index.get(obj, ()):
+                # the object was deleted or the monitor removed since the update
+                self._stats["dropped"] += 1
+                continue
+            self._dispatch(obj, fieldname)
+
+    def _dispatch(self, obj, fieldname):
+        """
+        Call all monitor callbacks of a field.
+
+        Args:
+            obj (any): The object (or Attribute) that was updated.
+            fieldname (str): The updated field.
 
+        """
         to_delete = []
-        if obj in self.monitors and fieldname in self.monitors[obj]:
-            for idstring, (callback, persistent, kwargs) in self.monitors[obj][fieldname].items():
-                try:
-                    callback(obj=obj, fieldname=fieldname, **kwargs)
-                except Exception:
-                    to_delete.append((obj, fieldname, idstring))
-                    logger.log_trace("Monitor callback was removed.")
+        for idstring, (callback, persistent, kwargs) in self.monitors[obj][fieldname].items():
+            self._stats["callbacks"] += 1
+            try:
+                callback(obj=obj, fieldname=fieldname, **kwargs)
+            except Exception:
+                to_delete.append(idstring)
+                logger.log_trace("Monitor callback was removed.")
         # we cleanup non-found monitors (has to be done after loop)
-        for obj, fieldname, idstring in to_delete:
-            del self.monitors[obj][fieldname][idstring]
+        if to_delete:
+            for idstring in to_delete:
+                del self.monitors[obj][fieldname][idstring]
+            self._reindex(obj)
 
     def add(self, obj, fieldname, callback, idstring="", persistent=False, category=None, **kwargs):
         """
@@ -176,6 +253,7 @@ class MonitorHandler(object):
             logger.log_trace(err)
         else:
             self.monitors[obj][fieldname][idstring] = (callback, persistent, kwargs)
+            self._index.setdefault(obj, set()).add(fieldname)
 
     def remove(self, obj, fieldname, idstring="", category=None):
         """
@@ -190,12 +268,32 @@ class MonitorHandler(object):
         idstring_dict = self.monitors[obj][fieldname]
         if idstring in idstring_dict:
             del self.monitors[obj][fieldname][idstring]
+            self._reindex(obj)
 
     def clear(self):
         """
         Delete all monitors.
         """
         self.monitors = defaultdict(lambda: defaultdict(dict))
+        self._index = {}
+        self._pending = {}
+        if self._flush_call and self._flush_call.active():
+            self._flush_call.cancel()
+        self._flush_call = None
+
+    def stats(self):
+        """
+        Get statistics about the monitor updates handled since the server started.
+
+        Returns:
+            dict: With keys `updates` (updates to monitored fields), `merged`
+                (updates merged into an already pending one, only when
+                coalescing), `dropped` (pending updates whose object or
+                monitor was removed before dispatch), `callbacks` (callbacks
+                called) and `pending` (updates waiting for dispatch).
+
+        """
+        return {**self._stats, "pending": len(self._pending)}
 
     def all(self, obj=None):
         """
@@ -59,14 +59,35 @@ state = ON_DEMAND_HANDLER.get_stage("flowering", last_checked=plant.planted_time
 
 ```
 
+The handler indexes its tasks by category and keeps a heap of when each task will next change
+stage. This allows for asking for all tasks that changed stage (or will do so soon) without
+checking every task:
+
+```python
+
+# all flowers that changed stage in the last 10 minutes
+changed = ON_DEMAND_HANDLER.get_changed_since(OnDemandTask.runtime() - 600, category="flowering")
+# when the next flower will change stage
+next_time = ON_DEMAND_HANDLER.get_next_transition_time(category="flowering")
+
+```
 
 """
 
+from heapq import heapify, heappop, heappush
+from itertools import count
+
+from django.db import transaction
+
 from evennia.server.models import ServerConfig
 from evennia.utils import logger
+from evennia.utils.dbserialize import from_pickle, to_pickle
+from evennia.utils.picklefield import dbsafe_encode
 from evennia.utils.utils import is_iter
 
 _RUNTIME = None
+# number of tasks to read or write per database query
+_CHUNK_SIZE = 500
 
 ON_DEMAND_HANDLER = None
 ONDEMAND_HANDLER_SAVE_NAME = "on_demand_timers"
@@ -166,6 +187,10 @@ class OnDemandTask:
     # dict.
     default_stage_function = None
 
+    # the OnDemandHandler this task is stored in, and the key it is stored under there
+    _handler = None
+    _handler_key = None
+
     def __init__(self, key, category, stages=None, autostart=True):
         """
         Args:
@@ -196,11 +221,11 @@ class OnDemandTask:
         """
         self.key = key
         self.category = category
-        self.start_time = None
+        self._start_time = None
         self.last_stage = None
         self.iterations = 0  # only used with looping staging functions
 
-        self.stages = None
+        self._stages = None
         self.stages_by_name = None
 
         if isinstance(stages, dict):
@@ -241,6 +266,78 @@ class OnDemandTask:
             return False
         return (self.key, self.category) == (other.key, other.category)
 
+    def __getstate__(self):
+        """Don't store the link to the handler"""
+        state = self.__dict__.copy()
+        state.pop("_handler", None)
+        state.pop("_handler_key", None)
+        return state
+
+    def __setstate__(self, state):
+        """Convert tasks stored before `start_time` and `stages` were properties"""
+        for name in ("start_time", "stages"):
+            if name in state:
+                state[f"_{name}"] = state.pop(name)
+        self.__dict__.update(state)
+
+    def _changed(self):
+        """
+        Tell the handler this task is stored in that it changed.
+
+        """
+        if self._handler:
+            self._handler._update(self)
+
+    @property
+    def start_time(self):
+        return self._start_time
+
+    @start_time.setter
+    def start_time(self, value):
+        self._start_time = value
+        self._changed()
+
+    @property
+    def stages(self):
+        return self._stages
+
+    @stages.setter
+    def stages(self, value):
+        self._stages = value
+        self._changed()
+
+    def get_transition_times(self, now=None):
+        """
+        Get the times at which the task last entered a stage and will next enter a new stage.
+        Note that stage functions (like looping) are only called when the task is checked, so
+        they are not accounted for here.
+
+        Args:
+            now (int or float, optional): The runtime to compare with. Defaults to now.
+
+        Returns:
+            tuple: `(last, next)` runtimes (in seconds). Either is `None` if the task has not
+            started, has no stages or has no such stage.
+
+        """
+        if self._start_time is None or not self._stages:
+            return None, None
+        if now is None:
+            now = OnDemandTask.runtime()
+        dt = now - self._start_time
+        last = nxt = None
+        # stages are sorted by descending time
+        for stage_dt in self._stages:
+            if stage_dt > dt:
+                nxt = stage_dt
+            else:
+                last = stage_dt
+                break
+        return (
+            None if last is None else self._start_time + last,
+            None if nxt is None else self._start_time + nxt,
+        )
+
     def check(self, autostart=True, **kwargs):
         """
         Check the current stage of the task and return the time-delta to the next stage.
@@ -294,6 +391,7 @@ class OnDemandTask:
             return dt
 
         now = OnDemandTask.runtime()
+        last_stage = self.last_stage
 
         dt = _find_dt(self, autostart=autostart)
 
@@ -303,6 +401,9 @@ class OnDemandTask:
         # need to fetch dt again in case stage_func changed it
         dt = _find_dt(self, autostart=autostart)
 
+        if self.last_stage != last_stage:
+            self._changed()
+
         return dt, stage
 
     def get_dt(self, **kwargs):
@@ -379,30 +480,239 @@ class OnDemandHandler:
 
     Contrary to just using the `time` module, this will also account for server restarts.
 
+    The tasks are indexed by category, and a heap per category tracks when each task will next
+    change stage. This backs `get_due`, `get_changed_since` and `get_next_transition_time`. Each
+    task is stored in its own database row and `save` only writes the tasks that changed. If you
+    change a stored task in some other way than through its methods and stage functions (like
+    setting a custom property on it), add it to the handler again to have it saved.
+
     """
 
     def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        """
+        Empty the handler and its indexes, without touching the database.
+
+        """
+        for task in getattr(self, "tasks", {}).values():
+            if task._handler is self:
+                task._handler = task._handler_key = None
         self.tasks = dict()
+        # {category: {(key, category): task}}
+        self._categories = {}
+        # {category: [(transition_time, seq, (key, category)), ...]}, with stale entries
+        # (whose seq is no longer in _scheduled) removed lazily
+        self._heaps = {}
+        self._scheduled = {}
+        self._seq = count()
+        # {(key, category): id} of the database row each task is stored in
+        self._save_ids = {}
+        self._next_save_id = 1
+        self._dirty = set()
+        self._deleted = set()
+
+    def _index(self, keytuple, task, dirty=True):
+        """
+        Store a task in the handler and its indexes.
+
+        Args:
+            keytuple (tuple): The `(key, category)` to store the task under.
+            task (OnDemandTask): The task.
+            dirty (bool, optional): If the task should be saved on the next `save`.
+
+        """
+        old_task = self.tasks.get(keytuple)
+        if old_task is not None and old_task is not task and old_task._handler is self:
+            old_task._handler = old_task._handler_key = None
+        self.tasks[keytuple] = task
+        self._categories.setdefault(keytuple[1], {})[keytuple] = task
+        task._handler = self
+        task._handler_key = keytuple
+        if dirty:
+            self._dirty.add(keytuple)
+        self._schedule(keytuple, task)
+
+    def _unindex(self, keytuple):
+        """
+        Remove a task from the handler and its indexes.
+
+        Args:
+            keytuple (tuple): The `(key, category)` of the task.
+
+        Returns:
+            OnDemandTask or None: The removed task, if any.
+
+        """
+        task = self.tasks.pop(keytuple, None)
+        if task is None:
+            return None
+        category = self._categories.get(keytuple[1])
+        if category is not None:
+            category.pop(keytuple, None)
+            if not category:
+                del self._categories[keytuple[1]]
+                self._heaps.pop(keytuple[1], None)
+        self._scheduled.pop(keytuple, None)
+        self._dirty.discard(keytuple)
+        save_id = self._save_ids.pop(keytuple, None)
+        if save_id is not None:
+            self._deleted.add(save_id)
+        if task._handler is self:
+            task._handler = task._handler_key = None
+        return task
+
+    def _schedule(self, keytuple, task):
+        """
+        Put a task in the heap of its category, at the time of its next stage change.
+
+        Args:
+            keytuple (tuple): The `(key, category)` of the task.
+            task (OnDemandTask): The task.
+
+        """
+        next_time = task.get_transition_times()[1]
+        if next_time is None:
+            self._scheduled.pop(keytuple, None)
+            return
+        seq = next(self._seq)
+        self._scheduled[keytuple] = seq
+        heap = self._heaps.setdefault(keytuple[1], [])
+        heappush(heap, (next_time, seq, keytuple))
+        if len(heap) > 2 * len(self._categories.get(keytuple[1], ())) + 100:
+            # too many stale entries; rebuild the heap
+            heap[:] = [entry for entry in heap if self._scheduled.get(entry[2]) == entry[1]]
+            heapify(heap)
+
+    def _update(self, task):
+        """
+        Called by a task when it changed.
+
+        Args:
+            task (OnDemandTask): The task.
+
+        """
+        keytuple = task._handler_key
+        if self.tasks.get(keytuple) is task:
+            self._dirty.add(keytuple)
+            self._schedule(keytuple, task)
+
+    def _get_categories(self, category, all_on_none):
+        """
+        Get the categories to search, as per `all`.
+
+        """
+        if category is None and all_on_none:
+            return list(self._heaps)
+        return [category]
+
+    def _get_due(self, until, category=None, all_on_none=True):
+        """
+        Get the tasks changing stage at or before a given time.
+
+        Args:
+            until (int or float): The runtime.
+            category (str, optional): The category to search, as per `all`.
+            all_on_none (bool, optional): What `category=None` means, as per `all`.
+
+        Returns:
+            list: `[(transition_time, (key, category)), ...]`, sorted by time.
+
+        """
+        due = []
+        for cat in self._get_categories(category, all_on_none):
+            heap = self._heaps.get(cat)
+            if not heap:
+                continue
+            entries = []
+            while heap and heap[0][0] <= until:
+                entry = heappop(heap)
+                if self._scheduled.get(entry[2]) == entry[1]:
+                    entries.append(entry)
+            # the due tasks stay in the heap until they are checked or changed
+            for entry in entries:
+                heappush(heap, entry)
+            due.extend(entries)
+        return [(entry[0], entry[2]) for entry in sorted(due)]
 
     def load(self):
         """
         Load the on-demand timers from ServerConfig storage.
 
-        This should be automatically called when Evennia starts.
+        This should be automatically called when Evennia starts. The tasks are streamed from the
+        database in chunks.
 
         """
-        self.tasks = dict(ServerConfig.objects.conf(ONDEMAND_HANDLER_SAVE_NAME, default=dict))
+        self._reset()
+        prefix = f"{ONDEMAND_HANDLER_SAVE_NAME}_"
+        rows = (
+            ServerConfig.objects.filter(db_key__startswith=prefix)
+            .values_list("db_key", "db_value")
+            .iterator(chunk_size=_CHUNK_SIZE)
+        )
+        for key, value in rows:
+            try:
+                save_id = int(key[len(prefix) :])
+            except ValueError:
+                continue
+            keytuple, task = from_pickle(value)
+            self._index(keytuple, task, dirty=False)
+            self._save_ids[keytuple] = save_id
+            self._next_save_id = max(self._next_save_id, save_id + 1)
+
+        # convert tasks stored by older versions of Evennia as one single blob
+        legacy_tasks = ServerConfig.objects.conf(ONDEMAND_HANDLER_SAVE_NAME)
+        if legacy_tasks is not None:
+            for keytuple, task in dict(legacy_tasks).items():
+                self._index(tuple(keytuple), task)
+            self.save()
+            ServerConfig.objects.conf(ONDEMAND_HANDLER_SAVE_NAME, delete=True)
 
     def save(self):
         """
         Save the on-demand timers to ServerConfig storage. Should be called when Evennia shuts down.
 
+        Only the tasks added, changed or removed since the last save are written.
+
         """
-        for key, category in list(self.tasks.keys()):
+        for category in list(self._categories):
             # in case an object was used for categories, and were since deleted, drop the task
             if hasattr(category, "id") and category.id is None:
-                self.tasks.pop((key, category))
-        ServerConfig.objects.conf(ONDEMAND_HANDLER_SAVE_NAME, self.tasks)
+                for keytuple in list(self._categories[category]):
+                    self._unindex(keytuple)
+
+        prefix = f"{ONDEMAND_HANDLER_SAVE_NAME}_"
+        field = ServerConfig._meta.get_field("db_value")
+        rows = []
+        failed = set()
+        deleted = set(self._deleted)
+        for keytuple in self._dirty:
+            # pickle up front, so a task that can't be saved doesn't affect the others
+            try:
+                value = dbsafe_encode(
+                    to_pickle((keytuple, self.tasks[keytuple])), field.compress, field.protocol
+                )
+            except Exception:
+                logger.log_trace(f"OnDemandHandler: Could not save task {keytuple}.")
+                failed.add(keytuple)
+                continue
+            save_id = self._save_ids.get(keytuple)
+            if save_id is None:
+                save_id = self._save_ids[keytuple] = self._next_save_id
+                self._next_save_id += 1
+            else:
+                # the old version of the row is replaced
+                deleted.add(save_id)
+            rows.append(ServerConfig(db_key=f"{prefix}{save_id}", db_value=value))
+        keys = [f"{prefix}{save_id}" for save_id in deleted]
+        with transaction.atomic():
+            for ichunk in range(0, len(keys), _CHUNK_SIZE):
+                ServerConfig.objects.filter(db_key__in=keys[ichunk : ichunk + _CHUNK_SIZE]).delete()
+            ServerConfig.objects.bulk_create(rows, batch_size=_CHUNK_SIZE)
+        # tasks that could not be saved are tried again next time
+        self._dirty = failed
+        self._deleted = set()
 
     def _build_key(self, key, category):
         """
@@ -452,10 +762,10 @@ class OnDemandHandler:
 
         """
         if isinstance(key, OnDemandTask):
-            self.tasks[self._build_key(key.key, key.category)] = key
+            self._index(self._build_key(key.key, key.category), key)
             return key
         task = OnDemandTask(key, category, stages, autostart=autostart)
-        self.tasks[self._build_key(key, category)] = task
+        self._index(self._build_key(key, category), task)
         return task
 
     def batch_add(self, *tasks):
@@ -467,7 +777,7 @@ class OnDemandHandler:
 
         """
         for task in tasks:
-            self.tasks[self._build_key(task.key, task.category)] = task
+            self._index(self._build_key(task.key, task.category), task)
 
     def remove(self, key, category=None):
         """
@@ -484,7 +794,7 @@ class OnDemandHandler:
             OnDemandTask or None: The removed task, or `None` if no task was found.
 
         """
-        return self.tasks.pop(self._build_key(key, category), None)
+        return self._unindex(self._build_key(key, category))
 
     def batch_remove(self, *keys, category=None):
         """
@@ -522,7 +832,7 @@ class OnDemandHandler:
             return self.tasks
 
         # filter by category (treat no-category as its own category)
-        return {keytuple: task for keytuple, task in self.tasks.items() if keytuple[1] == category}
+        return dict(self._categories.get(category, {}))
 
     def clear(self, category=None, all_on_none=True):
         """
@@ -537,12 +847,87 @@ class OnDemandHandler:
         """
         if category is None and all_on_none:
             # clear all
-            self.tasks = {}
+            deleted = self._deleted | set(self._save_ids.values())
+            next_save_id = self._next_save_id
+            self._reset()
+            self._deleted = deleted
+            self._next_save_id = next_save_id
+            return
+
+        # clear only those matching the category
+        for keytuple in list(self._categories.get(category, {})):
+            self._unindex(keytuple)
 
-        # filter and clear only those matching the category
-        self.tasks = {
-            keytuple: task for keytuple, task in self.tasks.items() if keytuple[1] != category
-        }
+    def get_due(self, until=None, category=None, all_on_none=True):
+        """
+        Get the tasks that will have entered a new stage at a given time, compared to when they
+        were last checked or changed. This does not check the tasks.
+
+        Args:
+            until (int or float, optional): The runtime (in seconds, as per
+                `OnDemandTask.runtime()`) to compare with. Defaults to now. Use for example
+                `OnDemandTask.runtime() + 60` to get the tasks changing stage within a minute.
+            category (str, optional): The category of the tasks.
+            all_on_none (bool, optional): Determines what to search if `category` is `None`.
+                If `True`, search all tasks. If `False`, only search tasks with no category.
+
+        Returns:
+            list: The tasks, sorted by when they change stage.
+
+        """
+        if until is None:
+            until = OnDemandTask.runtime()
+        return [
+            self.tasks[keytuple] for _, keytuple in self._get_due(until, category, all_on_none)
+        ]
+
+    def get_changed_since(self, since, category=None, all_on_none=True):
+        """
+        Get the tasks that entered a new stage after a given time, and have not been checked or
+        changed since. This does not check the tasks.
+
+        Args:
+            since (int or float): The runtime (in seconds, as per `OnDemandTask.runtime()`).
+            category (str, optional): The category of the tasks.
+            all_on_none (bool, optional): Determines what to search if `category` is `None`.
+                If `True`, search all tasks. If `False`, only search tasks with no category.
+
+        Returns:
+            list: The tasks, sorted by when they were due to change stage.
+
+        """
+        now = OnDemandTask.runtime()
+        tasks = []
+        for _, keytuple in self._get_due(now, category, all_on_none):
+            task = self.tasks[keytuple]
+            last_time = task.get_transition_times(now)[0]
+            if last_time is not None and last_time > since:
+                tasks.append(task)
+        return tasks
+
+    def get_next_transition_time(self, category=None, all_on_none=True):
+        """
+        Get when the next task will enter a new stage.
+
+        Args:
+            category (str, optional): The category of the tasks.
+            all_on_none (bool, optional): Determines what to search if `category` is `None`.
+                If `True`, search all tasks. If `False`, only search tasks with no category.
+
+        Returns:
+            int, float or None: The runtime (in seconds, as per `OnDemandTask.runtime()`) of the
+                next stage change, or `None` if no task will change stage (without being checked).
+
+        """
+        next_time = None
+        for cat in self._get_categories(category, all_on_none):
+            heap = self._heaps.get(cat)
+            # drop stale entries from the top of the heap
+            while heap and self._scheduled.get(heap[0][2]) != heap[0][1]:
+                heappop(heap)
+            if heap and (next_time is None or heap[0][0] < next_time):
+                next_time = heap[0][0]
+        return next_time
 
     def get(self, key, category=None):
         """
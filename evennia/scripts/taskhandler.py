@@ -15,6 +15,13 @@ from evennia.utils.logger import log_err
 
 TASK_HANDLER = None
 
+# each persistent task is stored in its own ServerConfig row with this key prefix
+_TASK_KEY_PREFIX = "delayed_task_"
+# the key older versions stored all persistent tasks under, in one blob
+_LEGACY_KEY = "delayed_tasks"
+# number of tasks to read or write per database query
+_CHUNK_SIZE = 500
+
 
 def handle_error(*args, **kwargs):
     """Handle errors within deferred objects."""
@@ -217,6 +224,10 @@ class TaskHandler:
     stale tasks will not be automatically removed.
     This is not done on a timer. I is done as new tasks are added or the load method is called.
 
+    Each persistent task is stored in its own ServerConfig row, so adding or
+    removing a task does not rewrite the others. Use `add_many` to add many
+    tasks at once with only a few database queries.
+
     """
 
     def __init__(self):
@@ -226,43 +237,65 @@ class TaskHandler:
         # number of seconds before an uncalled canceled task is removed from TaskHandler
         self.stale_timeout = 60
         self._now = False  # used in unit testing to manually set now time
+        self._free_id = 1  # no task id below this is free
 
     def load(self):
         """Load from the ServerConfig.
 
         This should be automatically called when Evennia starts.
-        It populates `self.tasks` according to the ServerConfig.
+        It populates `self.tasks` according to the ServerConfig. The tasks are
+        streamed from the database in chunks, so this does not need to keep all
+        their serialized data in memory at once.
 
         """
-        to_save = False
-        value = ServerConfig.objects.conf("delayed_tasks", default=dict)
-        if isinstance(value, str):
-            tasks = dbunserialize(value)
-        else:
-            tasks = value
+        self._migrate_legacy_tasks()
 
-        # At this point, `tasks` contains a dictionary of still-serialized tasks
-        for task_id, value in tasks.items():
+        to_remove = []
+        rows = (
+            ServerConfig.objects.filter(db_key__startswith=_TASK_KEY_PREFIX)
+            .values_list("db_key", "db_value")
+            .iterator(chunk_size=_CHUNK_SIZE)
+        )
+        for key, value in rows:
+            try:
+                task_id = int(key[len(_TASK_KEY_PREFIX) :])
+            except ValueError:
+                continue
             date, callback, args, kwargs = dbunserialize(value)
             if isinstance(callback, tuple):
                 # `callback` can be an object and name for instance methods
                 obj, method = callback
                 if obj is None:
-                    to_save = True
+                    to_remove.append(task_id)
                     continue
 
                 try:
                     callback = getattr(obj, method)
                 except Exception as e:
                     log_err(f"TaskHandler: Unable to load task {task_id} (disabling it): {e}")
-                    to_save = True
+                    to_remove.append(task_id)
                     continue
             self.tasks[task_id] = (date, callback, args, kwargs, True, None)
+            self.to_save[task_id] = value
 
+        if to_remove:
+            self._delete_rows(to_remove)
         if self.stale_timeout > 0:  # cleanup stale tasks.
             self.clean_stale_tasks()
-        if to_save:
-            self.save()
+
+    def _migrate_legacy_tasks(self):
+        """
+        Convert tasks stored by older versions of Evennia, as one single
+        "delayed_tasks" blob, into one database row per task.
+
+        """
+        value = ServerConfig.objects.conf(_LEGACY_KEY)
+        if value is None:
+            return
+        if isinstance(value, str):
+            value = dbunserialize(value)
+        self._write_rows(value)
+        ServerConfig.objects.conf(_LEGACY_KEY, delete=True)
 
     def clean_stale_tasks(self):
         """remove uncalled but canceled from task handler.
@@ -285,64 +318,127 @@ class TaskHandler:
             self.remove(task_id)
         return True
 
-    def save(self):
+    def _serialize(self, task_id):
         """
-        Save the tasks in ServerConfig.
+        Serialize a persistent task for storage.
+
+        Args:
+            task_id (int): The task to serialize.
+
+        Returns:
+            bytes: The serialized task.
+
+        Raises:
+            ValueError: If the task's callback cannot be pickled.
 
         """
+        date, callback, args, kwargs, _, _ = self.tasks[task_id]
+        safe_callback = callback
+        if getattr(callback, "__self__", None):
+            # `callback` is an instance method
+            obj = callback.__self__
+            name = callback.__name__
+            safe_callback = (obj, name)
 
-        for task_id, (date, callback, args, kwargs, persistent, _) in self.tasks.items():
-            if task_id in self.to_save:
-                continue
-            if not persistent:
-                continue
+        # Check if callback can be pickled. args and kwargs have been checked
+        try:
+            dbserialize(safe_callback)
+        except (TypeError, AttributeError, PickleError) as err:
+            raise ValueError(
+                "the specified callback {callback} cannot be pickled. "
+                "It must be a top-level function in a module or an "
+                "instance method ({err}).".format(callback=callback, err=err)
+            )
+        return dbserialize((date, safe_callback, args, kwargs))
 
-            safe_callback = callback
-            if getattr(callback, "__self__", None):
-                # `callback` is an instance method
-                obj = callback.__self__
-                name = callback.__name__
-                safe_callback = (obj, name)
+    def _write_rows(self, serialized):
+        """
+        Store serialized tasks in the database, one row per task.
 
-            # Check if callback can be pickled. args and kwargs have been checked
-            try:
-                dbserialize(safe_callback)
-            except (TypeError, AttributeError, PickleError) as err:
-                raise ValueError(
-                    "the specified callback {callback} cannot be pickled. "
-                    "It must be a top-level function in a module or an "
-                    "instance method ({err}).".format(callback=callback, err=err)
-                )
+        Args:
+            serialized (dict): Serialized tasks `{task_id: data}`. Any already
+                stored data for these task ids is replaced.
 
-            self.to_save[task_id] = dbserialize((date, safe_callback, args, kwargs))
+        """
+        keys = [f"{_TASK_KEY_PREFIX}{task_id}" for task_id in serialized]
+        for ichunk in range(0, len(keys), _CHUNK_SIZE):
+            ServerConfig.objects.filter(db_key__in=keys[ichunk : ichunk + _CHUNK_SIZE]).delete()
+        ServerConfig.objects.bulk_create(
+            [
+                ServerConfig(db_key=key, db_value=data)
+                for key, data in zip(keys, serialized.values())
+            ],
+            batch_size=_CHUNK_SIZE,
+        )
 
-        ServerConfig.objects.conf("delayed_tasks", self.to_save)
+    def _delete_rows(self, task_ids):
+        """
+        Remove stored tasks from the database.
+
+        Args:
+            task_ids (list): The ids of the tasks to remove.
 
-    def add(self, timedelay, callback, *args, **kwargs):
         """
-        Add a new task.
+        keys = [f"{_TASK_KEY_PREFIX}{task_id}" for task_id in task_ids]
+        for ichunk in range(0, len(keys), _CHUNK_SIZE):
+            ServerConfig.objects.filter(db_key__in=keys[ichunk : ichunk + _CHUNK_SIZE]).delete()
 
-        If the persistent kwarg is truthy:
-        The callback, args and values for kwarg will be serialized. Type
-        and attribute errors during the serialization will be logged,
-        but will not throw exceptions.
-        For persistent tasks do not use memory references in the callback
-        function or arguments. After a restart those memory references are no
-        longer accurate.
+    def _store(self, task_ids):
+        """
+        Store persistent tasks in ServerConfig.
 
         Args:
-            timedelay (int or float): time in seconds before calling the callback.
-            callback (function or instance method): the callback itself
-            any (any): any additional positional arguments to send to the callback
-            *args: positional arguments to pass to callback.
-            **kwargs: keyword arguments to pass to callback.
-                - persistent (bool, optional): persist the task (stores it).
-                    Persistent key and value is removed from kwargs it will
-                    not be passed to callback.
+            task_ids (iterable): The ids of the tasks to store.
+
+        """
+        unsaved = {task_id: self._serialize(task_id) for task_id in task_ids}
+        if unsaved:
+            self._write_rows(unsaved)
+            self.to_save.update(unsaved)
+
+    def save(self):
+        """
+        Save the persistent tasks not yet stored in ServerConfig.
+
+        Each task is stored as its own database row, so this only writes the
+        tasks added since the last save.
+
+        """
+        self._store(
+            [
+                task_id
+                for task_id, (_, _, _, _, persistent, _) in self.tasks.items()
+                if persistent and task_id not in self.to_save
+            ]
+        )
+
+    def _get_free_id(self):
+        """
+        Get the lowest unused task id.
 
         Returns:
-            TaskHandlerTask: An object to represent a task.
-                Reference `evennia.scripts.taskhandler.TaskHandlerTask` for complete details.
+            int: A free task id.
+
+        """
+        task_id = self._free_id
+        while task_id in self.tasks:
+            task_id += 1
+        self._free_id = task_id + 1
+        return task_id
+
+    def _record(self, timedelay, callback, args, kwargs):
+        """
+        Record a new task, without storing or scheduling it.
+
+        Args:
+            timedelay (int or float): Time in seconds before calling the callback.
+            callback (function or instance method): The callback itself.
+            args (tuple): Positional arguments to pass to callback.
+            kwargs (dict): Keyword arguments to pass to callback, including the
+                optional `persistent` flag.
+
+        Returns:
+            tuple: `(task_id, persistent)`.
 
         """
         # set the completion time
@@ -351,15 +447,10 @@ class TaskHandler:
         delta = timedelta(seconds=timedelay)
         comp_time = now + delta
         # get an open task id
-        used_ids = list(self.tasks.keys())
-        task_id = 1
-        while task_id in used_ids:
-            task_id += 1
+        task_id = self._get_free_id()
 
         # record the task to the tasks dictionary
-        persistent = kwargs.get("persistent", False)
-        if "persistent" in kwargs:
-            del kwargs["persistent"]
+        persistent = kwargs.pop("persistent", False)
         if persistent:
             safe_args = []
             safe_kwargs = {}
@@ -390,15 +481,24 @@ class TaskHandler:
                     safe_kwargs[key] = value
 
             self.tasks[task_id] = (comp_time, callback, safe_args, safe_kwargs, persistent, None)
-            self.save()
         else:  # this is a non-persitent task
             self.tasks[task_id] = (comp_time, callback, args, kwargs, persistent, None)
+        return task_id, persistent
+
+    def _defer(self, task_id, timedelay, persistent):
+        """
+        Schedule a recorded task.
+
+        Args:
+            task_id (int): The task to schedule.
+            timedelay (int or float): Time in seconds before calling the task.
+            persistent (bool): If the task is persistent.
+
+        Returns:
+            TaskHandlerTask or bool: The task, or `False` if it already completed.
 
-        # defer the task
-        callback = self.do_task
-        args = [task_id]
-        kwargs = {}
-        d = deferLater(self.clock, timedelay, callback, *args, **kwargs)
+        """
+        d = deferLater(self.clock, timedelay, self.do_task, task_id)
         d.addErrback(handle_error)
 
         # some tasks may complete before the deferred can be added
@@ -410,9 +510,83 @@ class TaskHandler:
             self.tasks[task_id] = task
         else:  # the task already completed
             return False
+        return TaskHandlerTask(task_id)
+
+    def add(self, timedelay, callback, *args, **kwargs):
+        """
+        Add a new task.
+
+        If the persistent kwarg is truthy:
+        The callback, args and values for kwarg will be serialized. Type
+        and attribute errors during the serialization will be logged,
+        but will not throw exceptions.
+        For persistent tasks do not use memory references in the callback
+        function or arguments. After a restart those memory references are no
+        longer accurate.
+
+        Args:
+            timedelay (int or float): time in seconds before calling the callback.
+            callback (function or instance method): the callback itself
+            any (any): any additional positional arguments to send to the callback
+            *args: positional arguments to pass to callback.
+            **kwargs: keyword arguments to pass to callback.
+                - persistent (bool, optional): persist the task (stores it).
+                    Persistent key and value is removed from kwargs it will
+                    not be passed to callback.
+
+        Returns:
+            TaskHandlerTask: An object to represent a task.
+                Reference `evennia.scripts.taskhandler.TaskHandlerTask` for complete details.
+
+        """
+        task_id, persistent = self._record(timedelay, callback, args, kwargs)
+        if persistent:
+            self._store([task_id])
+        task = self._defer(task_id, timedelay, persistent)
+        if task and self.stale_timeout > 0:
+            self.clean_stale_tasks()
+        return task
+
+    def add_many(self, tasks):
+        """
+        Add many new tasks at once. This works like calling `add` for each
+        task, but all the persistent tasks are stored with a few bulk
+        database queries.
+
+        Args:
+            tasks (iterable): Tuples `(timedelay, callback, args, kwargs)`,
+                where `args` and `kwargs` are the arguments to `add`. Set
+                `persistent=True` in `kwargs` to persist that task.
+
+        Returns:
+            list: One `TaskHandlerTask` (or `False` if it already completed) per
+                task, in the order given.
+
+        Raises:
+            ValueError: If the callback of a persistent task cannot be pickled. No
+                tasks are added in that case.
+
+        """
+        added = []
+        try:
+            for timedelay, callback, args, kwargs in tasks:
+                added.append(
+                    (self._record(timedelay, callback, tuple(args), dict(kwargs)), timedelay)
+                )
+            self._store([task_id for (task_id, persistent), _ in added if persistent])
+        except Exception:
+            # don't leave the batch recorded without being scheduled
+            for (task_id, _), _ in added:
+                del self.tasks[task_id]
+                self._free_id = min(self._free_id, task_id)
+            raise
+        results = [
+            self._defer(task_id, timedelay, persistent)
+            for (task_id, persistent), timedelay in added
+        ]
         if self.stale_timeout > 0:
             self.clean_stale_tasks()
-        return TaskHandlerTask(task_id)
+        return results
 
     def exists(self, task_id):
         """
@@ -495,10 +669,11 @@ class TaskHandler:
             # if the task has not been run, cancel it
             self.cancel(task_id)
             del self.tasks[task_id]  # delete the task from the tasks dictionary
+            self._free_id = min(self._free_id, task_id)
         # remove the task from the persistent dictionary and ServerConfig
         if task_id in self.to_save:
             del self.to_save[task_id]
-            self.save()  # remove from ServerConfig.objects
+            self._delete_rows([task_id])
         # delete the instance of the deferred
         if d:
             del d
@@ -521,10 +696,11 @@ class TaskHandler:
                 if cancel:
                     self.cancel(task_id)
             self.tasks = {}
+        self._free_id = 1
         if self.to_save:
             self.to_save = {}
         if save:
-            self.save()
+            ServerConfig.objects.filter(db_key__startswith=_TASK_KEY_PREFIX).delete()
         return True
 
     def call_task(self, task_id):
@@ -7,15 +7,17 @@ from collections import defaultdict
 from unittest import TestCase, mock
 
 from parameterized import parameterized
+from twisted.internet.task import Clock
 
 from evennia import DefaultScript
 from evennia.objects.objects import DefaultObject
+from evennia.scripts import tickerhandler
 from evennia.scripts.manager import ScriptDBManager
 from evennia.scripts.models import ObjectDoesNotExist, ScriptDB
 from evennia.scripts.monitorhandler import MonitorHandler
 from evennia.scripts.ondemandhandler import OnDemandHandler, OnDemandTask
 from evennia.scripts.scripts import DoNothing, ExtendedLoopingCall
-from evennia.scripts.tickerhandler import TickerHandler
+from evennia.scripts.tickerhandler import Ticker, TickerHandler
 from evennia.utils.create import create_script
 from evennia.utils.dbserialize import dbserialize
 from evennia.utils.test_resources import BaseEvenniaTest, EvenniaTest
@@ -61,6 +63,66 @@ class TestTickerHandler(TestCase):
         self.assertTrue(len(th.all()), 0)
 
 
+_TICKED = []
+
+
+def _tick(arg):
+    _TICKED.append(arg)
+
+
+class TestTicker(TestCase):
+    """Test the sharding and time-slicing of a Ticker"""
+
+    def setUp(self):
+        _TICKED.clear()
+
+    def _make_ticker(self, nsubs, interval=6):
+        ticker = Ticker(interval)
+        self.clock = Clock()
+        for task in ticker.tasks:
+            task.clock = self.clock
+        for isub in range(nsubs):
+            ticker.add((None, None, "path", interval, str(isub), True), isub, _callback=_tick)
+        self.addCleanup(ticker.stop)
+        return ticker
+
+    @mock.patch("evennia.scripts.tickerhandler._TICKER_SHARDS", 3)
+    def test_shards(self):
+        ticker = self._make_ticker(6)
+        self.assertEqual([len(shard) for shard in ticker._shards], [2, 2, 2])
+        self.assertEqual([task.next_call_time() for task in ticker.tasks], [6, 2, 4])
+        self.clock.advance(2)
+        self.assertEqual(_TICKED, [1, 4])
+        self.clock.advance(4)
+        self.assertEqual(sorted(_TICKED), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(ticker.stats["ticks"], 3)
+        self.assertEqual(ticker.next_call_time(), 6)
+        # removing the last subscription of a shard stops its task
+        ticker.remove((None, None, "path", 6, "1", True))
+        ticker.remove((None, None, "path", 6, "4", True))
+        self.assertFalse(ticker.tasks[1].running)
+        self.assertEqual(len(ticker.subscriptions), 4)
+
+    @mock.patch("evennia.scripts.tickerhandler._TICKER_YIELD_EVERY", 2)
+    def test_yield_every(self):
+        ticker = self._make_ticker(5)
+        with mock.patch(
+            "evennia.scripts.tickerhandler.deferLater", wraps=tickerhandler.deferLater
+        ) as mock_defer_later:
+            self.clock.advance(6)
+        # we yield to the reactor after every 2 callbacks
+        self.assertEqual(mock_defer_later.call_count, 2)
+        self.assertEqual(_TICKED, [0, 1, 2, 3, 4])
+        self.assertEqual(ticker.stats["ticks"], 1)
+
+    def test_overrun(self):
+        ticker = self._make_ticker(1)
+        with mock.patch("evennia.scripts.tickerhandler.time.perf_counter", side_effect=[0, 10]):
+            self.clock.advance(6)
+        self.assertEqual(ticker.stats["overruns"], 1)
+        self.assertEqual(ticker.stats["max_duration"], 10)
+
+
 class TestScriptDBManager(TestCase):
     """Test the ScriptDBManger class"""
 
@@ -237,6 +299,14 @@ def dummy_func():
     return 0
 
 
+_MONITOR_CALLS = []
+
+
+def _monitor_callback(**kwargs):
+    """Monitor callback recording its calls"""
+    _MONITOR_CALLS.append(kwargs)
+
+
 class TestMonitorHandler(TestCase):
     """
     Test the MonitorHandler class.
@@ -244,6 +314,7 @@ class TestMonitorHandler(TestCase):
 
     def setUp(self):
         self.handler = MonitorHandler()
+        _MONITOR_CALLS.clear()
 
     def test_add(self):
         """Tests that adding an object to the monitor handler works correctly"""
@@ -335,6 +406,44 @@ class TestMonitorHandler(TestCase):
         self.handler.remove(obj, fieldname, idstring=idstring, category=category)
         self.assertEqual(self.handler.monitors[index][name], {})
 
+    def test_at_update(self):
+        """Tests that updates only call the callbacks of monitored fields"""
+        obj, other = mock.Mock(), mock.Mock()
+        self.handler.add(obj, "db_key", _monitor_callback, idstring="test", foo="bar")
+
+        self.handler.at_update(other, "db_key")
+        self.handler.at_update(obj, "db_location")
+        self.assertEqual(_MONITOR_CALLS, [])
+        self.handler.at_update(obj, "db_key")
+        self.assertEqual(_MONITOR_CALLS, [{"obj": obj, "fieldname": "db_key", "foo": "bar"}])
+        self.handler.remove(obj, "db_key", idstring="test")
+        self.assertNotIn(obj, self.handler._index)
+
+    def test_coalesce(self):
+        """Tests that updates within the same tick are merged into one callback"""
+        obj = mock.Mock()
+        self.handler.coalesce = True
+        self.handler.clock = Clock()
+        self.handler.add(obj, "db_key", _monitor_callback, idstring="test")
+        self.handler.add(obj, "db_location", _monitor_callback, idstring="test")
+
+        for _ in range(10):
+            self.handler.at_update(obj, "db_key")
+        self.handler.at_update(obj, "db_location")
+        self.assertEqual(_MONITOR_CALLS, [])
+        self.handler.clock.advance(0)
+        self.assertEqual(len(_MONITOR_CALLS), 2)
+
+        # updates to a removed monitor are dropped
+        self.handler.at_update(obj, "db_key")
+        self.handler.remove(obj, "db_key", idstring="test")
+        self.handler.clock.advance(0)
+        self.assertEqual(len(_MONITOR_CALLS), 2)
+        self.assertEqual(
+            self.handler.stats(),
+            {"updates": 12, "merged": 9, "dropped": 1, "callbacks": 2, "pending": 0},
+        )
+
 
 class TestOnDemandTask(EvenniaTest):
     """
@@ -700,6 +809,98 @@ class TestOnDemandHandler(EvenniaTest):
         self.assertEqual(self.handler.get_stage("rose", "flower"), "bud")
         self.assertEqual(self.handler.get_stage("daffodil", "flower"), "wilted")
 
+    @mock.patch("evennia.scripts.ondemandhandler.OnDemandTask.runtime")
+    def test_get_due(self, mock_runtime):
+        mock_runtime.return_value = 0
+        self.handler.batch_add(self.task1, self.task2, self.task3)
+        self.task1.start_time = 0
+        self.task2.start_time = 0
+
+        self.assertEqual(self.handler.get_next_transition_time(), 50)
+        self.assertEqual(self.handler.get_next_transition_time(category="flower"), 50)
+        self.assertEqual(self.handler.get_next_transition_time(all_on_none=False), None)
+        self.assertEqual(self.handler.get_due(), [])
+        self.assertEqual(self.handler.get_due(until=100), [self.task2, self.task1])
+
+        mock_runtime.return_value = 120
+        self.assertEqual(self.handler.get_due(), [self.task2, self.task1])
+        self.assertEqual(self.handler.get_changed_since(60), [self.task2, self.task1])
+        self.assertEqual(self.handler.get_changed_since(110), [])
+        # checking a task moves it to its next stage change
+        self.assertEqual(self.handler.get_stage("daffodil", "flower"), "flower")
+        self.assertEqual(self.handler.get_due(), [self.task1])
+        self.assertEqual(self.handler.get_next_transition_time(), 100)
+        # changing a task reschedules it
+        self.handler.set_dt("rose", "flower", 0)
+        self.assertEqual(self.handler.get_due(), [])
+        self.assertEqual(self.handler.get_next_transition_time(), 150)
+        self.handler.remove(self.task2)
+        self.assertEqual(self.handler.get_next_transition_time(), 220)
+        self.handler.clear(category="flower")
+        self.assertEqual(self.handler.get_next_transition_time(), None)
+        self.assertEqual(self.handler.all(), {("test", None): self.task3})
+
+    def test_save_delta(self):
+        from evennia.server.models import ServerConfig
+
+        rows = ServerConfig.objects.filter(db_key__startswith="on_demand_timers_")
+        rows.delete()
+        self.handler.batch_add(self.task1, self.task2)
+        self.handler.save()
+        self.assertEqual(rows.count(), 2)
+        # only changed tasks are written
+        with mock.patch.object(
+            ServerConfig.objects, "bulk_create", wraps=ServerConfig.objects.bulk_create
+        ) as mock_bulk_create:
+            self.handler.save()
+            self.assertEqual(mock_bulk_create.call_args[0][0], [])
+            self.handler.set_stage("rose", "flower", "bud")
+            self.handler.save()
+            self.assertEqual(len(mock_bulk_create.call_args[0][0]), 1)
+        self.handler.remove(self.task2)
+        self.handler.save()
+        self.assertEqual(rows.count(), 1)
+
+        self.handler.load()
+        self.assertEqual(list(self.handler.all()), [("rose", "flower")])
+        self.assertEqual(self.handler.get("rose", "flower").get_stage(), "bud")
+
+    @mock.patch("evennia.scripts.ondemandhandler.logger.log_trace")
+    def test_save_unpicklable(self, mock_log_trace):
+        from evennia.server.models import ServerConfig
+
+        rows = ServerConfig.objects.filter(db_key__startswith="on_demand_timers_")
+        rows.delete()
+        self.handler.batch_add(self.task1, self.task2)
+        self.handler.save()
+        self.task2.callback = lambda: None
+        self.handler.set_stage("rose", "flower", "bud")
+        self.handler.set_stage("daffodil", "flower", "bud")
+        self.handler.save()
+        mock_log_trace.assert_called_once()
+        # the task that could not be saved keeps its old row, and is retried next save
+        self.assertEqual(rows.count(), 2)
+        self.assertEqual(self.handler._dirty, {("daffodil", "flower")})
+
+        self.handler.load()
+        self.assertEqual(self.handler.get("rose", "flower").get_stage(), "bud")
+        self.assertEqual(self.handler.get("daffodil", "flower").get_stage(), "seedling")
+
+    def test_load_legacy(self):
+        from evennia.server.models import ServerConfig
+
+        ServerConfig.objects.filter(db_key__startswith="on_demand_timers_").delete()
+        ServerConfig.objects.conf(
+            "on_demand_timers", {("rose", "flower"): self.task1, ("test", None): self.task3}
+        )
+        self.handler.load()
+        self.assertEqual(self.handler.get("rose", "flower"), self.task1)
+        self.assertEqual(self.handler.get_next_transition_time(), self.task1.start_time + 100)
+        self.assertIsNone(ServerConfig.objects.conf("on_demand_timers"))
+        self.assertEqual(
+            ServerConfig.objects.filter(db_key__startswith="on_demand_timers_").count(), 2
+        )
+
     @staticmethod
     def _do_decay(task, **kwargs):
         task.stored_kwargs = kwargs
@@ -60,6 +60,12 @@ class MyTickerHandler(TickerHandler):
     ticker_pool_class = MyTickerPool
 ```
 
+With many subscriptions to the same interval, use `settings.TICKER_SHARDS` to
+spread them over several phase-offset sub-tickers, and
+`settings.TICKER_YIELD_EVERY` to let the server handle other things in the
+middle of a large tick. `TICKER_HANDLER.stats()` reports how long the ticks
+take and how often they overrun their time budget.
+
 If one wants to duplicate TICKER_HANDLER's auto-saving feature in
 a  custom handler one can make a custom `AT_STARTSTOP_MODULE` entry to
 call the handler's `save()` and `restore()` methods when the server reboots.
@@ -67,9 +73,13 @@ call the handler's `save()` and `restore()` methods when the server reboots.
 """
 
 import inspect
+import time
+from functools import partial
 
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from twisted.internet.defer import inlineCallbacks
+from twisted.internet.task import deferLater
 
 from evennia.scripts.scripts import ExtendedLoopingCall
 from evennia.server.models import ServerConfig
@@ -80,6 +90,9 @@ from evennia.utils.logger import log_err, log_trace
 _GA = object.__getattribute__
 _SA = object.__setattr__
 
+_TICKER_SHARDS = max(1, settings.TICKER_SHARDS)
+_TICKER_YIELD_EVERY = settings.TICKER_YIELD_EVERY
+
 
 _ERROR_ADD_TICKER = """TickerHandler: Tried to add an invalid ticker:
 {store_key}
@@ -98,17 +111,20 @@ class Ticker(object):
     Represents a repeatedly running task that calls
     hooks repeatedly. Overload `_callback` to change the
     way it operates.
+
+    The subscriptions are spread over `settings.TICKER_SHARDS` shards, each with
+    its own task firing at a different offset within the interval.
     """
 
     @inlineCallbacks
-    def _callback(self):
+    def _callback(self, ishard=0):
         """
-        This will be called repeatedly every `self.interval` seconds.
-        `self.subscriptions` contain tuples of (obj, args, kwargs) for
+        This will be called repeatedly every `self.interval` seconds, for every
+        shard. `self.subscriptions` contain tuples of (obj, args, kwargs) for
         each subscribing object.
 
         If overloading, this callback is expected to handle all
-        subscriptions when it is triggered. It should not return
+        subscriptions of the shard when it is triggered. It should not return
         anything and should not traceback on poorly designed hooks.
         The callback should ideally work under @inlineCallbacks so it
         can yield appropriately.
@@ -116,42 +132,46 @@ class Ticker(object):
         The _hook_key, which is passed down through the handler via
         kwargs is used here to identify which hook method to call.
 
+        Args:
+            ishard (int, optional): The shard to tick.
+
         """
-        self._to_add = []
-        self._to_remove = []
-        self._is_ticking = True
-        for store_key, (args, kwargs) in self.subscriptions.items():
-            callback = yield kwargs.pop("_callback", "at_tick")
-            obj = yield kwargs.pop("_obj", None)
-            try:
-                if callable(callback):
-                    # call directly
-                    yield callback(*args, **kwargs)
-                    continue
-                # try object method
-                if not obj or not obj.pk:
-                    # object was deleted between calls
+        self._is_ticking += 1
+        t0 = time.perf_counter()
+        try:
+            for ncall, (store_key, (callback, obj, args, kwargs)) in enumerate(
+                self._shards[ishard].items(), start=1
+            ):
+                try:
+                    if callable(callback):
+                        # call directly
+                        yield callback(*args, **kwargs)
+                    # try object method
+                    elif not obj or not obj.pk:
+                        # object was deleted between calls
+                        self._to_remove.append(store_key)
+                    else:
+                        yield _GA(obj, callback)(*args, **kwargs)
+                except ObjectDoesNotExist:
+                    log_trace("Removing ticker.")
                     self._to_remove.append(store_key)
-                    continue
-                else:
-                    yield _GA(obj, callback)(*args, **kwargs)
-            except ObjectDoesNotExist:
-                log_trace("Removing ticker.")
-                self._to_remove.append(store_key)
-            except Exception:
-                log_trace()
-            finally:
-                # make sure to re-store
-                kwargs["_callback"] = callback
-                kwargs["_obj"] = obj
+                except Exception:
+                    log_trace()
+                if _TICKER_YIELD_EVERY and not ncall % _TICKER_YIELD_EVERY:
+                    # give the reactor a chance to do other things
+                    yield deferLater(self.tasks[ishard].clock, 0, lambda: None)
+        finally:
+            self._is_ticking -= 1
+        self._update_stats(time.perf_counter() - t0)
         # cleanup - we do this here to avoid changing the subscription dict while it loops
-        self._is_ticking = False
-        for store_key in self._to_remove:
-            self.remove(store_key)
-        for store_key, (args, kwargs) in self._to_add:
-            self.add(store_key, *args, **kwargs)
-        self._to_remove = []
-        self._to_add = []
+        if not self._is_ticking:
+            to_remove, to_add = self._to_remove, self._to_add
+            self._to_remove = []
+            self._to_add = []
+            for store_key in to_remove:
+                self.remove(store_key)
+            for store_key, (args, kwargs) in to_add:
+                self.add(store_key, *args, **kwargs)
 
     def __init__(self, interval):
         """
@@ -163,27 +183,111 @@ class Ticker(object):
         """
         self.interval = interval
         self.subscriptions = {}
-        self._is_ticking = False
+        self._is_ticking = 0
         self._to_remove = []
         self._to_add = []
-        # set up a twisted asynchronous repeat call
-        self.task = ExtendedLoopingCall(self._callback)
+        # the subscriptions of each shard, as {store_key: (callback, obj, args, kwargs)}
+        self._shards = [{} for _ in range(_TICKER_SHARDS)]
+        # {store_key: shard index}
+        self._shard_index = {}
+        self.stats = {
+            "ticks": 0,
+            "last_duration": 0.0,
+            "max_duration": 0.0,
+            "total_duration": 0.0,
+            "overruns": 0,
+        }
+        # set up a twisted asynchronous repeat call for each shard
+        if _TICKER_SHARDS == 1:
+            self.tasks = [ExtendedLoopingCall(self._callback)]
+        else:
+            self.tasks = [
+                ExtendedLoopingCall(partial(self._callback, ishard))
+                for ishard in range(_TICKER_SHARDS)
+            ]
+        self.task = self.tasks[0]
+
+    def _update_stats(self, duration):
+        """
+        Record the duration of a tick. A tick overruns if it takes longer than
+        the time until the next shard is due to fire.
+
+        Args:
+            duration (float): The duration of the tick, in seconds.
+
+        """
+        stats = self.stats
+        stats["ticks"] += 1
+        stats["last_duration"] = duration
+        stats["max_duration"] = max(stats["max_duration"], duration)
+        stats["total_duration"] += duration
+        if duration > self.interval / len(self.tasks):
+            stats["overruns"] += 1
+
+    def _get_start_delay(self, ishard, start_delay=None):
+        """
+        Get the delay before the first call of a shard's task, keeping the
+        shards evenly spaced within the interval.
+
+        Args:
+            ishard (int): The shard to start.
+            start_delay (float, optional): The delay before the first shard
+                should fire. If not given, this is taken from the running
+                shards, or is a full interval if no shards are running.
+
+        Returns:
+            float or None: The delay to use.
+
+        """
+        nshards = len(self.tasks)
+        if nshards == 1:
+            return start_delay
+        if start_delay is None:
+            start_delay = self.next_call_time()
+        if start_delay is None:
+            start_delay = self.interval
+        # make sure we never start immediately
+        return (start_delay + ishard * self.interval / nshards) % self.interval or self.interval
+
+    def next_call_time(self):
+        """
+        Get the time until the first shard is due to fire, also if that
+        shard is not running.
+
+        Returns:
+            float or None: The seconds until the next call, or None if
+                the ticker is not running.
+
+        """
+        nshards = len(self.tasks)
+        if nshards == 1:
+            return self.task.next_call_time()
+        for ishard, task in enumerate(self.tasks):
+            next_call = task.next_call_time()
+            if next_call is not None:
+                next_call = (next_call - ishard * self.interval / nshards) % self.interval
+                return next_call or self.interval
+        return None
 
     def validate(self, start_delay=None):
         """
-        Start/stop the task depending on how many subscribers we have
-        using it.
+        Start/stop the tasks depending on how many subscribers we have
+        using them.
 
         Args:
             start_delay (int, optional): Time to way before starting.
 
         """
-        subs = self.subscriptions
-        if self.task.running:
-            if not subs:
-                self.task.stop()
-        elif subs:
-            self.task.start(self.interval, now=False, start_delay=start_delay)
+        for ishard, task in enumerate(self.tasks):
+            if task.running:
+                if not self._shards[ishard]:
+                    task.stop()
+            elif self._shards[ishard]:
+                task.start(
+                    self.interval,
+                    now=False,
+                    start_delay=self._get_start_delay(ishard, start_delay),
+                )
 
     def add(self, store_key, *args, **kwargs):
         """
@@ -205,6 +309,20 @@ class Ticker(object):
         else:
             start_delay = kwargs.pop("_start_delay", None)
             self.subscriptions[store_key] = (args, kwargs)
+            # put in the least-used shard, and prepare the call
+            ishard = self._shard_index.get(store_key)
+            if ishard is None:
+                ishard = min(range(len(self._shards)), key=lambda ind: len(self._shards[ind]))
+                self._shard_index[store_key] = ishard
+            callkwargs = {
+                key: value for key, value in kwargs.items() if key not in ("_callback", "_obj")
+            }
+            self._shards[ishard][store_key] = (
+                kwargs.get("_callback", "at_tick"),
+                kwargs.get("_obj"),
+                args,
+                callkwargs,
+            )
             self.validate(start_delay=start_delay)
 
     def remove(self, store_key):
@@ -221,6 +339,9 @@ class Ticker(object):
             self._to_remove.append(store_key)
         else:
             self.subscriptions.pop(store_key, False)
+            ishard = self._shard_index.pop(store_key, None)
+            if ishard is not None:
+                self._shards[ishard].pop(store_key, None)
             self.validate()
 
     def stop(self):
@@ -229,6 +350,8 @@ class Ticker(object):
 
         """
         self.subscriptions = {}
+        self._shards = [{} for _ in self.tasks]
+        self._shard_index = {}
         self.validate()
 
 
@@ -408,7 +531,7 @@ class TickerHandler(object):
         if self.ticker_storage:
             # get the current times so the tickers can be restarted with a delay later
             start_delays = dict(
-                (interval, ticker.task.next_call_time())
+                (interval, ticker.next_call_time())
                 for interval, ticker in self.ticker_pool.tickers.items()
             )
 
@@ -628,6 +751,32 @@ class TickerHandler(object):
                 return {interval: ticker.subscriptions}
             return None
 
+    def stats(self, interval=None):
+        """
+        Get timing statistics for the tickers.
+
+        Args:
+            interval (int, optional): Limit to the ticker with this interval.
+
+        Returns:
+            dict: `{interval: stats, ...}`, where `stats` is a dict with the number of
+                `"ticks"` run, their `"last_duration"`, `"max_duration"` and
+                `"total_duration"` in seconds, and the number of `"overruns"` - ticks
+                taking longer than the time until the next tick of the interval (or
+                of its next shard). Each entry also holds the number of
+                `"subscriptions"` and `"shards"`.
+
+        """
+        return {
+            tick_interval: {
+                **ticker.stats,
+                "subscriptions": len(ticker.subscriptions),
+                "shards": len(ticker.tasks),
+            }
+            for tick_interval, ticker in self.ticker_pool.tickers.items()
+            if interval is None or tick_interval == interval
+        }
+
     def all_display(self):
         """
         Get all tickers on an easily displayable form.
@@ -7,13 +7,16 @@ Portal. This module sets up the Client-side communication.
 import os
 
 from django.conf import settings
-from twisted.internet import protocol
+from twisted.internet import protocol, reactor
+from twisted.internet.defer import Deferred
 
 import evennia
 from evennia.server.portal import amp
 from evennia.utils import logger
 from evennia.utils.utils import class_from_module
 
+_AMP_MSG_BATCHING = settings.AMP_MSG_BATCHING
+
 
 class AMPClientFactory(protocol.ReconnectingClientFactory):
     """
@@ -151,8 +154,38 @@ class AMPServerClientProtocol(amp.AMPMultiConnectionProtocol):
             session (Session): Unique Session.
             kwargs (any, optiona): Extra data.
 
+        Returns:
+            deferred (Deferred): A deferred firing when the message has been
+                sent. With `settings.AMP_MSG_BATCHING`, all messages sent
+                during the same reactor tick share the same deferred.
+
+        """
+        if not _AMP_MSG_BATCHING:
+            return self.data_to_portal(amp.MsgServer2Portal, session.sessid, **kwargs)
+        self.msg_batch.append((session.sessid, kwargs))
+        if not self.msg_batch_task:
+            # send the batch at the end of this reactor tick
+            self.msg_batch_deferred = Deferred()
+            self.msg_batch_task = reactor.callLater(0, self.flush_msg_batch)
+        return self.msg_batch_deferred
+
+    def flush_msg_batch(self):
+        """
+        Send all messages queued for the Portal as one batch. This is
+        called automatically at the end of each reactor tick in which
+        messages were queued, but can also be called manually to make sure
+        queued messages are sent before some other operation.
+
         """
-        return self.data_to_portal(amp.MsgServer2Portal, session.sessid, **kwargs)
+        if self.msg_batch_task and self.msg_batch_task.active():
+            self.msg_batch_task.cancel()
+        self.msg_batch_task = None
+        batch, self.msg_batch = self.msg_batch, []
+        deferred, self.msg_batch_deferred = self.msg_batch_deferred, None
+        if batch:
+            self.callRemote(amp.MsgServer2PortalBatch, packed_data=amp.pack(batch)).addErrback(
+                self.errback, amp.MsgServer2PortalBatch.key
+            ).chainDeferred(deferred)
 
     def send_AdminServer2Portal(self, session, operation="", **kwargs):
         """
@@ -167,6 +200,9 @@ class AMPServerClientProtocol(amp.AMPMultiConnectionProtocol):
             kwargs (dict, optional): Data going into the adminstrative.
 
         """
+        # make sure messages sent earlier (like a goodbye before a
+        # disconnect) are not overtaken by the instruction
+        self.flush_msg_batch()
         return self.data_to_portal(
             amp.AdminServer2Portal, session.sessid, operation=operation, **kwargs
         )
@@ -447,6 +447,7 @@ ARG_OPTIONS = """Actions on installed server. One of:
  info        - show server and portal port info
  menu        - show a menu of options
  connections - show connection wizard
+ importtime  - show time spent importing modules at startup
 Others, like migrate, test and shell is passed on to Django."""
 
 # ------------------------------------------------------------
@@ -2255,6 +2256,12 @@ def main():
         # launch menu for operation
         init_game_directory(CURRENT_DIR, check_db=True)
         run_menu()
+    elif option == "importtime":
+        # profile the imports done when starting the server and portal
+        init_game_directory(CURRENT_DIR, check_db=False)
+        from evennia.server.profiling.importtime import run_importtime
+
+        run_importtime()
     elif option in (
         "status",
         "info",
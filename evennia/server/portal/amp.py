@@ -5,6 +5,7 @@ This module acts as a central place for AMP-servers and -clients to get commands
 
 """
 
+import marshal
 import pickle
 import time
 import zlib  # Used in Compressed class
@@ -93,6 +94,30 @@ def loads(data):
     return pickle.loads(data)
 
 
+# Helper functions for packing batched messages. The common text/OOB payloads
+# are plain Python data and are packed with marshal, which is considerably
+# faster than pickle and never calls arbitrary constructors when unpacking.
+# Anything marshal can't handle (such as class instances or str subclasses)
+# falls back to pickle. The first byte marks which format was used.
+
+_MARSHAL_FORMAT = b"M"
+_PICKLE_FORMAT = b"P"
+
+
+def pack(data):
+    try:
+        return _MARSHAL_FORMAT + marshal.dumps(data)
+    except ValueError:
+        # not plain data
+        return _PICKLE_FORMAT + dumps(data)
+
+
+def unpack(data):
+    if data[:1] == _MARSHAL_FORMAT:
+        return marshal.loads(memoryview(data)[1:])
+    return loads(memoryview(data)[1:])
+
+
 def _get_logger():
     """
     Delay import of logger until absolutely necessary
@@ -132,8 +157,16 @@ class Compressed(amp.String):
     batch-grouping of too-long sends is borrowed from the "mediumbox"
     recipy at twisted-hacks's ~glyph/+junk/amphacks/mediumbox.
 
+    Args:
+        level (int, optional): The zlib compression level, from 1 (fastest)
+            to 9 (smallest).
+
     """
 
+    def __init__(self, level=9, **kwargs):
+        super().__init__(**kwargs)
+        self.level = level
+
     def fromBox(self, name, strings, objects, proto):
         """
         Converts from box string representation to python. We read back too-long batched data and
@@ -178,7 +211,7 @@ class Compressed(amp.String):
         Note: In Py3 this is really a byte stream.
 
         """
-        return zlib.compress(super().toString(inObject), 9)
+        return zlib.compress(super().toString(inObject), self.level)
 
     def fromString(self, inString):
         """
@@ -224,6 +257,22 @@ class MsgServer2Portal(amp.Command):
     response = []
 
 
+class MsgServer2PortalBatch(amp.Command):
+    """
+    Message Server -> Portal, for any number of sessions
+
+    All messages sent to the Portal during the same reactor tick are
+    coalesced and sent as one batch of `(sessid, kwargs)` tuples, so a
+    broadcast to many sessions only needs to be packed and sent once.
+
+    """
+
+    key = "MsgServer2PortalBatch"
+    arguments = [(b"packed_data", Compressed(level=1))]
+    errors = {Exception: b"EXCEPTION"}
+    response = []
+
+
 class AdminPortal2Server(amp.Command):
     """
     Administration Portal -> Server
@@ -313,6 +362,10 @@ class AMPMultiConnectionProtocol(amp.AMP):
         self.send_mode = True
         self.send_task = None
         self.multibatches = 0
+        # messages waiting to be sent as one batch at the end of the tick
+        self.msg_batch = []
+        self.msg_batch_task = None
+        self.msg_batch_deferred = None
         # later twisted amp has its own __init__
         super().__init__(*args, **kwargs)
 
@@ -505,6 +558,18 @@ class AMPMultiConnectionProtocol(amp.AMP):
         msg = loads(packed_data)
         return msg
 
+    def batch_data_in(self, packed_data):
+        """
+        Process incoming packed batch data.
+
+        Args:
+            packed_data (bytes): Packed batch, as created by `pack`.
+        Returns:
+            batch (list): A list of `(sessid, kwargs)` tuples.
+
+        """
+        return unpack(packed_data)
+
     def broadcast(self, command, sessid, **kwargs):
         """
         Send data across the wire to all connections.
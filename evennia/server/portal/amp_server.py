@@ -393,6 +393,32 @@ class AMPServerProtocol(amp.AMPMultiConnectionProtocol):
             logger.log_trace("packed_data len {}".format(len(packed_data)))
         return {}
 
+    @amp.MsgServer2PortalBatch.responder
+    @amp.catch_traceback
+    def portal_receive_server2portal_batch(self, packed_data):
+        """
+        Receives a batch of messages arriving to Portal from Server.
+        This method is executed on the Portal.
+
+        Args:
+            packed_data (str): Packed list of (sessid, kwargs) coming over the wire.
+
+        """
+        try:
+            batch = self.batch_data_in(packed_data)
+        except Exception:
+            logger.log_trace("packed_data len {}".format(len(packed_data)))
+            return {}
+        sessionhandler = evennia.PORTAL_SESSION_HANDLER
+        for sessid, kwargs in batch:
+            session = sessionhandler.get(sessid, None)
+            if session:
+                try:
+                    sessionhandler.data_out(session, **kwargs)
+                except Exception:
+                    logger.log_trace("Error sending batched data to session {}".format(sessid))
+        return {}
+
     @amp.AdminServer2Portal.responder
     @amp.catch_traceback
     def portal_receive_adminserver2portal(self, packed_data):
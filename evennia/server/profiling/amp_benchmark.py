@@ -0,0 +1,99 @@
+"""
+Benchmark the packing of Server -> Portal messages over AMP, comparing the
+per-message `MsgServer2Portal` path with the per-tick `MsgServer2PortalBatch`
+path.
+
+This simulates a room broadcast going out to many sessions, measuring the
+time and CPU needed to pack every message into AMP boxes ready for the wire,
+as well as the number of bytes sent. Run from your game dir with
+
+    evennia shell
+    >>> from evennia.server.profiling.amp_benchmark import run_benchmark
+    >>> run_benchmark()
+
+"""
+
+import time
+
+from twisted.protocols.amp import AmpBox
+
+from evennia.server.portal import amp
+
+
+def _box_bytes(command, packed_data):
+    """
+    Serialize one AMP command box the same way `callRemote` would.
+
+    """
+    box = AmpBox()
+    for argname, argument in command.arguments:
+        argument.toBox(argname, box, {"packed_data": packed_data}, None)
+    return box.serialize()
+
+
+def _single(messages):
+    """
+    Pack messages one by one, like the unbatched path.
+
+    """
+    return [
+        _box_bytes(amp.MsgServer2Portal, amp.dumps((sessid, kwargs)))
+        for sessid, kwargs in messages
+    ]
+
+
+def _batched(messages):
+    """
+    Pack all messages as one batch, like the batched path.
+
+    """
+    return [_box_bytes(amp.MsgServer2PortalBatch, amp.pack(messages))]
+
+
+def _time(func, messages, nrounds):
+    """
+    Run and time `func` on `messages`, `nrounds` times.
+
+    """
+    t0, c0 = time.perf_counter(), time.process_time()
+    for _ in range(nrounds):
+        boxes = func(messages)
+    t1, c1 = time.perf_counter(), time.process_time()
+    nbytes = sum(len(box) for box in boxes)
+    return t1 - t0, c1 - c0, len(boxes), nbytes
+
+
+def run_benchmark(nsessions=200, nrounds=50, text="The |rdragon|n breathes fire at you!"):
+    """
+    Run the benchmark and print the result.
+
+    Args:
+        nsessions (int, optional): Number of sessions receiving each broadcast.
+        nrounds (int, optional): Number of broadcasts to time.
+        text (str, optional): The text to broadcast.
+
+    Returns:
+        dict: The results, `{"single": (...), "batched": (...)}`, where each
+            tuple is `(msgs_per_sec, cpu_per_msg, boxes, bytes_per_broadcast)`.
+
+    """
+    messages = [
+        (sessid, {"text": (text, {"type": "say"}), "options": {"raw": False}})
+        for sessid in range(1, nsessions + 1)
+    ]
+    nmsgs = nsessions * nrounds
+    results = {}
+    print(f"Broadcasting to {nsessions} sessions, {nrounds} times:")
+    for name, func in (("single", _single), ("batched", _batched)):
+        walltime, cputime, nboxes, nbytes = _time(func, messages, nrounds)
+        results[name] = (nmsgs / walltime, cputime / nmsgs, nboxes, nbytes)
+        print(
+            f" {name:>8}: {nmsgs / walltime:10.0f} msgs/sec, "
+            f"{cputime / nmsgs * 1e6:6.1f} us CPU/msg, "
+            f"{nboxes} AMP box(es), {nbytes} bytes per broadcast"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,71 @@
+"""
+Benchmark the time and memory needed to build `ANSIString`s the way an
+`EvTable`-heavy command (like a `who` list or a shop inventory) does it.
+
+The memory reported is the peak allocated while rendering, as measured by
+`tracemalloc`. Run from your game dir with
+
+    evennia shell
+    >>> from evennia.server.profiling.ansistring_benchmark import run_benchmark
+    >>> run_benchmark()
+
+"""
+
+import time
+import tracemalloc
+
+from evennia.utils.evtable import EvTable
+
+
+def _build_table(nrows):
+    """
+    Build and render a colored table with `nrows` rows.
+
+    """
+    table = EvTable("|wName|n", "|wLocation|n", "Idle", "|yDescription|n", border="cells")
+    for irow in range(nrows):
+        table.add_row(
+            f"|cPlayer{irow}|n",
+            f"The |gGreen|n Room #{irow}",
+            f"{irow % 60}m",
+            "A rather long description of the player that will have to be "
+            f"wrapped over |rmultiple|n lines of the table, number {irow}.",
+        )
+    return str(table)
+
+
+def run_benchmark(nrows=50, nrounds=20):
+    """
+    Run the benchmark and print the result.
+
+    Args:
+        nrows (int, optional): Number of rows in each table.
+        nrounds (int, optional): Number of tables to render.
+
+    Returns:
+        dict: `{"tables_per_sec": float, "peak_kb": float}`.
+
+    """
+    # warm up any caches
+    _build_table(nrows)
+
+    t0 = time.perf_counter()
+    for _ in range(nrounds):
+        _build_table(nrows)
+    elapsed = time.perf_counter() - t0
+
+    tracemalloc.start()
+    _build_table(nrows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    results = {"tables_per_sec": nrounds / elapsed, "peak_kb": peak / 1024}
+    print(
+        f"EvTable with {nrows} rows: {results['tables_per_sec']:8.1f} tables/sec, "
+        f"{results['peak_kb']:8.1f} KB peak memory per render"
+    )
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,127 @@
+"""
+Report how much time the Server and Portal spend importing modules when they
+start, grouped per subsystem (`evennia.objects`, `evennia.commands`, `django`,
+`twisted` etc). The report is made by running `evennia._init` in a new Python
+process with `python -X importtime`, so modules already imported by the
+current process don't hide their cost.
+
+Run from your game dir with
+
+    evennia importtime
+
+or from inside the `evennia shell` with
+
+    >>> from evennia.server.profiling.importtime import run_importtime
+    >>> run_importtime()
+
+"""
+
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+_BOOTSTRAP = "import django; django.setup(); import evennia; evennia._init(portal_mode={})"
+
+
+def parse_importtime(output):
+    """
+    Parse the output of `python -X importtime`.
+
+    Args:
+        output (str): The stderr output of the process, lines on the form
+            `import time: <self us> | <cumulative us> | <module>`. Other lines are ignored.
+
+    Returns:
+        list: `[(module, self_us), ...]` in the order imported.
+
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, _, module = line[len("import time:") :].split("|")
+            imports.append((module.strip(), int(self_us)))
+        except ValueError:
+            # the header line
+            continue
+    return imports
+
+
+def aggregate_importtime(imports, depth=2):
+    """
+    Sum import times per subsystem.
+
+    Args:
+        imports (list): `[(module, self_us), ...]` as returned by `parse_importtime`.
+        depth (int, optional): How many levels of the `evennia` package name to group by,
+            so `evennia.objects.objects` is counted as `evennia.objects`. Other packages
+            are grouped by their top-level name.
+
+    Returns:
+        list: `[(subsystem, total_us, nmodules), ...]`, slowest first.
+
+    """
+    totals = defaultdict(lambda: [0, 0])
+    for module, self_us in imports:
+        parts = module.split(".")
+        subsystem = ".".join(parts[:depth]) if parts[0] == "evennia" else parts[0]
+        totals[subsystem][0] += self_us
+        totals[subsystem][1] += 1
+    return sorted(
+        ((subsystem, total, nmodules) for subsystem, (total, nmodules) in totals.items()),
+        key=lambda tup: tup[1],
+        reverse=True,
+    )
+
+
+def measure_importtime(portal_mode=False):
+    """
+    Run `evennia._init` in a new process and record its imports.
+
+    Args:
+        portal_mode (bool, optional): Initialize as the Portal rather than the Server.
+
+    Returns:
+        list: `[(module, self_us), ...]`, as returned by `parse_importtime`.
+
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _BOOTSTRAP.format(bool(portal_mode))],
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    imports = parse_importtime(proc.stderr)
+    if proc.returncode:
+        # show what went wrong, without the import times
+        print("\n".join(line for line in proc.stderr.splitlines() if "import time:" not in line))
+    return imports
+
+
+def run_importtime(nshow=20):
+    """
+    Measure and print the import times of the Server and Portal.
+
+    Args:
+        nshow (int, optional): Number of subsystems to show for each.
+
+    Returns:
+        dict: `{"Server": [(subsystem, total_us, nmodules), ...], "Portal": [...]}`.
+
+    """
+    results = {}
+    for name, portal_mode in (("Server", False), ("Portal", True)):
+        imports = measure_importtime(portal_mode=portal_mode)
+        results[name] = subsystems = aggregate_importtime(imports)
+        total = sum(self_us for _, self_us in imports)
+        print(f"{name}: {len(imports)} modules imported in {total / 1e6:.2f}s")
+        for subsystem, total_us, nmodules in subsystems[:nshow]:
+            print(f" {subsystem:<32} {total_us / 1e3:9.1f} ms {nmodules:5} modules")
+    return results
+
+
+if __name__ == "__main__":
+    run_importtime()
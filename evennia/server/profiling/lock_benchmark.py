@@ -0,0 +1,87 @@
+"""
+Benchmark the throughput of `LockHandler.check()`, comparing the old
+`eval`-based evaluation of lock definitions with the compiled evaluator, with
+and without the lock result cache (`settings.LOCK_RESULT_CACHE`).
+
+Run from your game dir with
+
+    evennia shell
+    >>> from evennia.server.profiling.lock_benchmark import run_benchmark
+    >>> run_benchmark()
+
+"""
+
+import time
+from unittest.mock import patch
+
+from evennia.locks import lockhandler
+from evennia.utils import create
+
+_LOCKSTRING = (
+    "view:all();get:perm(Builder) or not tag(heavy);"
+    "edit:id(1) or perm(Admin) and not perm_above(Developer)"
+)
+
+
+def _eval_access_type(self, accessing_obj, locks, access_type):
+    """
+    The pre-compilation way of evaluating a lock, for comparison.
+
+    """
+    evalstring, func_tup, raw_string = locks[access_type]
+    true_false = tuple(
+        bool(tup[0](accessing_obj, self.obj, *tup[1], access_type=access_type, **tup[2]))
+        for tup in func_tup
+    )
+    return eval(evalstring % true_false)
+
+
+def _time(obj, accessing_obj, nchecks):
+    """
+    Time `nchecks` lock checks of each access type.
+
+    """
+    t0 = time.perf_counter()
+    for _ in range(nchecks):
+        for access_type in ("view", "get", "edit"):
+            obj.locks.check(accessing_obj, access_type, no_superuser_bypass=True)
+    return time.perf_counter() - t0
+
+
+def run_benchmark(nchecks=10000):
+    """
+    Run the benchmark and print the result.
+
+    Args:
+        nchecks (int, optional): Number of checks of each access type to time.
+
+    Returns:
+        dict: Checks per second, `{"eval": float, "compiled": float, "cached": float}`.
+
+    """
+    obj = create.create_object(key="LockBenchmarkObj", nohome=True)
+    accessing_obj = create.create_object(key="LockBenchmarkAccessor", nohome=True)
+    try:
+        obj.locks.add(_LOCKSTRING)
+        accessing_obj.permissions.add("Builder")
+        ntotal = nchecks * 3
+        # warm up the permission- and tag-caches
+        _time(obj, accessing_obj, 10)
+        results = {}
+        with patch.object(lockhandler.LockHandler, "_eval_access_type", _eval_access_type):
+            results["eval"] = ntotal / _time(obj, accessing_obj, nchecks)
+        results["compiled"] = ntotal / _time(obj, accessing_obj, nchecks)
+        with patch.object(lockhandler, "_LOCK_RESULT_CACHE", True):
+            results["cached"] = ntotal / _time(obj, accessing_obj, nchecks)
+    finally:
+        obj.delete()
+        accessing_obj.delete()
+
+    print(f"Lock checks ({nchecks} x 3 access types):")
+    for name, rate in results.items():
+        print(f" {name:>8}: {rate:10.0f} checks/sec")
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,124 @@
+"""
+Benchmark spawning many objects from a prototype, comparing the bulk
+creation of `spawner.batch_create_object` with saving the objects one by
+one, as is done when the database can't return the ids of bulk-inserted rows.
+It also times re-applying a changed prototype to the spawned objects with
+`spawner.batch_update_objects_with_prototype`.
+
+Run from your game dir with
+
+    evennia shell
+    >>> from evennia.server.profiling.spawn_benchmark import run_benchmark, run_update_benchmark
+    >>> run_benchmark()
+    >>> run_update_benchmark()
+
+"""
+
+import time
+from unittest.mock import PropertyMock, patch
+
+from django.db import connection
+
+from evennia.prototypes import spawner
+from evennia.utils import create
+
+_PROTOTYPE = {
+    "prototype_key": "spawn_benchmark_mob",
+    "typeclass": "evennia.objects.objects.DefaultObject",
+    "key": "goblin",
+    "aliases": ["gob", "grunt"],
+    "tags": [("monster", "type"), ("dungeon", "zone")],
+    "locks": "get:false()",
+    "attrs": [("weapon", "club", "gear")],
+    "health": 10,
+    "stats": {"str": 12, "dex": 14},
+}
+
+
+def _time(prototype, nobjs):
+    """
+    Time spawning `nobjs` objects and delete them afterwards.
+
+    """
+    t0 = time.perf_counter()
+    objs = spawner.spawn(*([prototype] * nobjs))
+    duration = time.perf_counter() - t0
+    for obj in objs:
+        obj.delete()
+    return duration
+
+
+def run_benchmark(nobjs=1000):
+    """
+    Run the benchmark and print the result.
+
+    Args:
+        nobjs (int, optional): Number of objects to spawn with each method.
+
+    Returns:
+        dict: Objects spawned per second, `{"one by one": float, "bulk": float}`.
+
+    """
+    room = create.create_object(
+        "evennia.objects.objects.DefaultRoom", key="SpawnBenchmarkRoom", nohome=True
+    )
+    try:
+        prototype = dict(_PROTOTYPE, location=room)
+        # create the shared Tags up front
+        _time(prototype, 1)
+        results = {}
+        with patch.object(
+            type(connection.features),
+            "can_return_rows_from_bulk_insert",
+            new_callable=PropertyMock,
+            return_value=False,
+        ):
+            results["one by one"] = nobjs / _time(prototype, nobjs)
+        results["bulk"] = nobjs / _time(prototype, nobjs)
+    finally:
+        room.delete()
+
+    print(f"Spawning {nobjs} objects:")
+    for name, rate in results.items():
+        print(f" {name:>10}: {rate:8.0f} objects/sec")
+    return results
+
+
+def run_update_benchmark(nobjs=1000):
+    """
+    Spawn objects, then time updating them all to a changed prototype.
+
+    Args:
+        nobjs (int, optional): Number of objects to update.
+
+    Returns:
+        float: Objects updated per second.
+
+    """
+    room = create.create_object(
+        "evennia.objects.objects.DefaultRoom", key="SpawnBenchmarkRoom", nohome=True
+    )
+    try:
+        prototype = dict(_PROTOTYPE, location=room)
+        objs = spawner.spawn(*([prototype] * nobjs))
+        new_prototype = dict(
+            prototype,
+            key="hobgoblin",
+            tags=[("monster", "type"), ("elite", "rank")],
+            locks="get:true()",
+            health=20,
+        )
+        t0 = time.perf_counter()
+        spawner.batch_update_objects_with_prototype(new_prototype, objects=objs)
+        rate = nobjs / (time.perf_counter() - t0)
+        for obj in objs:
+            obj.delete()
+    finally:
+        room.delete()
+
+    print(f"Updating {nobjs} objects: {rate:8.0f} objects/sec")
+    return rate
+
+
+if __name__ == "__main__":
+    run_benchmark()
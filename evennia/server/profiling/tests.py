@@ -2,6 +2,7 @@ from anything import Something
 from django.test import TestCase
 from mock import Mock, mock_open, patch
 
+from . import importtime
 from .dummyrunner_settings import (
     c_creates_button,
     c_creates_obj,
@@ -158,3 +159,23 @@ class TestMemPlot(TestCase):
         handle = mocked_open()
         handle.write.assert_called_with("100.0, 0.001, 0.001, 9\n")
         script.stop()
+
+
+class TestImportTime(TestCase):
+    def test_aggregate_importtime(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |   django.db\n"
+            "import time:       300 |        400 | django\n"
+            "import time:        50 |         50 |     evennia.objects.models\n"
+            "import time:        20 |         70 |   evennia.objects.objects\n"
+            "some other output\n"
+            "import time:        10 |         10 | evennia\n"
+        )
+        imports = importtime.parse_importtime(output)
+        self.assertEqual(len(imports), 5)
+        self.assertEqual(imports[0], ("django.db", 100))
+        self.assertEqual(
+            importtime.aggregate_importtime(imports),
+            [("django", 400, 2), ("evennia.objects", 70, 2), ("evennia", 10, 1)],
+        )
@@ -30,6 +30,9 @@ _ANSI = None
 
 _BASE_SESSION_CLASS = class_from_module(settings.BASE_SESSION_CLASS)
 
+# session properties indexed by the ServerSessionHandler storing the session
+_INDEXED_PROPERTIES = ("logged_in", "uid", "csessid")
+
 
 # -------------------------------------------------------------
 # Server Session
@@ -63,6 +66,17 @@ class ServerSession(_BASE_SESSION_CLASS):
         self.cmdset_storage_string = ""
         self.cmdset = CmdSetHandler(self, True)
 
+    def __setattr__(self, propname, value):
+        """
+        Keep the indexes of the session handler storing this session up to date.
+
+        """
+        _SA(self, propname, value)
+        if propname in _INDEXED_PROPERTIES:
+            handler = self.__dict__.get("_indexed_by")
+            if handler is not None:
+                handler._index_session(self)
+
     def __cmdset_storage_get(self):
         return [path.strip() for path in self.cmdset_storage_string.split(",")]
 
@@ -559,9 +559,17 @@ class EvenniaServerService(MultiService):
 
         ON_DEMAND_HANDLER.save()
 
+        # write any coalesced, not-yet-saved Attribute changes
+        from evennia.utils.dbserialize import flush_saves
+
+        flush_saves()
+
         # always called, also for a reload
         self.at_server_stop()
 
+        # make sure all queued log-file lines are on disk
+        logger.flush_log_files(timeout=5)
+
         if hasattr(self, "web_root"):  # not set very first start
             yield self.web_root.empty_threadpool()
 
@@ -95,6 +95,23 @@ def delayed_import():
     assert _ScriptDB, "ScriptDB class c ould not load"
 
 
+def _remove_from_index(index, indexkey, key):
+    """
+    Helper to remove a session from a secondary session index.
+
+    Args:
+        index (dict): The index `{indexkey: {id(session): session}}`.
+        indexkey (any): The index key to remove the session from.
+        key (int): The `id()` of the session to remove.
+
+    """
+    sessions = index.get(indexkey)
+    if sessions is not None:
+        sessions.pop(key, None)
+        if not sessions:
+            del index[indexkey]
+
+
 # -----------------------------------------------------------
 # SessionHandler base class
 # ------------------------------------------------------------
@@ -311,6 +328,139 @@ class ServerSessionHandler(SessionHandler):
         evennia.server_data = {"servername": _SERVERNAME}
         # will be set on psync
         self.portal_start_time = 0.0
+        # secondary indexes {key: {id(session): session}}, kept up to date as sessions are
+        # added/removed and by the sessions themselves as they log in/out
+        self._uid_index = {}
+        self._csessid_index = {}
+        # {id(session): session} of logged-in sessions
+        self._logged_in = {}
+        # {id(session): (logged_in, uid, csessid)} as last indexed
+        self._indexed = {}
+
+    def __setitem__(self, key, value):
+        """
+        Index sessions as they are added.
+
+        """
+        if key is None:
+            return
+        old_session = dict.get(self, key)
+        if old_session is not None and old_session is not value:
+            self._unindex_session(old_session)
+        super().__setitem__(key, value)
+        value._indexed_by = self
+        self._index_session(value)
+
+    def __delitem__(self, key):
+        """
+        Remove sessions from the indexes as they are removed.
+
+        """
+        session = dict.get(self, key)
+        super().__delitem__(key)
+        if session is not None:
+            self._unindex_session(session)
+
+    def pop(self, key, *args):
+        session = dict.get(self, key)
+        value = super().pop(key, *args)
+        if session is not None:
+            self._unindex_session(session)
+        return value
+
+    def clear(self):
+        for session in self.values():
+            self._unindex_session(session)
+        super().clear()
+
+    def _index_session(self, session):
+        """
+        Add a session to the secondary indexes, or update it there. This is called by the
+        session whenever one of its indexed properties change.
+
+        Args:
+            session (Session): The session to index.
+
+        """
+        self._unindex_session(session, keep_link=True)
+        if getattr(session, "_indexed_by", None) is not self:
+            # not (or no longer) stored in this handler
+            return
+        key = id(session)
+        logged_in = getattr(session, "logged_in", False)
+        uid = getattr(session, "uid", None)
+        csessid = getattr(session, "csessid", None)
+        if logged_in:
+            self._logged_in[key] = session
+            self._uid_index.setdefault(uid, {})[key] = session
+        if csessid:
+            self._csessid_index.setdefault(csessid, {})[key] = session
+        self._indexed[key] = (logged_in, uid, csessid)
+
+    def _unindex_session(self, session, keep_link=False):
+        """
+        Remove a session from the secondary indexes.
+
+        Args:
+            session (Session): The session to remove.
+            keep_link (bool, optional): Let the session keep reporting changes to this handler.
+
+        """
+        key = id(session)
+        indexed = self._indexed.pop(key, None)
+        if not keep_link and getattr(session, "_indexed_by", None) is self:
+            session._indexed_by = None
+        if not indexed:
+            return
+        logged_in, uid, csessid = indexed
+        if logged_in:
+            self._logged_in.pop(key, None)
+            _remove_from_index(self._uid_index, uid, key)
+        if csessid:
+            _remove_from_index(self._csessid_index, csessid, key)
+
+    def get_sessions(self, include_unloggedin=False):
+        """
+        Returns the connected session objects.
+
+        Args:
+            include_unloggedin (bool, optional): Also list Sessions
+                that have not yet authenticated.
+
+        Returns:
+            sessions (list): A list of `Session` objects.
+
+        """
+        if include_unloggedin:
+            return list(self.values())
+        return list(self._logged_in.values())
+
+    def check_indexes(self):
+        """
+        Check that the secondary indexes match the stored sessions. This is
+        mainly useful for unit tests.
+
+        Returns:
+            list: Descriptions of all mismatches found. Empty if all is well.
+
+        """
+        uid_index, csessid_index, logged_in = {}, {}, {}
+        for session in self.values():
+            key = id(session)
+            if session.logged_in:
+                logged_in[key] = session
+                uid_index.setdefault(session.uid, {})[key] = session
+            if session.csessid:
+                csessid_index.setdefault(session.csessid, {})[key] = session
+        errors = []
+        for name, index, expected in (
+            ("uid", self._uid_index, uid_index),
+            ("csessid", self._csessid_index, csessid_index),
+            ("logged_in", self._logged_in, logged_in),
+        ):
+            if index != expected:
+                errors.append(f"The {name} index {index} should be {expected}.")
+        return errors
 
     def _run_cmd_login(self, session):
         """
@@ -655,12 +805,11 @@ class ServerSessionHandler(SessionHandler):
             reason (str, optional): A motivation for disconnecting.
 
         """
-        uid = curr_session.uid
         # we can't compare sessions directly since this will compare addresses and
         # mean connecting from the same host would not catch duplicates
         sid = id(curr_session)
         doublet_sessions = [
-            sess for sess in self.values() if sess.logged_in and sess.uid == uid and id(sess) != sid
+            sess for key, sess in self._uid_index.get(curr_session.uid, {}).items() if key != sid
         ]
 
         for session in doublet_sessions:
@@ -674,13 +823,13 @@ class ServerSessionHandler(SessionHandler):
         """
         tcurr = time.time()
         reason = _("Idle timeout exceeded, disconnecting.")
-        for session in (
+        if _IDLE_TIMEOUT <= 0:
+            return
+        for session in [
             session
-            for session in self.values()
-            if session.logged_in
-            and _IDLE_TIMEOUT > 0
-            and (tcurr - session.cmd_last) > _IDLE_TIMEOUT
-        ):
+            for session in self._logged_in.values()
+            if (tcurr - session.cmd_last) > _IDLE_TIMEOUT
+        ]:
             self.disconnect(session, reason=reason)
 
     def account_count(self):
@@ -693,7 +842,7 @@ class ServerSessionHandler(SessionHandler):
             naccount (int): Number of connected accounts
 
         """
-        return len(set(session.uid for session in self.values() if session.logged_in))
+        return len(self._uid_index)
 
     def all_connected_accounts(self):
         """
@@ -704,13 +853,13 @@ class ServerSessionHandler(SessionHandler):
                 amount of Sessions due to multi-playing).
 
         """
-        return list(
-            set(
-                session.account
-                for session in self.values()
-                if session.logged_in and session.account
-            )
-        )
+        accounts = []
+        for sessions in self._uid_index.values():
+            for session in sessions.values():
+                if session.account:
+                    accounts.append(session.account)
+                    break
+        return accounts
 
     def session_from_sessid(self, sessid):
         """
@@ -759,8 +908,7 @@ class ServerSessionHandler(SessionHandler):
             sessions (list): All Sessions associated with this account.
 
         """
-        uid = account.uid
-        return [session for session in self.values() if session.logged_in and session.uid == uid]
+        return list(self._uid_index.get(account.uid, {}).values())
 
     def sessions_from_puppet(self, puppet):
         """
@@ -793,9 +941,7 @@ class ServerSessionHandler(SessionHandler):
         """
         if not csessid:
             return []
-        return [
-            session for session in self.values() if session.csessid and session.csessid == csessid
-        ]
+        return list(self._csessid_index.get(csessid, {}).values())
 
     def announce_all(self, message):
         """
@@ -5,7 +5,7 @@ Test AMP client
 
 import pickle
 from unittest import TestCase
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
 from model_mommy import mommy
 from twisted.internet.base import DelayedCall
@@ -19,6 +19,7 @@ from evennia.server.portal.service import EvenniaPortalService
 from evennia.server.service import EvenniaServerService
 from evennia.server.sessionhandler import ServerSessionHandler
 from evennia.utils import create
+from evennia.utils.ansi import ANSIString
 
 DelayedCall.debug = True
 
@@ -86,6 +87,9 @@ class TestAMPClientSend(_TestAMP):
     def test_msgserver2portal(self, mocktransport):
         self._connect_client(mocktransport)
         self.amp_client.send_MsgServer2Portal(self.session, text={"foo": "bar"})
+        # messages are batched until the end of the reactor tick
+        self.assertEqual(self._catch_wire_read(mocktransport), [])
+        self.amp_client.flush_msg_batch()
         wire_data = self._catch_wire_read(mocktransport)[0]
 
         self._connect_server(mocktransport)
@@ -94,6 +98,40 @@ class TestAMPClientSend(_TestAMP):
             self.portalsession, text={"foo": "bar"}
         )
 
+    def test_msgserver2portal_batch(self, mocktransport):
+        portalsession2 = session.Session()
+        portalsession2.sessid = 2
+        evennia.PORTAL_SESSION_HANDLER[2] = portalsession2
+        session2 = MagicMock()
+        session2.sessid = 2
+
+        self._connect_client(mocktransport)
+        self.amp_client.send_MsgServer2Portal(self.session, text=("Hello", {}))
+        self.amp_client.send_MsgServer2Portal(session2, text=("Hello", {}))
+        # not plain data, so not packable with marshal
+        self.amp_client.send_MsgServer2Portal(self.session, text=(ANSIString("|rHi|n"), {}))
+        self.amp_client.flush_msg_batch()
+        wire_data = self._catch_wire_read(mocktransport)
+        self.assertEqual(len(wire_data), 1)
+
+        self._connect_server(mocktransport)
+        self.amp_server.dataReceived(wire_data[0])
+        evennia.PORTAL_SESSION_HANDLER.data_out.assert_has_calls(
+            [
+                call(self.portalsession, text=("Hello", {})),
+                call(portalsession2, text=("Hello", {})),
+                call(self.portalsession, text=(ANSIString("|rHi|n"), {})),
+            ]
+        )
+
+    def test_msgserver2portal_flushed_before_admin(self, mocktransport):
+        self._connect_client(mocktransport)
+        self.amp_client.send_MsgServer2Portal(self.session, text={"foo": "bar"})
+        self.amp_client.send_AdminServer2Portal(self.session, operation=amp.SDISCONN)
+        wire_data = self._catch_wire_read(mocktransport)
+        self.assertEqual(len(wire_data), 2)
+        self.assertIn(amp.MsgServer2PortalBatch.key.encode(), wire_data[0])
+
     def test_adminserver2portal(self, mocktransport):
         self._connect_client(mocktransport)
 
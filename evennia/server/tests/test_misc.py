@@ -9,6 +9,8 @@ import unittest
 from django.test import TestCase
 from django.test.runner import DiscoverRunner
 
+from evennia.server.serversession import ServerSession
+from evennia.server.sessionhandler import ServerSessionHandler
 from evennia.server.throttle import Throttle
 from evennia.utils.test_resources import BaseEvenniaTest
 
@@ -119,3 +121,55 @@ class ThrottleTest(BaseEvenniaTest):
 
         # Make sure the cache is empty
         self.assertFalse(throttle.get())
+
+
+class TestServerSessionHandlerIndexes(BaseEvenniaTest):
+    """
+    Test the secondary session indexes of the ServerSessionHandler.
+
+    """
+
+    def _make_session(self, handler, sessid, csessid=None):
+        session = ServerSession()
+        session.init_session("websocket", ("localhost", "testmode"), handler)
+        session.sessid = sessid
+        session.csessid = csessid
+        handler[sessid] = session
+        return session
+
+    def test_indexes(self):
+        handler = ServerSessionHandler()
+        sess1 = self._make_session(handler, 1, csessid="abc")
+        sess2 = self._make_session(handler, 2, csessid="abc")
+        sess3 = self._make_session(handler, 3)
+        self.assertEqual(handler.check_indexes(), [])
+        self.assertEqual(handler.sessions_from_csessid("abc"), [sess1, sess2])
+        self.assertEqual(handler.get_sessions(), [])
+        self.assertEqual(handler.account_count(), 0)
+
+        sess1.at_login(self.account)
+        sess2.at_login(self.account)
+        sess3.at_login(self.account2)
+        self.assertEqual(handler.check_indexes(), [])
+        self.assertEqual(handler.sessions_from_account(self.account), [sess1, sess2])
+        self.assertEqual(handler.account_count(), 2)
+        self.assertEqual(set(handler.all_connected_accounts()), {self.account, self.account2})
+        self.assertEqual(handler.get_sessions(), [sess1, sess2, sess3])
+
+        sess2.logged_in = False
+        del handler[3]
+        sess3.logged_in = False  # no longer in the handler
+        self.assertEqual(handler.check_indexes(), [])
+        self.assertEqual(handler.sessions_from_account(self.account), [sess1])
+        self.assertEqual(handler.sessions_from_account(self.account2), [])
+        self.assertEqual(handler.all_connected_accounts(), [self.account])
+
+        # replacing a session
+        sess4 = self._make_session(handler, 1)
+        self.assertIs(handler.get(1), sess4)
+        self.assertEqual(handler.check_indexes(), [])
+        self.assertEqual(handler.sessions_from_csessid("abc"), [sess2])
+        self.assertEqual(handler.account_count(), 0)
+        handler.clear()
+        self.assertEqual(handler.check_indexes(), [])
+        self.assertEqual(handler.sessions_from_csessid("abc"), [])
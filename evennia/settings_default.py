@@ -132,6 +132,10 @@ EVENNIA_ADMIN = True
 AMP_HOST = "localhost"
 AMP_PORT = 4006
 AMP_INTERFACE = "127.0.0.1"
+# If set, all messages the Server sends to sessions during the same reactor
+# tick are coalesced and sent to the Portal as one batch. This greatly reduces
+# the overhead of broadcasts to many sessions.
+AMP_MSG_BATCHING = True
 
 
 # Path to the lib directory containing the bulk of the codebase's code.
@@ -171,6 +175,15 @@ CHANNEL_LOG_NUM_TAIL_LINES = 20
 # Max size (in bytes) of channel log files before they rotate.
 # Minimum is 1000 (1kB) but should usually be larger.
 CHANNEL_LOG_ROTATE_SIZE = 1000000
+# Lines logged to files (like channel logs) with `logger.log_file` are queued
+# and written in batches by a separate thread. This is the max number of lines
+# that can wait in the queue. If the queue is full, the logging code waits up
+# to LOG_FILE_QUEUE_TIMEOUT seconds for room before the line is dropped.
+LOG_FILE_QUEUE_SIZE = 10000
+LOG_FILE_QUEUE_TIMEOUT = 1.0
+# How often (in seconds) log files are flushed to disk while busy. They are also
+# flushed whenever there are no more lines to write.
+LOG_FILE_FLUSH_INTERVAL = 1.0
 # Unused by default, but used by e.g. the MapSystem contrib. A place for storing
 # semi-permanent data and avoid it being rebuilt over and over. It is created
 # on-demand only.
@@ -220,8 +233,10 @@ MXP_OUTGOING_ONLY = True
 # caching results in a massive speedup of the server (since it dramatically
 # limits the number of database accesses needed) and also allows for
 # storing temporary data on objects. It is however also the main memory
-# consumer of Evennia. With this setting the cache can be capped and
-# flushed when it reaches a certain size. Minimum is 50 MB but it is
+# consumer of Evennia. With this setting the cache can be capped; when the
+# resident memory of the Server process gets within 10% of this size, the
+# least recently used objects are evicted from the cache (a fraction at a
+# time, see IDMAPPER_CACHE_EVICT_FRACTION). Minimum is 50 MB but it is
 # not recommended to set this to less than 100 MB for a distribution
 # system.
 # Empirically, N_objects_in_cache ~ ((RMEM - 35) / 0.0157):
@@ -240,6 +255,15 @@ MXP_OUTGOING_ONLY = True
 # be necessary (use @server to see how many objects are in the idmapper
 # cache at any time). Setting this to None disables the cache cap.
 IDMAPPER_CACHE_MAXSIZE = 400  # (MB)
+# The fraction (0..1) of each database model's cached objects to evict (least
+# recently used first) every time the IDMAPPER_CACHE_MAXSIZE is approached.
+IDMAPPER_CACHE_EVICT_FRACTION = 0.25
+# Cap the number of cached objects for each database model (objects, accounts,
+# scripts etc). When the cap is exceeded, the least recently used objects are
+# evicted until the cache is down to 90% of the cap. Objects whose
+# `at_idmapper_flush` hook returns False (such as objects with non-persistent
+# `.ndb` data) are never evicted. Setting this to None disables the cap.
+IDMAPPER_CACHE_MAX_INSTANCES = None
 # This determines how many connections per second the Portal should
 # accept, as a DoS countermeasure. If the rate exceeds this number, incoming
 # connections will be queued to this rate, so none will be lost.
@@ -326,6 +350,14 @@ ATTRIBUTE_STORED_MODEL_RENAME = [
     (("players", "playerdb"), ("accounts", "accountdb")),
     (("typeclasses", "defaultplayer"), ("typeclasses", "defaultaccount")),
 ]
+# In-place changes to mutable Attributes (like `obj.db.mydict["key"]["subkey"] = 5`)
+# normally re-save the whole Attribute on every change. If this is set, all such
+# changes to the same Attribute made within one reactor tick are instead coalesced
+# into a single save at the end of the tick (when the reactor is not running, such as
+# in `evennia shell`, changes are saved right away). Regardless of this setting, the
+# `evennia.utils.dbserialize.batch_saves` context manager can be used to do the same
+# explicitly for a block of code.
+ATTRIBUTE_SAVE_COALESCE = False
 # Default type of autofield (required by Django), which defines the type of
 # primary key fields for all tables. This type is guaranteed to be at least a
 # 64-bit integer.
@@ -438,6 +470,12 @@ WEB_PLUGINS_MODULE = "server.conf.web_plugins"
 # Tuple of modules implementing lock functions. All callable functions
 # inside these modules will be available as lock functions.
 LOCK_FUNC_MODULES = ("evennia.locks.lockfuncs", "server.conf.lockfuncs")
+# If set, the results of lock checks are cached per accessing object and
+# access type. Only locks made up entirely of Evennia's default lock functions
+# depending on permissions, tags and ids (like `perm()`, `tag()` and `id()`)
+# are cached, and the cache is invalidated whenever a permission, tag or lock
+# changes anywhere. Custom lock functions are never cached.
+LOCK_RESULT_CACHE = False
 # Module holding handlers for managing incoming data from the client. These
 # will be loaded in order, meaning functions in later modules may overload
 # previous ones if having the same name.
@@ -509,6 +547,11 @@ CMDSET_FALLBACKS = {
     CMDSET_SESSION: "evennia.commands.default.cmdset_session.SessionCmdSet",
     CMDSET_UNLOGGEDIN: "evennia.commands.default.cmdset_unloggedin.UnloggedinCmdSet",
 }
+# Max number of merged cmdsets to keep in the cmdhandler's merge-cache. Merging
+# cmdsets is done for every command, so re-using an earlier merger is a big save.
+# The oldest-used mergers are dropped when going over this limit. Set to 0 to
+# disable caching.
+CMDSET_MERGE_CACHE_SIZE = 1000
 # Parent class for all default commands. Changing this class will
 # modify all default commands, so do so carefully.
 COMMAND_DEFAULT_CLASS = "evennia.commands.default.muxcommand.MuxCommand"
@@ -681,6 +724,15 @@ HELP_CLICKABLE_TOPICS = True
 # so we need to make sure to tell Lunr to not filter them out by adding them here
 # (many are auto-added out of the box, this extends the list).
 LUNR_STOP_WORD_FILTER_EXCEPTIONS = []
+# Building the Lunr search index over all help entries is slow, so help caches
+# the indexes it builds, one for every set of help entries searched (so all
+# callers seeing the same entries share one index). An index is only rebuilt
+# when the entries it covers change. This is how many indexes to keep.
+HELP_SEARCH_INDEX_CACHE_SIZE = 20
+# If set, the help search indexes are also stored in this directory, so they
+# don't have to be rebuilt after a server reload or restart. Set to e.g.
+# os.path.join(CACHE_DIR, "help_index") to activate.
+HELP_SEARCH_INDEX_CACHE_DIR = None
 
 ######################################################################
 # FuncParser
@@ -727,6 +779,21 @@ GLOBAL_SCRIPTS = {
     # 'key': {'typeclass': 'typeclass.path.here',
     #         'repeats': -1, 'interval': 50, 'desc': 'Example script'},
 }
+# The TickerHandler calls all subscriptions with the same interval together.
+# With very many subscriptions this can cause a lag spike every tick. Setting
+# TICKER_SHARDS > 1 spreads the subscriptions of each interval over that many
+# sub-tickers, each firing at a different offset within the interval.
+TICKER_SHARDS = 1
+# If set, a ticker gives control back to the server after this many callbacks,
+# to let it handle other things (like player commands) in the middle of a
+# large tick. 0 means to never yield.
+TICKER_YIELD_EVERY = 0
+# If set, the MonitorHandler merges all changes to the same monitored field or
+# Attribute made during one server tick into a single monitor callback, called
+# right after that tick. This spares for example OOB clients monitoring a
+# value that changes many times in a row. If unset, the callbacks are called
+# directly as the field saves.
+MONITOR_COALESCE_UPDATES = False
 
 ######################################################################
 # Default Account setup and access
@@ -16,10 +16,16 @@ from copy import copy
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Q
 from django.utils.encoding import smart_str
 
 from evennia.locks.lockhandler import LockHandler
-from evennia.utils.dbserialize import from_pickle, to_pickle
+from evennia.utils.dbserialize import (
+    discard_pending_save,
+    from_pickle,
+    get_pending_value,
+    to_pickle,
+)
 from evennia.utils.idmapper.models import SharedMemoryModel
 from evennia.utils.picklefield import PickledObjectField
 from evennia.utils.utils import is_iter, lazy_property, make_iter, to_str
@@ -446,6 +452,10 @@ class Attribute(IAttribute, SharedMemoryModel):
         as storing a dbobj which is then deleted elsewhere) out-of-sync.
         The overhead of unpickling seems hard to avoid.
         """
+        pending = get_pending_value(self)
+        if pending is not None:
+            # modified in-place but not yet saved
+            return pending
         return from_pickle(self.db_value, db_obj=self)
 
     @value.setter
@@ -454,6 +464,7 @@ class Attribute(IAttribute, SharedMemoryModel):
         Setter. Allows for self.value = value. We cannot cache here,
         see self.__value_get.
         """
+        discard_pending_save(self)
         self.db_value = to_pickle(new_value)
         self.save(update_fields=["db_value"])
 
@@ -537,6 +548,67 @@ class IAttributeBackend:
         }
         self._cache_complete = True
 
+    def _is_cached(self, keys=None, categories=None):
+        """
+        Check if the cache already holds what `_prime_cache` would fill in.
+
+        Args:
+            keys (list, optional): Cleaned keys to check.
+            categories (list, optional): Cleaned categories to check.
+
+        Returns:
+            bool: If no database lookup is needed for these keys/categories.
+
+        """
+        if self._cache_complete:
+            return True
+        if keys is not None:
+            return all(
+                f"{key}-{category}" in self._cache
+                for key in keys
+                for category in categories or (None,)
+            )
+        if categories is not None:
+            return all(f"-{category}" in self._catcache for category in categories)
+        return False
+
+    def _prime_cache(self, attrs, keys=None, categories=None):
+        """
+        Fill the cache with Attributes bulk-loaded from the outside, such as
+        by `prefetch_attributes`.
+
+        Args:
+            attrs (list): All Attributes on this object matching `keys` and
+                `categories`.
+            keys (list, optional): Cleaned keys that were loaded. If given
+                without `categories`, the keys are for the `None` category.
+            categories (list, optional): Cleaned categories that were loaded.
+
+        Notes:
+            If neither `keys` nor `categories` are given, `attrs` must be all
+            Attributes on this object and the cache is marked as complete.
+            Requested keys not among `attrs` are cached as non-existing.
+
+        """
+        if not _TYPECLASS_AGGRESSIVE_CACHE:
+            return
+        cache = {
+            f"{to_str(attr.key).lower()}-{attr.category.lower() if attr.category else None}": attr
+            for attr in attrs
+        }
+        if keys is None and categories is None:
+            self._cache = cache
+            self._cache_complete = True
+            return
+        if keys is not None:
+            for key in keys:
+                for category in categories or (None,):
+                    cache.setdefault(f"{key}-{category}", None)
+        else:
+            for category in categories:
+                self._catcache[f"-{category}"] = True
+        self._cache.update(cache)
+
     def _get_cache_key(self, key, category):
         """
         Fetch cache key.
@@ -554,7 +626,9 @@ class IAttributeBackend:
             attr = _TYPECLASS_AGGRESSIVE_CACHE and self._cache[cachekey]
             cachefound = True
         except KeyError:
+            # a complete cache knows that this Attribute does not exist
             attr = None
+            cachefound = self._cache_complete
 
         if attr and (not hasattr(attr, "pk") and attr.pk is None):
             # clear out Attributes deleted from elsewhere. We must search this anew.
@@ -592,7 +666,7 @@ class IAttributeBackend:
             attrs (list): The discovered Attributes.
         """
         catkey = "-%s" % category
-        if _TYPECLASS_AGGRESSIVE_CACHE and catkey in self._catcache:
+        if _TYPECLASS_AGGRESSIVE_CACHE and (self._cache_complete or catkey in self._catcache):
             return [attr for key, attr in self._cache.items() if key.endswith(catkey) and attr]
         else:
             # we have to query to make this category up-date in the cache
@@ -1116,6 +1190,87 @@ class ModelAttributeBackend(IAttributeBackend):
             pass
 
 
+# the handler on the typeclassed entity managing each type of Attribute
+_ATTRIBUTE_HANDLERS = {None: "attributes", "nick": "nicks"}
+
+
+def prefetch_attributes(objs, keys=None, categories=None, attrtype=None):
+    """
+    Bulk-load the Attributes of many typeclassed entities, filling the cache of
+    each entity's Attribute handler with one database query per model, rather
+    than one or more queries per entity. This makes things like reading
+    `obj.db.desc` off every object in a listing constant-query work.
+
+    Args:
+        objs (iterable): Typeclassed entities, such as a queryset or the
+            `contents` of a location.
+        keys (str or list, optional): Only load Attributes with these keys.
+            Unless `categories` is also given, these are looked for in the
+            default `None` category. Keys not found are cached as missing, so
+            looking them up later won't hit the database either.
+        categories (str or list, optional): Only load Attributes in these
+            categories. Use `[None]` for the default category.
+        attrtype (str, optional): The type of Attribute to load; `None` for
+            normal Attributes, "nick" for Nicks.
+
+    Returns:
+        list: The entities in `objs`.
+
+    Notes:
+        If neither `keys` nor `categories` are given, all Attributes are
+        loaded and each handler's cache is marked as complete. Entities
+        whose cache already holds what was asked for are skipped, so this
+        is cheap to repeat. This does nothing if
+        `settings.TYPECLASS_AGGRESSIVE_CACHE` is `False`.
+
+    """
+    objs = list(objs)
+    if not _TYPECLASS_AGGRESSIVE_CACHE:
+        return objs
+    handlername = _ATTRIBUTE_HANDLERS[attrtype]
+    if keys is not None:
+        keys = [key.strip().lower() for key in make_iter(keys)]
+    if categories is not None:
+        categories = [
+            category.strip().lower() if category is not None else None
+            for category in make_iter(categories)
+        ]
+
+    objs_by_model = defaultdict(dict)
+    for obj in objs:
+        if obj.pk and not getattr(obj, handlername).backend._is_cached(keys, categories):
+            objs_by_model[obj.__dbclass__][obj.id] = obj
+
+    for dbclass, objmap in objs_by_model.items():
+        model = dbclass.__name__.lower()
+        # the model and attrtype are checked below rather than in the query; filtering on
+        # the Attributes first makes SQLite look through every Attribute in the database
+        query = Q(**{"%s__id__in" % model: list(objmap)})
+        if keys is not None:
+            keyquery = Q(pk__in=[])
+            for key in keys:
+                keyquery |= Q(attribute__db_key__iexact=key)
+            query &= keyquery
+        if categories is not None:
+            catquery = Q(pk__in=[])
+            for category in categories:
+                catquery |= Q(attribute__db_category__iexact=category)
+            query &= catquery
+
+        attrs_by_obj = defaultdict(list)
+        for conn in dbclass.db_attributes.through.objects.filter(query).select_related(
+            "attribute"
+        ):
+            attr = conn.attribute
+            if attr.db_attrtype == attrtype and (attr.db_model or "").lower() == model:
+                attrs_by_obj[getattr(conn, "%s_id" % model)].append(attr)
+        for objid, obj in objmap.items():
+            getattr(obj, handlername).backend._prime_cache(
+                attrs_by_obj[objid], keys=keys, categories=categories
+            )
+    return objs
+
+
 class AttributeHandler:
     """
     Handler for adding Attributes to the object.
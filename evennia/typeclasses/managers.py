@@ -9,17 +9,99 @@ import shlex
 
 from django.db.models import Count, ExpressionWrapper, F, FloatField, Q
 from django.db.models.functions import Cast
+from django.db.models.query import ModelIterable, QuerySet
 
-from evennia.typeclasses.attributes import Attribute
-from evennia.typeclasses.tags import Tag
+from evennia.typeclasses.attributes import Attribute, prefetch_attributes
+from evennia.typeclasses.tags import Tag, prefetch_tags
 from evennia.utils import idmapper
 from evennia.utils.utils import class_from_module, make_iter, variable_from_module
 
-__all__ = ("TypedObjectManager",)
+__all__ = ("TypedObjectManager", "TypedObjectQuerySet")
 _GA = object.__getattribute__
 _Tag = None
 
 
+# QuerySets
+
+
+class TypedObjectQuerySet(QuerySet):
+    """
+    QuerySet for all dbobjects. This adds bulk-loading of Attributes and Tags
+    into the handler caches of the returned entities, in the same way as
+    Django's `prefetch_related` works for relations.
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._attribute_prefetches = []
+        self._tag_prefetches = []
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._attribute_prefetches = self._attribute_prefetches[:]
+        clone._tag_prefetches = self._tag_prefetches[:]
+        return clone
+
+    def _fetch_all(self):
+        fetched = self._result_cache is not None
+        super()._fetch_all()
+        if not fetched and self._iterable_class is ModelIterable:
+            for kwargs in self._attribute_prefetches:
+                prefetch_attributes(self._result_cache, **kwargs)
+            for kwargs in self._tag_prefetches:
+                prefetch_tags(self._result_cache, **kwargs)
+
+    def prefetch_attributes(self, keys=None, categories=None, attrtype=None):
+        """
+        Bulk-load Attributes into the cache of each entity when this queryset
+        is evaluated, using one query for all of them.
+
+        Args:
+            keys (str or list, optional): Only load Attributes with these keys.
+            categories (str or list, optional): Only load Attributes in these
+                categories.
+            attrtype (str, optional): "nick" to load Nicks instead.
+
+        Returns:
+            queryset (TypedObjectQuerySet): A new, lazy queryset.
+
+        Notes:
+            See `evennia.typeclasses.attributes.prefetch_attributes`. This has
+            no effect on `.iterator()`, which does not cache results.
+
+        """
+        clone = self._chain()
+        clone._attribute_prefetches.append(
+            {"keys": keys, "categories": categories, "attrtype": attrtype}
+        )
+        return clone
+
+    def prefetch_tags(self, keys=None, categories=None, tagtype=None):
+        """
+        Bulk-load Tags into the cache of each entity when this queryset
+        is evaluated, using one query for all of them.
+
+        Args:
+            keys (str or list, optional): Only load Tags with these keys.
+            categories (str or list, optional): Only load Tags in these
+                categories.
+            tagtype (str, optional): "alias" or "permission" to load Aliases or
+                Permissions instead.
+
+        Returns:
+            queryset (TypedObjectQuerySet): A new, lazy queryset.
+
+        Notes:
+            See `evennia.typeclasses.tags.prefetch_tags`. This has no effect on
+            `.iterator()`, which does not cache results.
+
+        """
+        clone = self._chain()
+        clone._tag_prefetches.append({"keys": keys, "categories": categories, "tagtype": tagtype})
+        return clone
+
+
 # Managers
 
 
@@ -29,6 +111,31 @@ class TypedObjectManager(idmapper.manager.SharedMemoryManager):
 
     """
 
+    def get_queryset(self):
+        """
+        Use a queryset supporting Attribute/Tag prefetching.
+
+        """
+        return TypedObjectQuerySet(self.model, using=self._db, hints=self._hints)
+
+    def prefetch_attributes(self, keys=None, categories=None, attrtype=None):
+        """
+        Get all entities, bulk-loading their Attributes. See
+        `TypedObjectQuerySet.prefetch_attributes`.
+
+        """
+        return self.all().prefetch_attributes(
+            keys=keys, categories=categories, attrtype=attrtype
+        )
+
+    def prefetch_tags(self, keys=None, categories=None, tagtype=None):
+        """
+        Get all entities, bulk-loading their Tags. See
+        `TypedObjectQuerySet.prefetch_tags`.
+
+        """
+        return self.all().prefetch_tags(keys=keys, categories=categories, tagtype=tagtype)
+
     # common methods for all typed managers. These are used
     # in other methods. Returns querysets.
 
@@ -14,8 +14,10 @@ from collections import defaultdict
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Q
 
 from evennia.locks.lockfuncs import perm as perm_lockfunc
+from evennia.locks.lockhandler import invalidate_lock_cache
 from evennia.utils.utils import make_iter, to_str
 
 _TYPECLASS_AGGRESSIVE_CACHE = settings.TYPECLASS_AGGRESSIVE_CACHE
@@ -350,6 +352,67 @@ class TagHandler(object):
         )
         self._cache_complete = True
 
+    def _is_cached(self, keys=None, categories=None):
+        """
+        Check if the cache already holds what `_prime_cache` would fill in.
+
+        Args:
+            keys (list, optional): Cleaned keys to check.
+            categories (list, optional): Cleaned categories to check.
+
+        Returns:
+            bool: If no database lookup is needed for these keys/categories.
+
+        """
+        if self._cache_complete:
+            return True
+        if keys is not None:
+            return all(
+                "%s-%s" % (key, category) in self._cache
+                for key in keys
+                for category in categories or (None,)
+            )
+        if categories is not None:
+            return all("-%s" % category in self._catcache for category in categories)
+        return False
+
+    def _prime_cache(self, tags, keys=None, categories=None):
+        """
+        Fill the cache with Tags bulk-loaded from the outside, such as by
+        `prefetch_tags`.
+
+        Args:
+            tags (list): All Tags on this object matching `keys` and `categories`.
+            keys (list, optional): Cleaned keys that were loaded. If given
+                without `categories`, the keys are for the `None` category.
+            categories (list, optional): Cleaned categories that were loaded.
+
+        Notes:
+            If neither `keys` nor `categories` are given, `tags` must be all
+            Tags on this object and the cache is marked as complete. Requested
+            keys not among `tags` are cached as non-existing.
+
+        """
+        if not _TYPECLASS_AGGRESSIVE_CACHE:
+            return
+        cache = {
+            "%s-%s"
+            % (to_str(tag.db_key).lower(), tag.db_category.lower() if tag.db_category else None): tag
+            for tag in tags
+        }
+        if keys is None and categories is None:
+            self._cache = cache
+            self._cache_complete = True
+        else:
+            if keys is not None:
+                for key in keys:
+                    for category in categories or (None,):
+                        cache.setdefault("%s-%s" % (key, category), None)
+            else:
+                for category in categories:
+                    self._catcache["-%s" % category] = True
+            self._cache.update(cache)
+
     def _getcache(self, key=None, category=None):
         """
         Retrieve from cache or database (always caches)
@@ -384,6 +447,8 @@ class TagHandler(object):
                 del self._cache[cachekey]
             if tag:
                 return [tag]  # return cached entity
+            elif _TYPECLASS_AGGRESSIVE_CACHE and (self._cache_complete or cachekey in self._cache):
+                return []  # known to not exist on this object
             else:
                 query = {
                     "%s__id" % self._model: self._objid,
@@ -403,8 +468,8 @@ class TagHandler(object):
             # assume the cache to be complete unless we have queried
             # for this category before
             catkey = "-%s" % category
-            if _TYPECLASS_AGGRESSIVE_CACHE and catkey in self._catcache:
-                return [tag for key, tag in self._cache.items() if key.endswith(catkey)]
+            if _TYPECLASS_AGGRESSIVE_CACHE and (self._cache_complete or catkey in self._catcache):
+                return [tag for key, tag in self._cache.items() if key.endswith(catkey) and tag]
             else:
                 # we have to query to make this category up-date in the cache
                 query = {
@@ -475,6 +540,7 @@ class TagHandler(object):
         # mark that the category cache is no longer up-to-date
         self._catcache.pop(catkey, None)
         self._cache_complete = False
+        invalidate_lock_cache()
 
     def reset_cache(self):
         """
@@ -484,6 +550,7 @@ class TagHandler(object):
         self._cache_complete = False
         self._cache = {}
         self._catcache = {}
+        invalidate_lock_cache()
 
     def add(self, key=None, category=None, data=None):
         """
@@ -521,6 +588,8 @@ class TagHandler(object):
             )
             getattr(self.obj, self._m2m_fieldname).add(tagobj)
             self._setcache(tagstr, category, tagobj)
+        # permissions and tags may affect lock results
+        invalidate_lock_cache()
 
     def has(self, key=None, category=None, return_list=False):
         """
@@ -668,6 +737,7 @@ class TagHandler(object):
         self._cache = {}
         self._catcache = {}
         self._cache_complete = False
+        invalidate_lock_cache()
 
     def all(self, return_key_and_category=False, return_objs=False):
         """
@@ -687,7 +757,7 @@ class TagHandler(object):
         if _TYPECLASS_AGGRESSIVE_CACHE:
             if not self._cache_complete:
                 self._fullcache()
-            tags = sorted(self._cache.values())
+            tags = sorted(tag for tag in self._cache.values() if tag)
         else:
             tags = sorted(self._query_all())
 
@@ -755,6 +825,85 @@ class TagHandler(object):
         return ",".join(self.all())
 
 
+# the handler on the typeclassed entity managing each type of Tag
+_TAG_HANDLERS = {None: "tags", "alias": "aliases", "permission": "permissions"}
+
+
+def prefetch_tags(objs, keys=None, categories=None, tagtype=None):
+    """
+    Bulk-load the Tags of many typeclassed entities, filling the cache of
+    each entity's Tag handler with one database query per model, rather than
+    one or more queries per entity.
+
+    Args:
+        objs (iterable): Typeclassed entities, such as a queryset or the
+            `contents` of a location.
+        keys (str or list, optional): Only load Tags with these keys. Unless
+            `categories` is also given, these are looked for in the default
+            `None` category. Keys not found are cached as missing, so looking
+            them up later won't hit the database either.
+        categories (str or list, optional): Only load Tags in these categories.
+            Use `[None]` for the default category.
+        tagtype (str, optional): The type of Tag to load; `None` for normal
+            Tags, "alias" for Aliases or "permission" for Permissions.
+
+    Returns:
+        list: The entities in `objs`.
+
+    Notes:
+        If neither `keys` nor `categories` are given, all Tags are loaded and
+        each handler's cache is marked as complete. Entities whose cache
+        already holds what was asked for are skipped, so this is cheap to
+        repeat. This does nothing if `settings.TYPECLASS_AGGRESSIVE_CACHE`
+        is `False`.
+
+    """
+    objs = list(objs)
+    if not _TYPECLASS_AGGRESSIVE_CACHE:
+        return objs
+    handlername = _TAG_HANDLERS[tagtype]
+    if keys is not None:
+        keys = [str(key).strip().lower() for key in make_iter(keys)]
+    if categories is not None:
+        categories = [
+            category.strip().lower() if category else None for category in make_iter(categories)
+        ]
+
+    objs_by_model = defaultdict(dict)
+    for obj in objs:
+        if obj.pk and not getattr(obj, handlername)._is_cached(keys, categories):
+            objs_by_model[obj.__dbclass__][obj.id] = obj
+
+    for dbclass, objmap in objs_by_model.items():
+        model = dbclass.__name__.lower()
+        query = Q(
+            **{
+                "%s__id__in" % model: list(objmap),
+                "tag__db_model": model,
+                "tag__db_tagtype": tagtype,
+            }
+        )
+        if keys is not None:
+            keyquery = Q(pk__in=[])
+            for key in keys:
+                keyquery |= Q(tag__db_key__iexact=key)
+            query &= keyquery
+        if categories is not None:
+            catquery = Q(pk__in=[])
+            for category in categories:
+                catquery |= Q(tag__db_category__iexact=category)
+            query &= catquery
+
+        tags_by_obj = defaultdict(list)
+        for conn in dbclass.db_tags.through.objects.filter(query).select_related("tag"):
+            tags_by_obj[getattr(conn, "%s_id" % model)].append(conn.tag)
+        for objid, obj in objmap.items():
+            getattr(obj, handlername)._prime_cache(
+                tags_by_obj[objid], keys=keys, categories=categories
+            )
+    return objs
+
+
 class AliasProperty(TagProperty):
     """
     Allows for setting aliases like Django fields:
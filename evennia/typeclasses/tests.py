@@ -8,6 +8,8 @@ from mock import patch
 from parameterized import parameterized
 
 from evennia.objects.objects import DefaultObject
+from evennia.typeclasses.attributes import prefetch_attributes
+from evennia.typeclasses.tags import prefetch_tags
 from evennia.utils.test_resources import BaseEvenniaTest, EvenniaTestCase
 
 # ------------------------------------------------------------
@@ -345,6 +347,105 @@ class TestTags(BaseEvenniaTest):
         )
 
 
+class TestPrefetch(BaseEvenniaTest):
+    """
+    Test bulk-loading of Attributes and Tags into the handler caches.
+
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.obj1.db.desc = "A ball."
+        self.obj1.attributes.add("weight", 2, category="stats")
+        self.obj2.db.desc = "A box."
+        self.obj1.tags.add("round")
+        self.obj2.tags.add("heavy", category="weight")
+        self.obj2.aliases.add("crate")
+        self.objs = [self.obj1, self.obj2]
+        self._reset_caches()
+
+    def _reset_caches(self):
+        for obj in self.objs:
+            obj.attributes.reset_cache()
+            obj.tags.reset_cache()
+            obj.aliases.reset_cache()
+
+    def test_prefetch_all_attributes(self):
+        with self.assertNumQueries(1):
+            prefetch_attributes(self.objs)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.obj1.db.desc, "A ball.")
+            self.assertEqual(self.obj2.db.desc, "A box.")
+            self.assertEqual(self.obj1.attributes.get("weight", category="stats"), 2)
+            self.assertIsNone(self.obj2.db.weight)
+            self.assertEqual(len(self.obj1.attributes.all()), 2)
+            # repeating is free, since the caches are complete
+            prefetch_attributes(self.objs)
+
+    def test_prefetch_attribute_keys(self):
+        with self.assertNumQueries(1) as queries:
+            prefetch_attributes(self.objs, keys=["desc", "missing"])
+        # only the asked-for Attributes are loaded
+        self.assertIn("db_key", queries.captured_queries[0]["sql"])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.obj1.db.desc, "A ball.")
+            self.assertIsNone(self.obj2.db.missing)
+            prefetch_attributes(self.objs, keys="desc")
+        # not prefetched, but still found
+        self.assertEqual(self.obj1.attributes.get("weight", category="stats"), 2)
+
+    def test_prefetch_attribute_categories(self):
+        with self.assertNumQueries(1):
+            prefetch_attributes(self.objs, categories="stats")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.obj1.attributes.get(category="stats", return_list=True), [2])
+            self.assertEqual(self.obj2.attributes.get(category="stats", return_list=True), [])
+
+    def test_prefetch_tags(self):
+        with self.assertNumQueries(1):
+            prefetch_tags(self.objs)
+        with self.assertNumQueries(0):
+            self.assertTrue(self.obj1.tags.has("round"))
+            self.assertFalse(self.obj1.tags.has("heavy", category="weight"))
+            self.assertTrue(self.obj2.tags.has("heavy", category="weight"))
+            self.assertEqual(self.obj2.tags.get(category="weight"), "heavy")
+            self.assertEqual(self.obj1.tags.all(), ["round"])
+        with self.assertNumQueries(1):
+            prefetch_tags(self.objs, tagtype="alias")
+        with self.assertNumQueries(0):
+            self.assertIn("crate", self.obj2.aliases.all())
+            self.assertNotIn("crate", self.obj1.aliases.all())
+
+    def test_prefetch_tag_keys(self):
+        with self.assertNumQueries(1):
+            prefetch_tags(self.objs, keys=["round", "square"])
+        with self.assertNumQueries(0):
+            self.assertTrue(self.obj1.tags.has("round"))
+            self.assertFalse(self.obj1.tags.has("square"))
+            self.assertFalse(self.obj2.tags.has("round"))
+        self.assertEqual(self.obj1.tags.all(), ["round"])
+        # adding a tag on a primed handler still works
+        self.obj2.tags.add("square")
+        self.assertTrue(self.obj2.tags.has("square"))
+        self.assertEqual(self.obj2.tags.all(), ["heavy", "square"])
+
+    def test_queryset_prefetch(self):
+        queryset = (
+            self.obj1.__dbclass__.objects.filter(id__in=[self.obj1.id, self.obj2.id])
+            .prefetch_attributes(keys="desc")
+            .prefetch_tags()
+        )
+        with self.assertNumQueries(3):
+            objs = list(queryset)
+        self.assertEqual(set(objs), set(self.objs))
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                sorted(obj.db.desc for obj in objs),
+                ["A ball.", "A box."],
+            )
+            self.assertEqual(sorted(obj.tags.all() for obj in objs), [["heavy"], ["round"]])
+
+
 class TestNickHandler(BaseEvenniaTest):
     """
     Test the nick handler replacement.
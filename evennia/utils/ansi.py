@@ -64,6 +64,8 @@ Xterm256 greyscale:
 
 import functools
 import re
+from array import array
+from bisect import bisect_left
 from collections import OrderedDict
 
 from django.conf import settings
@@ -126,8 +128,11 @@ ANSI_SPACE = " "
 # Escapes
 ANSI_ESCAPES = ("{{", r"\\", r"\|\|")
 
+# raw string: (tokens, {client profile: rendered string})
 _PARSE_CACHE = OrderedDict()
 _PARSE_CACHE_SIZE = 10000
+# (parser class, token, xterm256, truecolor): rendered color token
+_TOKEN_RENDER_CACHE = {}
 
 _COLOR_NO_DEFAULT = settings.COLOR_NO_DEFAULT
 
@@ -265,6 +270,30 @@ class ANSIParser(object):
     # instance of each
     ansi_escapes = re.compile(r"(%s)" % "|".join(ANSI_ESCAPES), re.DOTALL)
 
+    # single-pass tokenizer. The order of the alternatives matches the order
+    # in which the markup was historically substituted.
+    token_sub = re.compile(
+        r"|".join(
+            f"(?P<{kind}>{pattern})"
+            for kind, pattern in (
+                ("escape", r"|".join(ANSI_ESCAPES)),
+                ("hex", hex_sub.pattern),
+                ("fg", r"|".join(xterm256_fg)),
+                ("bg", r"|".join(xterm256_bg)),
+                ("gfg", r"|".join(xterm256_gfg)),
+                ("gbg", r"|".join(xterm256_gbg)),
+                ("ansi", r"|".join([re.escape(tup[0]) for tup in ansi_map])),
+            )
+        ),
+        re.DOTALL,
+    )
+    xterm256_subs = {
+        "fg": xterm256_fg_sub,
+        "bg": xterm256_bg_sub,
+        "gfg": xterm256_gfg_sub,
+        "gbg": xterm256_gbg_sub,
+    }
+
     # tabs/linebreaks |/ and |- should be able to be cleaned
     unsafe_tokens = re.compile(r"\|\/|\|-", re.DOTALL)
 
@@ -446,6 +475,129 @@ class ANSIParser(object):
         """
         return self.unsafe_tokens.sub("", string)
 
+    def tokenize(self, string):
+        """
+        Parse a string of markup into a stream of tokens in a single pass. The
+        tokens can then be rendered for any client with `render_tokens`.
+
+        Args:
+            string (str): The string to parse.
+
+        Returns:
+            tokens (tuple): A tuple of `(kind, text)`, where `kind` is `None`
+                for plain text and otherwise one of "hex", "fg", "bg", "gfg",
+                "gbg" or "ansi", with `text` being the markup itself.
+
+        """
+        # pre-convert bright colors to xterm256 color tags
+        string = self.brightbg_sub.sub(self.sub_brightbg, to_str(string))
+        tokens = []
+        index = 0
+        for match in self.token_sub.finditer(string):
+            start = match.start()
+            if start > index:
+                tokens.append((None, string[index:start]))
+            if match.lastgroup == "escape":
+                tokens.append((None, match.group()[0]))
+            else:
+                tokens.append((match.lastgroup, match.group()))
+            index = match.end()
+        if index < len(string):
+            tokens.append((None, string[index:]))
+        return tuple(tokens)
+
+    def render_tokens(self, tokens, xterm256=False, truecolor=False):
+        """
+        Render a token stream from `tokenize` for a given set of client capabilities.
+
+        Args:
+            tokens (tuple): The tokens to render.
+            xterm256 (bool, optional): If the client supports xterm256 or if
+                these colors should be converted to 16-color ANSI.
+            truecolor (bool, optional): If the client supports truecolor or
+                if these colors should be converted to xterm256 (or ANSI).
+
+        Returns:
+            string (str): The rendered string, with ANSI sequences.
+
+        """
+        parts = []
+        for token in tokens:
+            kind, text = token
+            if kind is None:
+                parts.append(text)
+            elif kind == "ansi":
+                parts.append(self.ansi_map_dict.get(text, ""))
+            else:
+                cachekey = (self.__class__, token, xterm256, truecolor)
+                try:
+                    parts.append(_TOKEN_RENDER_CACHE[cachekey])
+                    continue
+                except KeyError:
+                    pass
+                if kind == "hex":
+                    match = hex_sub.match(text)
+                    if truecolor:
+                        rendered = hex2truecolor.sub_truecolor(match, True)
+                    else:
+                        # fallback is given as xterm256 markup
+                        fallback = self.tokenize(hex2truecolor.sub_truecolor(match, False))
+                        rendered = self.render_tokens(fallback, xterm256=xterm256)
+                else:
+                    match = self.xterm256_subs[kind].match(text)
+                    rendered = self.sub_xterm256(match, xterm256, kind) or ""
+                if len(_TOKEN_RENDER_CACHE) >= _PARSE_CACHE_SIZE:
+                    _TOKEN_RENDER_CACHE.clear()
+                _TOKEN_RENDER_CACHE[cachekey] = rendered
+                parts.append(rendered)
+        return "".join(parts)
+
+    def _get_parsed(self, string):
+        """
+        Get the cache entry for a string, tokenizing it if needed.
+
+        Args:
+            string (str): The string to parse.
+
+        Returns:
+            entry (tuple): A tuple `(tokens, renders)`, where `renders` is a dict
+                caching the string as rendered for each client profile.
+
+        """
+        entry = _PARSE_CACHE.get(string)
+        if entry is None:
+            entry = _PARSE_CACHE[string] = (self.tokenize(string), {})
+            if len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+                _PARSE_CACHE.popitem(last=False)
+        else:
+            _PARSE_CACHE.move_to_end(string)
+        return entry
+
+    def cached_render(self, string, profile, render_func):
+        """
+        Cache any rendering of a string alongside its parsed tokens, such as the
+        HTML rendering done by `text2html`.
+
+        Args:
+            string (str): The string to render.
+            profile (hashable): Uniquely identifies the rendering.
+            render_func (callable): Called as `render_func(string)` to do the
+                rendering if it's not already cached.
+
+        Returns:
+            string (str): The rendered string.
+
+        """
+        if hasattr(string, "_raw_string"):
+            # ANSIStrings hash as their clean string, so can't be cached
+            return render_func(string)
+        renders = self._get_parsed(string)[1]
+        try:
+            return renders[profile]
+        except KeyError:
+            rendered = renders[profile] = render_func(string)
+            return rendered
+
     def parse_ansi(self, string, strip_ansi=False, xterm256=False, mxp=False, truecolor=False):
         """
         Parses a string, subbing color codes according to the stored
@@ -457,10 +609,17 @@ class ANSIParser(object):
             xterm256 (boolean, optional): If actually using xterm256 or if
                 these values should be converted to 16-color ANSI.
             mxp (boolean, optional): Parse MXP commands in string.
+            truecolor (boolean, optional): If using truecolor or if these
+                values should be converted to xterm256 (or ANSI).
 
         Returns:
             string (str): The parsed string.
 
+        Notes:
+            The string is only tokenized once; the result is cached and
+            rendered (and cached) separately for every combination of
+            options asked for.
+
         """
         if hasattr(string, "_raw_string"):
             if strip_ansi:
@@ -471,59 +630,22 @@ class ANSIParser(object):
         if not string:
             return ""
 
-        # check cached parsings
-        global _PARSE_CACHE
-        cachekey = f"{string}-{strip_ansi}-{xterm256}-{mxp}-{truecolor}"
-
-        if cachekey in _PARSE_CACHE:
-            return _PARSE_CACHE[cachekey]
-
-        # pre-convert bright colors to xterm256 color tags
-        string = self.brightbg_sub.sub(self.sub_brightbg, string)
-
-        def do_truecolor(part: re.Match, truecolor=truecolor):
-            return hex2truecolor.sub_truecolor(part, truecolor)
-
-        def do_xterm256_fg(part):
-            return self.sub_xterm256(part, xterm256, "fg")
-
-        def do_xterm256_bg(part):
-            return self.sub_xterm256(part, xterm256, "bg")
-
-        def do_xterm256_gfg(part):
-            return self.sub_xterm256(part, xterm256, "gfg")
-
-        def do_xterm256_gbg(part):
-            return self.sub_xterm256(part, xterm256, "gbg")
-
-        in_string = utils.to_str(string)
-
-        # do string replacement
-        parsed_string = []
-        parts = self.ansi_escapes.split(in_string) + [" "]
-        for part, sep in zip(parts[::2], parts[1::2]):
-            pstring = hex_sub.sub(do_truecolor, part)
-            pstring = self.xterm256_fg_sub.sub(do_xterm256_fg, pstring)
-            pstring = self.xterm256_bg_sub.sub(do_xterm256_bg, pstring)
-            pstring = self.xterm256_gfg_sub.sub(do_xterm256_gfg, pstring)
-            pstring = self.xterm256_gbg_sub.sub(do_xterm256_gbg, pstring)
-            pstring = self.ansi_sub.sub(self.sub_ansi, pstring)
-            parsed_string.append("%s%s" % (pstring, sep[0].strip()))
-        parsed_string = "".join(parsed_string)
+        tokens, renders = self._get_parsed(string)
+        profile = (strip_ansi, xterm256, mxp, truecolor)
+        try:
+            return renders[profile]
+        except KeyError:
+            pass
 
+        parsed_string = self.render_tokens(tokens, xterm256=xterm256, truecolor=truecolor)
         if not mxp:
             parsed_string = self.strip_mxp(parsed_string)
-
         if strip_ansi:
             # remove all ansi codes (including those manually
             # inserted in string)
-            return self.strip_raw_codes(parsed_string)
-
-        # cache and crop old cache
-        _PARSE_CACHE[cachekey] = parsed_string
-        if len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
-            _PARSE_CACHE.popitem(last=False)
+            parsed_string = self.strip_raw_codes(parsed_string)
 
+        renders[profile] = parsed_string
         return parsed_string
 
 
@@ -703,14 +825,11 @@ def _transform(func_name):
 
     def wrapped(self, *args, **kwargs):
         replacement_string = _query_super(func_name)(self, *args, **kwargs)
-        to_string = []
-        char_counter = 0
-        for index in range(0, len(self._raw_string)):
-            if index in self._code_indexes:
-                to_string.append(self._raw_string[index])
-            elif index in self._char_indexes:
-                to_string.append(replacement_string[char_counter])
-                char_counter += 1
+        if self._is_plain():
+            return ANSIString(replacement_string, clean_string=replacement_string)
+        to_string = list(self._raw_string)
+        for index, char in zip(self._char_indexes, replacement_string):
+            to_string[index] = char
         return ANSIString(
             "".join(to_string),
             decoded=True,
@@ -799,7 +918,8 @@ class ANSIString(str, metaclass=ANSIMeta):
 
         Internally, ANSIString can also passes itself precached code/character
         indexes and clean strings to avoid doing extra work when combining
-        ANSIStrings.
+        ANSIStrings. A clean string can be passed without the indexes, which
+        are then only calculated if needed.
 
         """
         string = args[0]
@@ -810,15 +930,19 @@ class ANSIString(str, metaclass=ANSIMeta):
         code_indexes = kwargs.pop("code_indexes", None)
         char_indexes = kwargs.pop("char_indexes", None)
         clean_string = kwargs.pop("clean_string", None)
-        # All True, or All False, not just one.
-        checks = [x is None for x in [code_indexes, char_indexes, clean_string]]
-        if not len(set(checks)) == 1:
+        if (code_indexes is None) != (char_indexes is None) or (
+            code_indexes is not None and clean_string is None
+        ):
             raise ValueError(
-                "You must specify code_indexes, char_indexes, "
-                "and clean_string together, or not at all."
+                "You must specify code_indexes and char_indexes together, "
+                "along with clean_string."
             )
-        if not all(checks):
+        if clean_string is not None:
             decoded = True
+        if code_indexes is not None:
+            code_indexes = array("I", code_indexes)
+            if not isinstance(char_indexes, range):
+                char_indexes = array("I", char_indexes)
         if not decoded:
             # Completely new ANSI String
             clean_string = parser.parse_ansi(string, strip_ansi=True, mxp=MXP_ENABLED)
@@ -829,8 +953,8 @@ class ANSIString(str, metaclass=ANSIMeta):
         elif hasattr(string, "_clean_string"):
             # It's already an ANSIString
             clean_string = string._clean_string
-            code_indexes = string._code_indexes
-            char_indexes = string._char_indexes
+            code_indexes = string._code_table
+            char_indexes = string._char_table
             string = string._raw_string
         else:
             # It's a string that has been pre-ansi decoded.
@@ -842,8 +966,8 @@ class ANSIString(str, metaclass=ANSIMeta):
         ansi_string = super().__new__(ANSIString, to_str(clean_string))
         ansi_string._raw_string = string
         ansi_string._clean_string = clean_string
-        ansi_string._code_indexes = code_indexes
-        ansi_string._char_indexes = char_indexes
+        ansi_string._code_table = code_indexes
+        ansi_string._char_table = char_indexes
         return ansi_string
 
     def __str__(self):
@@ -917,24 +1041,53 @@ class ANSIString(str, metaclass=ANSIMeta):
 
         Finally, _code_indexes and _char_indexes are defined. These are lookup
         tables for which characters in the raw string are related to ANSI
-        escapes, and which are for the readable text.
+        escapes, and which are for the readable text. They are only built when
+        first needed.
 
         """
         self.parser = kwargs.pop("parser", ANSI_PARSER)
         super().__init__()
-        if self._code_indexes is None:
-            self._code_indexes, self._char_indexes = self._get_indexes()
+
+    @property
+    def _code_indexes(self):
+        """
+        The indexes of all ANSI escape characters in the raw string, as an
+        `array` of unsigned ints.
+
+        """
+        if self._code_table is None:
+            self._code_table, self._char_table = self._get_indexes()
+        return self._code_table
+
+    @property
+    def _char_indexes(self):
+        """
+        The indexes of all readable characters in the raw string, as an
+        `array` of unsigned ints, or a `range` if there are no escapes.
+
+        """
+        if self._char_table is None:
+            self._code_table, self._char_table = self._get_indexes()
+        return self._char_table
+
+    def _is_plain(self):
+        """
+        Check if this string has no ANSI escapes, without building the index
+        tables.
+
+        """
+        return len(self._raw_string) == len(self._clean_string)
 
     @staticmethod
     def _shifter(iterable, offset):
         """
-        Takes a list of integers, and produces a new one incrementing all
+        Takes an iterable of integers, and produces a new one incrementing all
         by a number.
 
         """
         if not offset:
             return iterable
-        return [i + offset for i in iterable]
+        return array("I", [i + offset for i in iterable])
 
     @classmethod
     def _adder(cls, first, second):
@@ -945,10 +1098,16 @@ class ANSIString(str, metaclass=ANSIMeta):
 
         raw_string = first._raw_string + second._raw_string
         clean_string = first._clean_string + second._clean_string
-        code_indexes = first._code_indexes[:]
-        char_indexes = first._char_indexes[:]
-        code_indexes.extend(cls._shifter(second._code_indexes, len(first._raw_string)))
-        char_indexes.extend(cls._shifter(second._char_indexes, len(first._raw_string)))
+        if (first._is_plain() and second._is_plain()) or None in (
+            first._code_table,
+            second._code_table,
+        ):
+            # build the tables only if needed
+            return ANSIString(raw_string, clean_string=clean_string)
+        code_indexes = array("I", first._code_table)
+        char_indexes = array("I", first._char_table)
+        code_indexes.extend(cls._shifter(second._code_table, len(first._raw_string)))
+        char_indexes.extend(cls._shifter(second._char_table, len(first._raw_string)))
         return ANSIString(
             raw_string,
             code_indexes=code_indexes,
@@ -1004,6 +1163,9 @@ class ANSIString(str, metaclass=ANSIMeta):
         replayed.
 
         """
+        if self._is_plain() and (slc.step is None or slc.step > 0):
+            string = self._raw_string[slc]
+            return ANSIString(string, clean_string=string)
         char_indexes = self._char_indexes
         slice_indexes = char_indexes[slc]
         # If it's the end of the string, we need to append final color codes.
@@ -1022,25 +1184,39 @@ class ANSIString(str, metaclass=ANSIMeta):
                     # a [x:] slice
                     return ANSIString(self._raw_string[char_indexes[-1] + 1 :])
             return ANSIString("")
+        start = slc.start or 0
+        if slc.step is None or slc.step > 0:
+            # clamp out-of-range starts the same way str does
+            start = range(len(char_indexes))[slc][0]
         try:
-            string = self[slc.start or 0]._raw_string
+            string = self[start]._raw_string
         except IndexError:
             return ANSIString("")
-        last_mark = slice_indexes[0]
-        # Check between the slice intervals for escape sequences.
+        raw_string = self._raw_string
         i = None
-        for i in slice_indexes[1:]:
-            for index in range(last_mark, i):
-                if index in self._code_indexes:
-                    string += self._raw_string[index]
-            last_mark = i
-            try:
-                string += self._raw_string[i]
-            except IndexError:
-                # raw_string not long enough
-                pass
+        if len(slice_indexes) > 1:
+            i = slice_indexes[-1]
+            if slc.step is None or slc.step == 1:
+                # everything between consecutive characters are escape sequences
+                string += raw_string[slice_indexes[0] + 1 : i + 1]
+            else:
+                # Check between the slice intervals for escape sequences.
+                code_indexes = self._code_indexes
+                last_mark = slice_indexes[0]
+                for index in slice_indexes[1:]:
+                    if last_mark < index:
+                        string += "".join(
+                            raw_string[icode]
+                            for icode in code_indexes[
+                                bisect_left(code_indexes, last_mark) : bisect_left(
+                                    code_indexes, index
+                                )
+                            ]
+                        )
+                    last_mark = index
+                    string += raw_string[index]
         if i is not None:
-            append_tail = self._get_interleving(char_indexes.index(i) + 1)
+            append_tail = self._get_interleving(range(len(char_indexes))[slc][-1] + 1)
         else:
             append_tail = ""
         return ANSIString(string + append_tail, decoded=True)
@@ -1056,24 +1232,25 @@ class ANSIString(str, metaclass=ANSIMeta):
         if isinstance(item, slice):
             # Slices must be handled specially.
             return self._slice(item)
+        char_indexes = self._char_indexes
         try:
-            self._char_indexes[item]
+            index = char_indexes[item]
         except IndexError:
             raise IndexError("ANSIString Index out of range")
+        clean = self._raw_string[index]
+        if self._is_plain():
+            return ANSIString(clean, clean_string=clean)
         # Get character codes after the index as well.
-        if self._char_indexes[-1] == self._char_indexes[item]:
+        if char_indexes[-1] == index:
             append_tail = self._get_interleving(item + 1)
         else:
             append_tail = ""
-        item = self._char_indexes[item]
-
-        clean = self._raw_string[item]
-        result = ""
         # Get the character they're after, and replay all escape sequences
         # previous to it.
-        for index in range(0, item + 1):
-            if index in self._code_indexes:
-                result += self._raw_string[index]
+        code_indexes = self._code_indexes
+        result = "".join(
+            self._raw_string[icode] for icode in code_indexes[: bisect_left(code_indexes, index)]
+        )
         return ANSIString(result + clean + append_tail, decoded=True)
 
     def clean(self):
@@ -1146,14 +1323,19 @@ class ANSIString(str, metaclass=ANSIMeta):
 
         """
 
-        code_indexes = []
-        for match in self.parser.ansi_regex.finditer(self._raw_string):
-            code_indexes.extend(list(range(match.start(), match.end())))
-        if not code_indexes:
+        raw_string = self._raw_string
+        if self._is_plain():
             # Plain string, no ANSI codes.
-            return code_indexes, list(range(0, len(self._raw_string)))
-        # all indexes not occupied by ansi codes are normal characters
-        char_indexes = [i for i in range(len(self._raw_string)) if i not in code_indexes]
+            return array("I"), range(len(raw_string))
+        code_indexes = array("I")
+        char_indexes = array("I")
+        last_end = 0
+        for match in self.parser.ansi_regex.finditer(raw_string):
+            # all indexes not occupied by ansi codes are normal characters
+            char_indexes.extend(range(last_end, match.start()))
+            code_indexes.extend(range(match.start(), match.end()))
+            last_end = match.end()
+        char_indexes.extend(range(last_end, len(raw_string)))
         return code_indexes, char_indexes
 
     def _get_interleving(self, index):
@@ -1162,20 +1344,15 @@ class ANSIString(str, metaclass=ANSIMeta):
         character.
 
         """
+        char_indexes = self._char_indexes
         try:
-            index = self._char_indexes[index - 1]
+            start = char_indexes[index - 1]
         except IndexError:
             return ""
-        s = ""
-        while True:
-            index += 1
-            if index in self._char_indexes:
-                break
-            elif index in self._code_indexes:
-                s += self._raw_string[index]
-            else:
-                break
-        return s
+        # everything up until the next character is escape sequences
+        inext = (index - 1) % len(char_indexes) + 1
+        end = char_indexes[inext] if inext < len(char_indexes) else len(self._raw_string)
+        return self._raw_string[start + 1 : end]
 
     def __mul__(self, other):
         """
@@ -1184,19 +1361,7 @@ class ANSIString(str, metaclass=ANSIMeta):
         """
         if not isinstance(other, int):
             return NotImplemented
-        raw_string = self._raw_string * other
-        clean_string = self._clean_string * other
-        code_indexes = self._code_indexes[:]
-        char_indexes = self._char_indexes[:]
-        for i in range(other):
-            code_indexes.extend(self._shifter(self._code_indexes, i * len(self._raw_string)))
-            char_indexes.extend(self._shifter(self._char_indexes, i * len(self._raw_string)))
-        return ANSIString(
-            raw_string,
-            code_indexes=code_indexes,
-            char_indexes=char_indexes,
-            clean_string=clean_string,
-        )
+        return ANSIString(self._raw_string * other, clean_string=self._clean_string * other)
 
     def __rmul__(self, other):
         return self.__mul__(other)
@@ -1428,16 +1593,16 @@ class ANSIString(str, metaclass=ANSIMeta):
                 ANSIString('up, right, left, down')
 
         """
-        result = ANSIString("")
-        last_item = None
+        raw_strings, clean_strings = [], []
         for item in iterable:
-            if last_item is not None:
-                result += self._raw_string
+            if raw_strings:
+                raw_strings.append(self._raw_string)
+                clean_strings.append(self._clean_string)
             if not isinstance(item, ANSIString):
                 item = ANSIString(item)
-            result += item
-            last_item = item
-        return result
+            raw_strings.append(item._raw_string)
+            clean_strings.append(item._clean_string)
+        return ANSIString("".join(raw_strings), clean_string="".join(clean_strings))
 
     def _filler(self, char, amount):
         """
@@ -1445,30 +1610,15 @@ class ANSIString(str, metaclass=ANSIMeta):
         ANSIStrings.
 
         """
-        if not isinstance(char, ANSIString):
-            line = char * amount
-            return ANSIString(
-                char * amount,
-                code_indexes=[],
-                char_indexes=list(range(0, len(line))),
-                clean_string=char,
-            )
-        try:
-            start = char._code_indexes[0]
-        except IndexError:
-            start = None
+        if not isinstance(char, ANSIString) or char._is_plain():
+            line = str(char) * amount
+            return ANSIString(line, clean_string=line)
+        start = char._code_indexes[0]
         end = char._char_indexes[0]
         prefix = char._raw_string[start:end]
         postfix = char._raw_string[end + 1 :]
         line = char._clean_string * amount
-        code_indexes = [i for i in range(0, len(prefix))]
-        length = len(prefix) + len(line)
-        code_indexes.extend([i for i in range(length, length + len(postfix))])
-        char_indexes = self._shifter(list(range(0, len(line))), len(prefix))
-        raw_string = prefix + line + postfix
-        return ANSIString(
-            raw_string, clean_string=line, char_indexes=char_indexes, code_indexes=code_indexes
-        )
+        return ANSIString(prefix + line + postfix, clean_string=line)
 
     # The following methods should not be called with the '_difference' argument explicitly. This is
     # data provided by the wrapper _spacing_preflight.
@@ -19,8 +19,10 @@ be out of sync with the database.
 
 """
 
+import atexit
 from collections import OrderedDict, defaultdict, deque
 from collections.abc import MutableMapping, MutableSequence, MutableSet
+from contextlib import contextmanager
 from functools import update_wrapper
 
 try:
@@ -30,6 +32,7 @@ except ImportError:
 
 from enum import IntFlag
 
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils.safestring import SafeString
@@ -38,7 +41,17 @@ import evennia
 from evennia.utils import logger
 from evennia.utils.utils import is_iter, to_bytes, uses_database
 
-__all__ = ("to_pickle", "from_pickle", "do_pickle", "do_unpickle", "dbserialize", "dbunserialize")
+__all__ = (
+    "to_pickle",
+    "from_pickle",
+    "do_pickle",
+    "do_unpickle",
+    "dbserialize",
+    "dbunserialize",
+    "batch_saves",
+    "flush_saves",
+    "get_save_stats",
+)
 
 PICKLE_PROTOCOL = 2
 
@@ -76,6 +89,15 @@ _SA = object.__setattr__
 _FROM_MODEL_MAP = None
 _TO_MODEL_MAP = None
 _IGNORE_DATETIME_MODELS = None
+_ATTRIBUTE = None
+
+# save-coalescing of in-place modified mutables
+_COALESCE_SAVES = settings.ATTRIBUTE_SAVE_COALESCE
+_DIRTY_ROOTS = {}
+_BATCH_DEPTH = 0
+_FLUSH_SCHEDULED = False
+_FLUSH_AT_EXIT = False
+_SAVE_STATS = {"saves": 0, "avoided": 0}
 
 
 def _IS_PACKED_DBOBJ(o):
@@ -135,6 +157,132 @@ def _init_globals():
             _IGNORE_DATETIME_MODELS.append(src_key)
 
 
+#
+# Save-coalescing. A root _SaverMutable marked as dirty is only written to its
+# Attribute once, when the current batch ends or (with ATTRIBUTE_SAVE_COALESCE)
+# at the end of the current reactor tick. Without a running reactor, such as in
+# `evennia shell` or a standalone script, it is saved right away.
+#
+
+
+def _mark_dirty(root):
+    """
+    Queue a root _SaverMutable for saving instead of saving it immediately.
+
+    Args:
+        root (_SaverMutable): The root of the mutable tree, with a `_db_obj`.
+
+    """
+    global _FLUSH_SCHEDULED, _FLUSH_AT_EXIT
+    key = id(root._db_obj)
+    if key in _DIRTY_ROOTS:
+        _SAVE_STATS["avoided"] += 1
+    _DIRTY_ROOTS[key] = root
+    if not _BATCH_DEPTH and not _FLUSH_SCHEDULED:
+        from twisted.internet import reactor
+
+        if not reactor.running:
+            # no reactor tick will come to flush this (evennia shell, scripts etc)
+            flush_saves()
+            return
+        _FLUSH_SCHEDULED = True
+        reactor.callLater(0, flush_saves)
+        if not _FLUSH_AT_EXIT:
+            # in case the reactor stops before getting to it
+            atexit.register(flush_saves)
+            _FLUSH_AT_EXIT = True
+
+
+def get_pending_value(db_obj):
+    """
+    Get the not-yet saved value of an Attribute.
+
+    Args:
+        db_obj (Attribute): The Attribute to check.
+
+    Returns:
+        _SaverMutable or None: The modified value waiting to be saved to `db_obj`,
+            or `None` if there is no pending save.
+
+    """
+    if _DIRTY_ROOTS:
+        return _DIRTY_ROOTS.get(id(db_obj))
+    return None
+
+
+def discard_pending_save(db_obj):
+    """
+    Drop any pending save for an Attribute, for example because it is being
+    assigned a completely new value.
+
+    Args:
+        db_obj (Attribute): The Attribute to un-queue.
+
+    """
+    if _DIRTY_ROOTS:
+        _DIRTY_ROOTS.pop(id(db_obj), None)
+
+
+def flush_saves():
+    """
+    Write all pending coalesced saves to the database. This is called
+    automatically at the end of a `batch_saves` block or reactor tick, but can
+    also be called manually, such as before a server shutdown.
+
+    """
+    global _FLUSH_SCHEDULED
+    _FLUSH_SCHEDULED = False
+    while _DIRTY_ROOTS:
+        _, root = _DIRTY_ROOTS.popitem()
+        db_obj = root._db_obj
+        if not db_obj.pk:
+            # the Attribute was deleted while its save was pending
+            continue
+        try:
+            db_obj.value = root
+            _SAVE_STATS["saves"] += 1
+        except Exception:
+            logger.log_trace(f"Could not save {root} to Attribute {db_obj}.")
+
+
+@contextmanager
+def batch_saves():
+    """
+    Context manager for coalescing saves of in-place modified mutable Attributes.
+    All changes made inside the block are written with only one save per
+    Attribute when the (outermost) block exits.
+
+    Example:
+    ::
+
+        with batch_saves():
+            for item in loot:
+                obj.db.inventory[item.key] = {"dmg": item.dmg, "weight": item.weight}
+
+    """
+    global _BATCH_DEPTH
+    _BATCH_DEPTH += 1
+    try:
+        yield
+    finally:
+        _BATCH_DEPTH -= 1
+        if not _BATCH_DEPTH:
+            flush_saves()
+
+
+def get_save_stats():
+    """
+    Get statistics for coalesced Attribute saves.
+
+    Returns:
+        dict: With keys `saves` (number of coalesced saves written), `avoided`
+            (number of saves that were merged into another save) and `pending`
+            (number of saves currently waiting to be written).
+
+    """
+    return {**_SAVE_STATS, "pending": len(_DIRTY_ROOTS)}
+
+
 #
 # SaverList, SaverDict, SaverSet - Attribute-specific helper classes and functions
 #
@@ -172,6 +320,7 @@ class _SaverMutable:
 
     def _save_tree(self):
         """recursively traverse back up the tree, save when we reach the root"""
+        global _ATTRIBUTE
         if self._parent:
             self._parent._save_tree()
         elif self._db_obj:
@@ -186,6 +335,12 @@ class _SaverMutable:
                         cls_name=cls_name, obj=self, non_saver_name=non_saver_name
                     )
                 )
+            if _BATCH_DEPTH or _COALESCE_SAVES:
+                if not _ATTRIBUTE:
+                    from evennia.typeclasses.attributes import Attribute as _ATTRIBUTE
+                if isinstance(self._db_obj, _ATTRIBUTE):
+                    _mark_dirty(self)
+                    return
             self._db_obj.value = self
         else:
             logger.log_err("_SaverMutable %s has no root Attribute to save to." % self)
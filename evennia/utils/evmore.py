@@ -33,12 +33,20 @@ to and `justify_kwargs` are kwargs to pass to utils.utils.justify in order to
 change the formatting of the text. The remaining `**kwargs` will be passed on to
 the `caller.msg()` construct every time the page is updated.
 
+Querysets ordered by primary key (or not ordered at all) are paginated by key
+rather than by offset, so jumping to far pages of a large listing does not
+make the database skip over all preceding rows. Generators and other iterators
+without a length are read one page at a time as the reader moves forward.
+
 ----
 
 """
+from collections.abc import Iterable, Sized
+from itertools import islice
+
 from django.conf import settings
 from django.core.paginator import Paginator
-from django.db.models.query import QuerySet
+from django.db.models.query import ModelIterable, QuerySet
 from django.utils.translation import gettext as _
 
 import evennia
@@ -59,6 +67,12 @@ _EVTABLE = None
 
 _LBR = ANSIString("\n")
 
+# how many rendered pages to keep around for moving back and forth
+_PAGE_CACHE_SIZE = 20
+
+# marks that no item has been read ahead from a streamed input
+_NO_ITEM = object()
+
 # text
 
 _DISPLAY = """{text}
@@ -143,6 +157,39 @@ def queryset_maxsize(qs):
     return qs.count()
 
 
+def queryset_keyset_order(qs):
+    """
+    Check if a queryset can be paginated by primary key.
+
+    Args:
+        qs (QuerySet): The queryset to check.
+
+    Returns:
+        str or None: `"pk"` or `"-pk"` if the queryset returns model instances
+            ordered by ascending/descending primary key (unordered querysets
+            count as ascending), otherwise `None`.
+
+    """
+    query = qs.query
+    if (
+        query.is_sliced
+        or query.combinator
+        or query.distinct_fields
+        or query.extra_order_by
+        or qs._iterable_class is not ModelIterable
+    ):
+        return None
+    ordering = tuple(query.order_by)
+    if not ordering and query.default_ordering:
+        ordering = tuple(qs.model._meta.ordering)
+    pkname = qs.model._meta.pk.name
+    if ordering in ((), ("pk",), (pkname,)):
+        return "pk"
+    if ordering in (("-pk",), (f"-{pkname}",)):
+        return "-pk"
+    return None
+
+
 class EvMore(object):
     """
     The main pager object
@@ -176,7 +223,8 @@ class EvMore(object):
                   decorations will be considered in the size of the page.
                 - Otherwise `inp` is converted to an iterator, where each step is
                   expected to be a line in the final display. Each line
-                  will be run through `iter_callable`.
+                  will be run through `iter_callable`. Generators and other
+                  iterators without a length are read page by page as needed.
 
             always_page (bool, optional): If `False`, the
                 pager will only kick in if `inp` is too big
@@ -248,13 +296,22 @@ class EvMore(object):
         self._kwargs = kwargs
 
         self._data = None
+        # page boundaries `{pageno: (first_pk, last_pk)}` for keyset pagination
+        self._keyset_order = None
+        self._keyset_bounds = {}
+        self._nsize = 0
+        # the not yet read remainder of a streamed input
+        self._stream = None
+        self._stream_next = _NO_ITEM
+        # rendered pages `{pageno: text}`
+        self._page_cache = {}
 
         self._pages = []
         self._npos = 0
 
         self._npages = 1
         self._paginator = self.paginator_index
-        self._page_formatter = str
+        self._page_formatter = page_formatter
 
         # set up individual pages for different sessions
         height = max(4, session.protocol_flags.get("SCREENHEIGHT", {0: _SCREEN_HEIGHT})[0] - 4)
@@ -270,6 +327,27 @@ class EvMore(object):
 
     # EvMore functional methods
 
+    def render_page(self, pageno):
+        """
+        Get the formatted text of a page. Rendered pages are cached, so moving back and
+        forth between pages does not need to fetch and format the data again.
+
+        Args:
+            pageno (int): The page number to render, from 0...N-1
+
+        Returns:
+            str: The formatted page, without footer.
+
+        """
+        text = self._page_cache.get(pageno)
+        if text is None:
+            text = self.page_formatter(self.paginator(pageno))
+            if len(self._page_cache) >= _PAGE_CACHE_SIZE:
+                # drop the oldest rendered page
+                del self._page_cache[next(iter(self._page_cache))]
+            self._page_cache[pageno] = text
+        return text
+
     def display(self, show_footer=True):
         """
         Pretty-print the page.
@@ -278,9 +356,11 @@ class EvMore(object):
         text = "[no content]"
         if self._npages > 0:
             pos = self._npos
-            text = self.page_formatter(self.paginator(pos))
+            text = self.render_page(pos)
         if show_footer:
-            page = _DISPLAY.format(text=text, pageno=pos + 1, pagemax=self._npages)
+            # a streamed input may have more pages than read so far
+            pagemax = f"{self._npages}+" if self._stream is not None else self._npages
+            page = _DISPLAY.format(text=text, pageno=pos + 1, pagemax=pagemax)
         else:
             page = text
         # check to make sure our session is still valid
@@ -305,6 +385,8 @@ class EvMore(object):
         """
         Display the bottom page.
         """
+        while self._stream is not None:
+            self.read_stream_page()
         self._npos = self._npages - 1
         self.display()
 
@@ -318,6 +400,9 @@ class EvMore(object):
             self.page_quit()
         else:
             self._npos += 1
+            if self._stream is not None:
+                # reading the page tells if a streamed input has more pages
+                self.render_page(self._npos)
             if self.exit_on_lastpage and self._npos >= (self._npages - 1):
                 self.display(show_footer=False)
                 self.page_quit(quiet=True)
@@ -372,6 +457,46 @@ class EvMore(object):
         """
         return self._data[pageno * self.height : pageno * self.height + self.height]
 
+    def paginator_keyset(self, pageno):
+        """
+        Paginate a queryset by primary key. A page next to an already visited one is
+        fetched as the rows after (or before) that page's last (or first) key, and the
+        last page as the final rows of the queryset. This avoids the database having to
+        skip over all preceding rows, as with an offset. Other pages fall back to
+        slicing by offset.
+
+        """
+        qs, height, order = self._data, self.height, self._keyset_order
+        reverse = "pk" if order == "-pk" else "-pk"
+        after, before = ("pk__lt", "pk__gt") if order == "-pk" else ("pk__gt", "pk__lt")
+        bounds = self._keyset_bounds
+
+        if pageno == 0:
+            page = list(qs.order_by(order)[:height])
+        elif pageno - 1 in bounds:
+            page = list(qs.filter(**{after: bounds[pageno - 1][1]}).order_by(order)[:height])
+        elif pageno + 1 in bounds:
+            page = list(qs.filter(**{before: bounds[pageno + 1][0]}).order_by(reverse)[:height])
+            page.reverse()
+        elif pageno == self._npages - 1:
+            page = list(qs.order_by(reverse)[: self._nsize - pageno * height])
+            page.reverse()
+        else:
+            page = list(qs.order_by(order)[pageno * height : pageno * height + height])
+        if page:
+            bounds[pageno] = (page[0].pk, page[-1].pk)
+        return page
+
+    def paginator_stream(self, pageno):
+        """
+        Paginate a streamed input, reading it until reaching the page. Pages already read
+        are kept so one can move back to them.
+
+        """
+        while pageno >= len(self._data) and self._stream is not None:
+            self.read_stream_page()
+        return self._data[min(pageno, len(self._data) - 1)] if self._data else []
+
     def paginator_django(self, pageno):
         """
         Paginate using the django queryset Paginator API. Note that his is indexed from 1.
@@ -394,9 +519,11 @@ class EvMore(object):
 
     def init_queryset(self, qs):
         """The input is a queryset"""
-        nsize = qs.count()  # we assume each will be a line
+        nsize = queryset_maxsize(qs)  # we assume each will be a line
         self._npages = nsize // self.height + (0 if nsize % self.height == 0 else 1)
+        self._nsize = nsize
         self._data = qs
+        self._keyset_order = queryset_keyset_order(qs)
 
     def init_django_paginator(self, pages):
         """
@@ -412,6 +539,31 @@ class EvMore(object):
         self._npages = nsize // self.height + (0 if nsize % self.height == 0 else 1)
         self._data = inp
 
+    def init_stream(self, inp):
+        """
+        The input is an iterator or other iterable without a length, such as a generator.
+        It is read one page at a time, as it is paginated.
+
+        """
+        self._stream = iter(inp)
+        self._data = []
+        self.read_stream_page()
+
+    def read_stream_page(self):
+        """
+        Read the next page from a streamed input, and one item beyond it to know if
+        there are more pages to come.
+
+        """
+        page = [] if self._stream_next is _NO_ITEM else [self._stream_next]
+        page.extend(islice(self._stream, self.height - len(page)))
+        self._stream_next = next(self._stream, _NO_ITEM)
+        if self._stream_next is _NO_ITEM:
+            self._stream = None
+        if page:
+            self._data.append(page)
+        self._npages = len(self._data) + (0 if self._stream is None else 1)
+
     def init_f_str(self, text):
         """
         The input contains `\\f` markers. We use `\\f` to indicate the user wants to
@@ -464,7 +616,8 @@ class EvMore(object):
 
         Args:
             inp (any): Incoming data to be paginated. By default, handles pagination of
-                strings, querysets, django.Paginator, EvTables and any iterables with strings.
+                strings, querysets, django.Paginator, EvTables and any iterables with strings,
+                including generators.
 
         Notes:
             If overridden, this method must perform the following  actions:
@@ -490,10 +643,14 @@ class EvMore(object):
         elif isinstance(inp, QuerySet):
             # a queryset
             self.init_queryset(inp)
-            self._paginator = self.paginator_slice
+            self._paginator = self.paginator_keyset if self._keyset_order else self.paginator_slice
         elif isinstance(inp, Paginator):
             self.init_django_paginator(inp)
             self._paginator = self.paginator_django
+        elif isinstance(inp, Iterable) and not isinstance(inp, (str, Sized)):
+            # a generator or other iterator of unknown length
+            self.init_stream(inp)
+            self._paginator = self.paginator_stream
         elif not isinstance(inp, str):
             # anything else not a str
             self.init_iterable(inp)
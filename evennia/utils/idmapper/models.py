@@ -4,15 +4,19 @@ Django ID mapper
 Modified for Evennia by making sure that no model references
 leave caching unexpectedly (no use of WeakRefs).
 
-Also adds `cache_size()` for monitoring the size of the cache.
+Also adds `cache_size()` for monitoring the size of the cache and
+gradual, least-recently-used eviction for capping it.
 """
 
 import gc
 import os
+import sys
 import threading
 import time
+from collections import defaultdict
 from weakref import WeakValueDictionary
 
+from django.conf import settings
 from django.core.exceptions import FieldError, ObjectDoesNotExist
 from django.db.models.base import Model, ModelBase
 from django.db.models.signals import post_migrate, post_save, pre_delete
@@ -25,8 +29,21 @@ from evennia.utils.utils import dbref, get_evennia_pids, to_str
 
 from .manager import SharedMemoryManager
 
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
 AUTO_FLUSH_MIN_INTERVAL = 60.0 * 5  # at least 5 mins between cache flushes
 
+# per-model cap on the number of cached instances (None for no cap) and
+# the fraction of each model's cache to evict when memory runs low
+_MAX_INSTANCES = settings.IDMAPPER_CACHE_MAX_INSTANCES
+_EVICT_FRACTION = settings.IDMAPPER_CACHE_EVICT_FRACTION
+# number of evicted instances, per (dbmodel, typeclass path)
+_EVICTIONS = defaultdict(int)
+
 _GA = object.__getattribute__
 _SA = object.__setattr__
 _DA = object.__delattr__
@@ -87,6 +104,10 @@ class SharedMemoryModelBase(ModelBase):
         if not hasattr(dbmodel, "__instance_cache__"):
             # we store __instance_cache__ only on the dbmodel base
             dbmodel.__instance_cache__ = {}
+            # pks looked up since they were last considered for eviction
+            dbmodel.__instance_recent__ = set()
+            # don't try to evict again until the cache is bigger than this
+            dbmodel.__instance_evict_size__ = 0
         super()._prepare()
 
     def __new__(cls, name, bases, attrs):
@@ -299,7 +320,11 @@ class SharedMemoryModel(Model, metaclass=SharedMemoryModelBase):
         done even when instance caching is disabled.
 
         """
-        return cls.__dbclass__.__instance_cache__.get(id)
+        dbclass = cls.__dbclass__
+        instance = dbclass.__instance_cache__.get(id)
+        if instance is not None:
+            dbclass.__instance_recent__.add(id)
+        return instance
 
     @classmethod
     def cache_instance(cls, instance, new=False):
@@ -315,8 +340,10 @@ class SharedMemoryModel(Model, metaclass=SharedMemoryModelBase):
         """
         pk = instance._get_pk_val()
         if pk is not None:
-            new = new or pk not in cls.__dbclass__.__instance_cache__
-            cls.__dbclass__.__instance_cache__[pk] = instance
+            dbclass = cls.__dbclass__
+            cache = dbclass.__instance_cache__
+            new = new or pk not in cache
+            cache[pk] = instance
             if new:
                 try:
                     # trigger the at_init hook only
@@ -325,6 +352,19 @@ class SharedMemoryModel(Model, metaclass=SharedMemoryModelBase):
                 except AttributeError:
                     # The at_init hook is not assigned to all entities
                     pass
+                if _MAX_INSTANCES and len(cache) > max(
+                    _MAX_INSTANCES, dbclass.__instance_evict_size__
+                ):
+                    # evict down to 90% of the cap, so we don't have to
+                    # do this again for every new instance
+                    num = len(cache) - int(_MAX_INSTANCES * 0.9)
+                    if cls.evict_instances(num, exclude=pk) < num:
+                        # too many instances refused to be evicted; wait for the
+                        # cache to grow by another 10% of the cap before sweeping again
+                        margin = max(1, int(_MAX_INSTANCES * 0.1))
+                        dbclass.__instance_evict_size__ = len(cache) + margin
+                    else:
+                        dbclass.__instance_evict_size__ = 0
 
     @classmethod
     def get_all_cached_instances(cls):
@@ -369,6 +409,8 @@ class SharedMemoryModel(Model, metaclass=SharedMemoryModelBase):
         keyword to remove all objects, safe or not.
 
         """
+        cls.__dbclass__.__instance_recent__.clear()
+        cls.__dbclass__.__instance_evict_size__ = 0
         if force:
             cls.__dbclass__.__instance_cache__ = {}
         else:
@@ -380,6 +422,50 @@ class SharedMemoryModel(Model, metaclass=SharedMemoryModelBase):
 
     # flush_instance_cache = classmethod(flush_instance_cache)
 
+    @classmethod
+    def evict_instances(cls, num, exclude=None):
+        """
+        Gradually evict the least recently used instances from the cache. This
+        uses a CLOCK-style approximation of LRU: the cache is swept oldest-first
+        and instances looked up since the last sweep get a second chance by
+        being moved to the back of the line instead of being evicted. Only
+        instances whose `at_idmapper_flush` hook agree will be evicted.
+
+        Args:
+            num (int): The max number of instances to evict.
+            exclude (any, optional): A pk to never evict, such as that of an
+                instance that was just cached.
+
+        Returns:
+            int: The number of instances actually evicted.
+
+        Notes:
+            The cache is modified in-place, since other handlers may
+            keep a reference to it.
+
+        """
+        dbclass = cls.__dbclass__
+        cache = dbclass.__instance_cache__
+        recent = dbclass.__instance_recent__
+        nevicted = 0
+        if num <= 0:
+            return nevicted
+        for pk, instance in list(cache.items()):
+            if nevicted >= num:
+                break
+            if pk == exclude:
+                continue
+            if pk in recent:
+                # second chance - move to the back of the line
+                recent.discard(pk)
+                cache[pk] = cache.pop(pk)
+                continue
+            if instance.at_idmapper_flush():
+                cache.pop(pk, None)
+                _EVICTIONS[(dbclass, _class_path(instance.__class__))] += 1
+                nevicted += 1
+        return nevicted
+
     # per-instance methods
 
     def __eq__(self, other):
@@ -411,6 +497,7 @@ class SharedMemoryModel(Model, metaclass=SharedMemoryModelBase):
         if pk:
             if force or self.at_idmapper_flush():
                 self.__class__.__dbclass__.__instance_cache__.pop(pk, None)
+                self.__class__.__dbclass__.__instance_recent__.discard(pk)
 
     def delete(self, *args, **kwargs):
         """
@@ -520,6 +607,37 @@ class WeakSharedMemoryModel(SharedMemoryModel, metaclass=WeakSharedMemoryModelBa
         abstract = True
 
 
+def _class_path(cls):
+    """
+    Get the python path of a class, used to tell apart typeclasses with the same name.
+
+    """
+    return f"{cls.__module__}.{cls.__name__}"
+
+
+def _get_dbclasses():
+    """
+    Get the database models holding an instance cache.
+
+    Returns:
+        list: Every concrete `SharedMemoryModel` class with its own cache.
+
+    """
+    dbclasses = []
+
+    def get_recurse(submodels):
+        for submodel in submodels:
+            dbclass = getattr(submodel, "__dbclass__", None)
+            if dbclass is not None and not any(
+                dbclass.__instance_cache__ is other.__instance_cache__ for other in dbclasses
+            ):
+                dbclasses.append(dbclass)
+            get_recurse(submodel.__subclasses__())
+
+    get_recurse(SharedMemoryModel.__subclasses__())
+    return dbclasses
+
+
 def flush_cache(**kwargs):
     """
     Flush idmapper cache. When doing so the cache will fire the
@@ -580,9 +698,58 @@ post_save.connect(update_cached_instance)
 LAST_FLUSH = None
 
 
+def get_process_rss():
+    """
+    Get the resident memory (RSS) of the current process, without spawning
+    any external processes.
+
+    Returns:
+        float or None: The resident memory in MB, or `None` if it could not
+            be determined on this platform.
+
+    """
+    try:
+        # Linux - the second field is the number of resident pages
+        with open("/proc/self/statm") as statm:
+            rss_pages = int(statm.read().split()[1])
+        return rss_pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if resource:
+        # no /proc (like on MacOS), fall back to the peak resident memory
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # MacOS reports this in bytes, other unixes in kB
+        return maxrss / 1e6 if sys.platform == "darwin" else maxrss / 1e3
+    return None
+
+
+def evict_cache(fraction=None):
+    """
+    Evict a fraction of the least recently used instances from the cache of
+    each database model. Contrary to `flush_cache`, this leaves the most
+    recently used instances (and those refusing to be flushed) in place.
+
+    Args:
+        fraction (float, optional): The fraction (0..1) of each model's
+            cache to evict. Defaults to `settings.IDMAPPER_CACHE_EVICT_FRACTION`.
+
+    Returns:
+        int: The total number of instances evicted.
+
+    """
+    fraction = _EVICT_FRACTION if fraction is None else fraction
+    nevicted = 0
+    for dbclass in _get_dbclasses():
+        num = int(len(dbclass.__instance_cache__) * fraction)
+        nevicted += dbclass.evict_instances(num)
+    gc.collect()
+    return nevicted
+
+
 def conditional_flush(max_rmem, force=False):
     """
-    Flush the cache if the estimated memory usage exceeds `max_rmem`.
+    Gradually evict the least recently used instances from the cache if the
+    memory usage of the process exceeds `max_rmem`.
 
     The flusher has a timeout to avoid flushing over and over
     in particular situations (this means that for some setups
@@ -590,32 +757,14 @@ def conditional_flush(max_rmem, force=False):
     more memory is probably required for the given game).
 
     Args:
-        max_rmem (int): memory-usage estimation-treshold after which
-            cache is flushed.
+        max_rmem (int): memory-usage treshold (in MB) after which
+            instances are evicted from the cache.
         force (bool, optional): forces a flush, regardless of timeout.
             Defaults to `False`.
 
     """
     global LAST_FLUSH
 
-    def mem2cachesize(desired_rmem):
-        """
-        Estimate the size of the idmapper cache based on the memory
-        desired. This is used to optionally cap the cache size.
-
-        desired_rmem - memory in MB (minimum 50MB)
-
-        The formula is empirically estimated from usage tests (Linux)
-        and is
-            Ncache = RMEM - 35.0 / 0.0157
-        where RMEM is given in MB and Ncache is the size of the cache
-        for this memory usage. VMEM tends to be about 100MB higher
-        than RMEM for large memory usage.
-        """
-        vmem = max(desired_rmem, 50.0)
-        Ncache = int(abs(float(vmem) - 35.0) / 0.0157)
-        return Ncache
-
     if not max_rmem:
         # auto-flush is disabled
         return
@@ -634,25 +783,18 @@ def conditional_flush(max_rmem, force=False):
         )
         return
 
-    if os.name == "nt":
-        # we can't look for mem info in Windows at the moment
+    actual_rmem = get_process_rss()
+    if actual_rmem is None:
+        # we can't get memory info on this platform
         return
 
-    # check actual memory usage
-    Ncache_max = mem2cachesize(max_rmem)
-    Ncache, _ = cache_size()
-    actual_rmem = (
-        float(os.popen("ps -p %d -o %s | tail -1" % (os.getpid(), "rss")).read()) / 1000.0
-    )  # resident memory
-
-    if Ncache >= Ncache_max and actual_rmem > max_rmem * 0.9:
-        # flush cache when number of objects in cache is big enough and our
-        # actual memory use is within 10% of our set max
-        flush_cache()
+    if actual_rmem > max_rmem * 0.9:
+        # our actual memory use is within 10% of our set max
+        evict_cache()
         LAST_FLUSH = now
 
 
-def cache_size(mb=True):
+def cache_size(mb=True, stats=False):
     """
     Calculate statistics about the cache.
 
@@ -663,22 +805,33 @@ def cache_size(mb=True):
     Python is clearly reusing memory behind the scenes that we cannot
     catch in an easy way here.  Ideas are appreciated. /Griatch
 
+    Args:
+        mb (bool, optional): Unused, kept for backwards compatibility.
+        stats (bool, optional): If set, return more detailed statistics
+            for every typeclass rather than just the number of cached instances.
+
     Returns:
-      total_num, {objclass:total_num, ...}
+      total_num, {typeclass_path:total_num, ...} or, if `stats` is set,
+      total_num, {typeclass_path: {"model": dbmodel, "cached": num, "evicted": num}, ...}
 
     """
-    numtotal = [0]  # use mutable to keep reference through recursion
+    numtotal = 0
     classdict = {}
-
-    def get_recurse(submodels):
-        for submodel in submodels:
-            subclasses = submodel.__subclasses__()
-            if not subclasses:
-                num = len(submodel.get_all_cached_instances())
-                numtotal[0] += num
-                classdict[submodel.__dbclass__.__name__] = num
-            else:
-                get_recurse(subclasses)
-
-    get_recurse(SharedMemoryModel.__subclasses__())
-    return numtotal[0], classdict
+    for dbclass in _get_dbclasses():
+        counts = defaultdict(int)
+        for instance in list(dbclass.__instance_cache__.values()):
+            counts[_class_path(instance.__class__)] += 1
+        numtotal += sum(counts.values())
+        if stats:
+            evicted = {
+                path: num for (model, path), num in _EVICTIONS.items() if model is dbclass
+            }
+            for path in set(counts).union(evicted):
+                classdict[path] = {
+                    "model": dbclass.__name__,
+                    "cached": counts.get(path, 0),
+                    "evicted": evicted.get(path, 0),
+                }
+        else:
+            classdict.update(counts)
+    return numtotal, classdict
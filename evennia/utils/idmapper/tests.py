@@ -1,6 +1,9 @@
+from unittest.mock import patch
+
 from django.db import models
 from django.test import TestCase
 
+from . import models as idmapper_models
 from .models import SharedMemoryModel
 
 
@@ -76,3 +79,44 @@ class SharedMemorysTest(TestCase):
         pk = article.pk
         article.delete()
         self.assertEqual(pk not in Article.__instance_cache__, True)
+
+    def testEvictInstances(self):
+        articles = list(Article.objects.all().order_by("id"))
+        cache = Article.__instance_cache__
+        # loading from the database counts as a use
+        Article.__instance_recent__.clear()
+        # the oldest article was used recently, so it gets a second chance
+        Article.get_cached_instance(articles[0].id)
+        self.assertEqual(Article.evict_instances(2), 2)
+        self.assertIn(articles[0].id, cache)
+        self.assertNotIn(articles[1].id, cache)
+        self.assertNotIn(articles[2].id, cache)
+        self.assertEqual(len(cache), len(articles) - 2)
+
+        _, stats = idmapper_models.cache_size(stats=True)
+        stat = stats["evennia.utils.idmapper.tests.Article"]
+        self.assertEqual(stat["model"], "Article")
+        self.assertEqual(stat["cached"], len(articles) - 2)
+        self.assertGreaterEqual(stat["evicted"], 2)
+
+    @patch("evennia.utils.idmapper.models._MAX_INSTANCES", 5)
+    def testMaxInstances(self):
+        Article.flush_instance_cache(force=True)
+        for article in Article.objects.all():
+            Article.cache_instance(article)
+            self.assertLessEqual(len(Article.__instance_cache__), 5)
+
+    @patch("evennia.utils.idmapper.models._MAX_INSTANCES", 5)
+    def testMaxInstancesUnevictable(self):
+        Article.flush_instance_cache(force=True)
+        with patch.object(Article, "evict_instances", return_value=0) as mock_evict:
+            for article in Article.objects.all():
+                Article.cache_instance(article)
+        # after a sweep that evicts nothing, the cache must grow before the next one
+        self.assertEqual(len(Article.__instance_cache__), 10)
+        self.assertEqual(mock_evict.call_count, 3)
+        Article.flush_instance_cache(force=True)
+        self.assertEqual(Article.__instance_evict_size__, 0)
+
+    def testGetProcessRSS(self):
+        self.assertGreater(idmapper_models.get_process_rss(), 0)
@@ -6,15 +6,20 @@ are all directed either to stdout (if Evennia is running in
 interactive mode) or to $GAME_DIR/server/logs.
 
 The log_file() function uses its own threading system to log to
-arbitrary files in $GAME_DIR/server/logs.
+arbitrary files in $GAME_DIR/server/logs. Lines are queued and written in
+batches by a single writer thread, see `LogFileWriter`.
 
 Note: All logging functions have two aliases, log_type() and
 log_typemsg(). This is for historical, back-compatible reasons.
 
 """
 
+import atexit
 import os
+import queue
+import threading
 import time
+from collections import defaultdict
 from datetime import datetime
 from traceback import format_exc
 
@@ -22,6 +27,7 @@ from twisted import logger as twisted_logger
 from twisted.internet.threads import deferToThread
 from twisted.python import logfile
 from twisted.python import util as twisted_util
+from twisted.python.threadable import isInIOThread
 
 log = twisted_logger.Logger()
 
@@ -29,6 +35,7 @@ _LOGDIR = None
 _LOG_ROTATE_SIZE = None
 _TIMEZONE = None
 _CHANNEL_LOG_NUM_TAIL_LINES = None
+_LOG_FILE_WRITER = None
 
 _TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
@@ -485,9 +492,189 @@ def _open_log_file(filename):
     return None
 
 
+class LogFileWriter:
+    """
+    Writes log lines to files on a single worker thread, so logging doesn't
+    compete with the reactor. Lines are queued in a bounded queue and written
+    to their files in batches. Since the file handles are kept open, the files
+    are flushed at most every `flush_interval` seconds, as well as whenever
+    the queue runs empty.
+
+    If the queue is full, `write` blocks for up to `put_timeout` seconds to
+    let the worker catch up (backpressure), after which the line is dropped.
+    On the reactor thread, which must never stall, the line is dropped at once.
+    Dropped lines are counted and reported.
+
+    """
+
+    def __init__(self, maxsize=10000, flush_interval=1.0, put_timeout=1.0):
+        """
+        Args:
+            maxsize (int, optional): Max number of lines to queue.
+            flush_interval (float, optional): Max seconds between flushing the
+                files while there are lines to write.
+            put_timeout (float, optional): How long to wait for room in a full
+                queue before dropping a line. Not used on the reactor thread.
+
+        """
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Start the worker thread, if it's not running already.
+
+        """
+        with self._lock:
+            if not (self._thread and self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name="LogFileWriter", daemon=True)
+                self._thread.start()
+
+    def write(self, filename, line):
+        """
+        Queue a line to be written.
+
+        Args:
+            filename (str): The file to write to, relative to the log dir.
+            line (str): The line to write, including line break.
+
+        Returns:
+            bool: If the line was queued (False if it was dropped).
+
+        """
+        self.start()
+        try:
+            if isInIOThread():
+                self.queue.put_nowait((filename, line))
+            else:
+                self.queue.put((filename, line), timeout=self.put_timeout)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or not self.dropped % 1000:
+                log_warn(
+                    f"Log-file queue is full; dropped {self.dropped} line(s) so far "
+                    f"(last for {filename})."
+                )
+            return False
+        return True
+
+    def flush(self, timeout=None):
+        """
+        Wait for all queued lines to be written and flushed to disk.
+
+        Args:
+            timeout (float, optional): Max seconds to wait. Waits until done if unset.
+
+        """
+        if not (self._thread and self._thread.is_alive()):
+            return
+        done = threading.Event()
+        try:
+            self.queue.put((None, done), timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def stats(self):
+        """
+        Get statistics for the writer.
+
+        Returns:
+            dict: `{"depth": int, "written": int, "batches": int, "dropped": int}`,
+                where `depth` is the number of lines currently waiting in the queue.
+
+        """
+        return {
+            "depth": self.queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+        }
+
+    def _run(self):
+        """
+        The worker loop.
+
+        """
+        dirty = {}
+        last_flush = time.monotonic()
+        while True:
+            try:
+                items = [self.queue.get(timeout=self.flush_interval if dirty else None)]
+            except queue.Empty:
+                items = []
+            # grab everything else waiting, keeping the order per file
+            while True:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = defaultdict(list)
+            flush_events = []
+            for filename, line in items:
+                if filename is None:
+                    flush_events.append(line)
+                else:
+                    lines[filename].append(line)
+
+            for filename, file_lines in lines.items():
+                try:
+                    filehandle = _open_log_file(filename)
+                    if filehandle:
+                        filehandle.write("".join(file_lines))
+                        dirty[filehandle.path] = filehandle
+                        self.written += len(file_lines)
+                except Exception:
+                    log_trace(f"Could not write to log file {filename}.")
+            if lines:
+                self.batches += 1
+
+            now = time.monotonic()
+            if dirty and (
+                flush_events or self.queue.empty() or now - last_flush >= self.flush_interval
+            ):
+                for filehandle in dirty.values():
+                    try:
+                        if not filehandle.closed:
+                            # handles may have been closed and reopened since
+                            filehandle.flush()
+                    except Exception:
+                        log_trace()
+                dirty = {}
+                last_flush = now
+            for event in flush_events:
+                event.set()
+
+
+def _get_log_file_writer():
+    """
+    Get the log file writer, creating it if needed.
+
+    """
+    global _LOG_FILE_WRITER
+    if _LOG_FILE_WRITER is None:
+        from django.conf import settings
+
+        _LOG_FILE_WRITER = LogFileWriter(
+            maxsize=settings.LOG_FILE_QUEUE_SIZE,
+            flush_interval=settings.LOG_FILE_FLUSH_INTERVAL,
+            put_timeout=settings.LOG_FILE_QUEUE_TIMEOUT,
+        )
+        atexit.register(_LOG_FILE_WRITER.flush, timeout=5)
+    return _LOG_FILE_WRITER
+
+
 def log_file(msg, filename="game.log"):
     """
-    Arbitrary file logger using threads.
+    Arbitrary file logger using threads. The line is queued and written
+    in a batch with other lines by the log-file writer thread.
 
     Args:
         msg (str): String to append to logfile.
@@ -496,24 +683,36 @@ def log_file(msg, filename="game.log"):
             on new lines following datetime info.
 
     """
+    # save to server/logs/ directory
+    _get_log_file_writer().write(filename, "\n%s [-] %s" % (timeformat(), msg.strip()))
 
-    def callback(filehandle, msg):
-        """Writing to file and flushing result"""
-        msg = "\n%s [-] %s" % (timeformat(), msg.strip())
-        filehandle.write(msg)
-        # since we don't close the handle, we need to flush
-        # manually or log file won't be written to until the
-        # write buffer is full.
-        filehandle.flush()
 
-    def errback(failure):
-        """Catching errors to normal log"""
-        log_trace()
+def flush_log_files(timeout=None):
+    """
+    Wait until all lines queued with `log_file` are written to disk. This is
+    called when the server shuts down.
 
-    # save to server/logs/ directory
-    filehandle = _open_log_file(filename)
-    if filehandle:
-        deferToThread(callback, filehandle, msg).addErrback(errback)
+    Args:
+        timeout (float, optional): Max seconds to wait. Waits until done if unset.
+
+    """
+    if _LOG_FILE_WRITER:
+        _LOG_FILE_WRITER.flush(timeout=timeout)
+
+
+def log_file_stats():
+    """
+    Get statistics about the `log_file` writer.
+
+    Returns:
+        dict: `{"depth": int, "written": int, "batches": int, "dropped": int}`,
+            where `depth` is the number of lines waiting to be written, `written`
+            the total number of lines written and `batches` the number of
+            batched writes these were done in. `dropped` counts lines lost
+            because the queue was full.
+
+    """
+    return _get_log_file_writer().stats()
 
 
 def log_file_exists(filename="game.log"):
@@ -6,9 +6,14 @@ Test of the ANSI parsing and ANSIStrings.
 
 """
 
+from collections import OrderedDict
+from unittest.mock import patch
+
 from django.test import TestCase
 
+from evennia.utils import ansi
 from evennia.utils.ansi import ANSIString as AN
+from evennia.utils.text2html import parse_html
 
 
 class TestANSIString(TestCase):
@@ -52,3 +57,87 @@ class TestANSIString(TestCase):
         self.assertEqual(split2, split3, "Split 2 and 3 differ")
         self.assertEqual(split1, split2, "Split 1 and 2 differ")
         self.assertEqual(split1, split3, "Split 1 and 3 differ")
+
+    def test_lazy_indexes(self):
+        self.assertIsNone(self.example_ansi._code_table)
+        self.assertEqual(self.example_ansi[9:], "boogaloo")
+        self.assertEqual(self.example_ansi._code_indexes.typecode, "I")
+        self.assertEqual(len(self.example_ansi._char_indexes), 17)
+        plain = AN("plain text")
+        self.assertEqual(plain[6:], "text")
+        self.assertEqual(plain._char_indexes, range(10))
+
+    def test_fill_and_join(self):
+        centered = AN("|rabc|n").center(9)
+        self.assertEqual(len(centered), 9)
+        self.assertEqual(centered.clean(), "   abc   ")
+        self.assertEqual(AN("||").join(["a", AN("|rb|n")]).clean(), "a|b")
+        self.assertEqual((AN("|rab|n") * 2)[2].raw(), "\x1b[1m\x1b[31m\x1b[0m\x1b[1m\x1b[31ma")
+
+
+class TestANSIParser(TestCase):
+    """
+    Verifies the tokenizing parser and its caching.
+
+    """
+
+    def setUp(self):
+        self.parser = ansi.ANSI_PARSER
+
+    def test_tokenize(self):
+        self.assertEqual(
+            self.parser.tokenize("||r|rRed|[=a|#ff0000|[r|n"),
+            (
+                (None, "|"),
+                (None, "r"),
+                ("ansi", "|r"),
+                (None, "Red"),
+                ("gbg", "|[=a"),
+                ("hex", "|#ff0000"),
+                ("bg", "|[500"),
+                ("ansi", "|n"),
+            ),
+        )
+
+    def test_render_profiles(self):
+        string = "|#ff0000red|n |[500bg|n"
+        self.assertEqual(
+            self.parser.parse_ansi(string, truecolor=True, xterm256=True),
+            "\x1b[38;2;255;0;0mred\x1b[0m \x1b[48;5;196mbg\x1b[0m",
+        )
+        self.assertEqual(
+            self.parser.parse_ansi(string, xterm256=True),
+            "\x1b[38;5;196mred\x1b[0m \x1b[48;5;196mbg\x1b[0m",
+        )
+        self.assertEqual(
+            self.parser.parse_ansi(string),
+            "\x1b[1m\x1b[31mred\x1b[0m \x1b[41mbg\x1b[0m",
+        )
+        self.assertEqual(self.parser.parse_ansi(string, strip_ansi=True), "red bg")
+
+    def test_mxp(self):
+        string = "|lclook|ltLook here|le"
+        self.assertEqual(self.parser.parse_ansi(string, mxp=True), string)
+        self.assertEqual(self.parser.parse_ansi(string), "Look here")
+
+    def test_tokenized_once(self):
+        string = "|gTokenized once|n"
+        with patch.object(ansi.ANSIParser, "tokenize", wraps=self.parser.tokenize) as mock_tokenize:
+            for strip_ansi in (False, True):
+                for xterm256 in (False, True):
+                    self.parser.parse_ansi(string, strip_ansi=strip_ansi, xterm256=xterm256)
+            parse_html(string)
+            parse_html(string, strip_ansi=True)
+        mock_tokenize.assert_called_once_with(string)
+        # 4 ansi profiles, plus html and the ansi it is made from, with and without color
+        self.assertEqual(len(ansi._PARSE_CACHE[string][1]), 8)
+
+    def test_cache_size(self):
+        # start from an empty cache, strings parsed by earlier tests would be cache hits
+        with patch.object(ansi, "_PARSE_CACHE", OrderedDict()), patch.object(
+            ansi, "_PARSE_CACHE_SIZE", 2
+        ):
+            for string in ("|rone", "|rtwo", "|rthree"):
+                self.parser.parse_ansi(string)
+            self.assertNotIn("|rone", ansi._PARSE_CACHE)
+            self.assertIn("|rthree", ansi._PARSE_CACHE)
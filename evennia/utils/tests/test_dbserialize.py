@@ -4,14 +4,21 @@ Tests for dbserialize module
 
 from collections import defaultdict, deque
 from enum import IntFlag, auto
+from unittest.mock import patch
 
 from django.test import TestCase
 from parameterized import parameterized
+from twisted.internet import reactor
 
 from evennia.objects.objects import DefaultObject
 from evennia.utils import dbserialize
 
 
+def from_db_value(attr):
+    "Get the value of an Attribute as currently stored in the database"
+    return dbserialize.from_pickle(type(attr).objects.get(id=attr.id).db_value)
+
+
 class TestDbSerialize(TestCase):
     """
     Database serialization operations.
@@ -54,6 +61,58 @@ class TestDbSerialize(TestCase):
         self.obj.db.test.reverse()
         self.assertEqual(self.obj.db.test, [3, 2, 1.5])
 
+    def test_batch_saves(self):
+        self.obj.db.test = {"sword": {"dmg": 1}}
+        attr = self.obj.attributes.get("test", return_obj=True)
+        stats = dbserialize.get_save_stats()
+        with dbserialize.batch_saves():
+            for dmg in range(2, 6):
+                self.obj.db.test["sword"]["dmg"] = dmg
+            self.obj.db.test["shield"] = {"def": 3}
+            # not yet saved to the database, but reading gives the new value
+            self.assertEqual(from_db_value(attr), {"sword": {"dmg": 1}})
+            self.assertEqual(self.obj.db.test["sword"]["dmg"], 5)
+        self.assertEqual(from_db_value(attr), {"sword": {"dmg": 5}, "shield": {"def": 3}})
+        new_stats = dbserialize.get_save_stats()
+        self.assertEqual(new_stats["saves"] - stats["saves"], 1)
+        self.assertEqual(new_stats["avoided"] - stats["avoided"], 4)
+        self.assertEqual(new_stats["pending"], 0)
+
+    def test_coalesced_saves(self):
+        self.obj.db.test = [1, 2]
+        attr = self.obj.attributes.get("test", return_obj=True)
+        with (
+            patch.object(dbserialize, "_COALESCE_SAVES", True),
+            patch.object(reactor, "running", True),
+            patch.object(reactor, "callLater") as mock_call_later,
+        ):
+            self.obj.db.test.append(3)
+            self.obj.db.test.append(4)
+            self.assertEqual(from_db_value(attr), [1, 2])
+            # saved at the end of the reactor tick
+            mock_call_later.assert_called_once_with(0, dbserialize.flush_saves)
+            dbserialize.flush_saves()
+        self.assertEqual(from_db_value(attr), [1, 2, 3, 4])
+
+    def test_coalesced_saves__no_reactor(self):
+        self.obj.db.test = [1, 2]
+        attr = self.obj.attributes.get("test", return_obj=True)
+        with (
+            patch.object(dbserialize, "_COALESCE_SAVES", True),
+            patch.object(reactor, "running", False),
+        ):
+            self.obj.db.test.append(3)
+            # no reactor tick to wait for, so saved right away
+            self.assertEqual(from_db_value(attr), [1, 2, 3])
+
+    def test_batch_saves__replace_value(self):
+        self.obj.db.test = [1, 2]
+        with dbserialize.batch_saves():
+            self.obj.db.test.append(3)
+            # a full replacement overrides the pending in-place change
+            self.obj.db.test = ["new"]
+        self.assertEqual(self.obj.db.test, ["new"])
+
     def test_saverlist__sort(self):
         self.obj.db.test = [3, 2, 1.5]
         self.obj.db.test.sort()
@@ -0,0 +1,104 @@
+"""
+Tests for the EvMore pager
+
+"""
+
+from unittest.mock import MagicMock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from evennia.objects.models import ObjectDB
+from evennia.utils import create, evmore
+from evennia.utils.test_resources import BaseEvenniaTest
+
+
+class TestEvMore(BaseEvenniaTest):
+    def setUp(self):
+        super().setUp()
+        # gives 5 lines per page
+        self.session.protocol_flags["SCREENHEIGHT"] = {0: 9}
+        self.account.msg = MagicMock()
+
+    def _page(self):
+        return self.account.msg.call_args.kwargs["text"][0]
+
+    def _keys(self, page):
+        return ",".join(obj.key for obj in page)
+
+    def test_queryset_keyset(self):
+        for i in range(12):
+            create.create_object("evennia.objects.objects.DefaultObject", key=f"evmore{i:02}")
+        query = ObjectDB.objects.filter(db_key__startswith="evmore")
+
+        more = evmore.EvMore(self.account, query, session=self.session, page_formatter=self._keys)
+        self.assertEqual(more._paginator, more.paginator_keyset)
+        self.assertIn("evmore00,evmore01,evmore02,evmore03,evmore04", self._page())
+        self.assertIn("[1/3]", self._page())
+
+        with CaptureQueriesContext(connection) as queries:
+            more.page_end()
+            self.assertIn("evmore10,evmore11", self._page())
+            more.page_back()
+            self.assertIn("evmore05,evmore06,evmore07,evmore08,evmore09", self._page())
+        self.assertEqual(len(queries), 2)
+        self.assertFalse(any("OFFSET" in query["sql"] for query in queries))
+
+        # visited pages are not fetched again
+        with CaptureQueriesContext(connection) as queries:
+            more.page_back()
+            self.assertIn("evmore00,evmore01", self._page())
+            more.page_end()
+            self.assertIn("evmore10,evmore11", self._page())
+        self.assertEqual(len(queries), 0)
+
+        more.page_quit()
+        more = evmore.EvMore(
+            self.account, query.order_by("-id"), session=self.session, page_formatter=self._keys
+        )
+        more.page_end()
+        self.assertIn("evmore01,evmore00", self._page())
+        more.page_back()
+        self.assertIn("evmore06,evmore05,evmore04,evmore03,evmore02", self._page())
+        more.page_quit()
+
+        # other orderings are sliced by offset
+        more = evmore.EvMore(
+            self.account, query.order_by("db_key"), session=self.session, page_formatter=self._keys
+        )
+        self.assertEqual(more._paginator, more.paginator_slice)
+        more.page_quit()
+
+    def test_stream(self):
+        nread = []
+
+        def _lines():
+            for i in range(12):
+                nread.append(i)
+                yield f"line{i}"
+
+        more = evmore.EvMore(self.account, _lines(), session=self.session, page_formatter="\n".join)
+        # one page is read, plus one line to know there is more
+        self.assertEqual(len(nread), 6)
+        self.assertIn("line0\nline1\nline2\nline3\nline4\n", self._page())
+        self.assertIn("[1/2+]", self._page())
+
+        more.page_next()
+        self.assertEqual(len(nread), 11)
+        self.assertIn("line5\nline6\nline7\nline8\nline9\n", self._page())
+        self.assertIn("[2/3+]", self._page())
+
+        more.page_end()
+        self.assertEqual(len(nread), 12)
+        self.assertIn("line10\nline11\n", self._page())
+        self.assertIn("[3/3]", self._page())
+
+        more.page_top()
+        self.assertIn("line0\nline1\nline2\nline3\nline4\n", self._page())
+        more.page_quit()
+
+    def test_short_stream(self):
+        evmore.EvMore(
+            self.account, (f"line{i}" for i in range(3)), session=self.session, page_formatter=str
+        )
+        self.assertEqual(self._page(), "['line0', 'line1', 'line2']")
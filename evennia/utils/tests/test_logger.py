@@ -0,0 +1,82 @@
+"""
+Tests for the logger's batched log-file writer.
+
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase, mock
+
+from evennia.utils import logger
+
+
+class TestLogFileWriter(TestCase):
+    def setUp(self):
+        self.logdir = tempfile.mkdtemp()
+        self.patcher = mock.patch.object(logger, "_LOGDIR", self.logdir)
+        self.patcher.start()
+        self.writer = logger.LogFileWriter(maxsize=10, flush_interval=0.1, put_timeout=0.01)
+
+    def tearDown(self):
+        self.writer.flush(timeout=5)
+        for filehandle in list(logger._LOG_FILE_HANDLES.values()):
+            if filehandle.path.startswith(self.logdir):
+                filehandle.close()
+                del logger._LOG_FILE_HANDLES[filehandle.path]
+        self.patcher.stop()
+        shutil.rmtree(self.logdir)
+
+    def _read(self, filename):
+        with open(os.path.join(self.logdir, filename)) as fil:
+            return fil.read()
+
+    def test_write(self):
+        for inum in range(5):
+            self.writer.write("test1.log", f"\nline{inum}")
+        self.writer.write("test2.log", "\nother line")
+        self.writer.flush(timeout=5)
+        self.assertEqual(self._read("test1.log"), "".join(f"\nline{inum}" for inum in range(5)))
+        self.assertEqual(self._read("test2.log"), "\nother line")
+        stats = self.writer.stats()
+        self.assertEqual(stats["depth"], 0)
+        self.assertEqual(stats["written"], 6)
+        self.assertEqual(stats["dropped"], 0)
+        self.assertLessEqual(stats["batches"], 6)
+
+    @mock.patch("evennia.utils.logger.log_warn")
+    def test_backpressure(self, mock_log_warn):
+        # don't start the worker, so the queue fills up
+        with mock.patch.object(self.writer, "start"):
+            results = [self.writer.write("test.log", f"\nline{inum}") for inum in range(12)]
+        self.assertEqual(results, [True] * 10 + [False] * 2)
+        self.assertEqual(self.writer.stats()["depth"], 10)
+        self.assertEqual(self.writer.stats()["dropped"], 2)
+        mock_log_warn.assert_called_once()
+        # the queued lines are written once the worker starts
+        self.writer.start()
+        self.writer.flush(timeout=5)
+        self.assertEqual(self._read("test.log").count("\nline"), 10)
+
+    @mock.patch("evennia.utils.logger.isInIOThread", return_value=True)
+    @mock.patch("evennia.utils.logger.log_warn")
+    def test_full_queue_on_reactor_thread(self, mock_log_warn, mock_in_io_thread):
+        self.writer.put_timeout = 10
+        with mock.patch.object(self.writer, "start"):
+            for inum in range(10):
+                self.writer.write("test.log", f"\nline{inum}")
+            # the reactor thread doesn't wait for room in the queue
+            start = time.monotonic()
+            self.assertFalse(self.writer.write("test.log", "\ndropped"))
+            self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(self.writer.stats()["dropped"], 1)
+        mock_log_warn.assert_called_once()
+        self.writer.start()
+
+    def test_log_file(self):
+        with mock.patch.object(logger, "_LOG_FILE_WRITER", self.writer):
+            logger.log_file("  Hello world ", filename="test.log")
+            logger.flush_log_files(timeout=5)
+            self.assertEqual(logger.log_file_stats()["written"], 1)
+        self.assertTrue(self._read("test.log").endswith(" [-] Hello world"))
@@ -740,6 +740,68 @@ class TestDelay(BaseEvenniaTest):
         )  # Clock must advance to trigger, even if past timedelay
         self.assertEqual(self.char1.ndb.dummy_var, "dummy_func ran")
 
+    def test_add_many(self):
+        from evennia.server.models import ServerConfig
+
+        _TASK_HANDLER.clear()
+        tasks = _TASK_HANDLER.add_many(
+            [(self.timedelay, dummy_func, (self.char1.dbref,), {"persistent": True})] * 3
+            + [(self.timedelay * 2, dummy_func, (self.char1.dbref,), {})]
+        )
+        self.assertEqual([task.get_id() for task in tasks], [1, 2, 3, 4])
+        self.assertEqual(sorted(_TASK_HANDLER.to_save), [1, 2, 3])
+        self.assertEqual(
+            ServerConfig.objects.filter(db_key__startswith="delayed_task_").count(), 3
+        )
+        # each task is stored separately
+        tasks[0].remove()
+        self.assertEqual(
+            ServerConfig.objects.filter(db_key__startswith="delayed_task_").count(), 2
+        )
+        self.assertEqual(_TASK_HANDLER.add(self.timedelay, dummy_func).get_id(), 1)
+        # emulate a server restart
+        _TASK_HANDLER.clear(False)
+        _TASK_HANDLER.load()
+        _TASK_HANDLER.create_delays()
+        self.assertEqual(sorted(_TASK_HANDLER.tasks), [2, 3])
+        _TASK_HANDLER.clock.advance(self.timedelay)
+        self.assertEqual(self.char1.ndb.dummy_var, "dummy_func ran")
+        self.assertFalse(_TASK_HANDLER.tasks)
+        self.assertFalse(ServerConfig.objects.filter(db_key__startswith="delayed_task_").exists())
+
+    def test_add_many_unpicklable(self):
+        from evennia.server.models import ServerConfig
+
+        _TASK_HANDLER.clear()
+        with self.assertRaises(ValueError):
+            _TASK_HANDLER.add_many(
+                [
+                    (self.timedelay, dummy_func, (self.char1.dbref,), {"persistent": True}),
+                    (self.timedelay, lambda: None, (), {"persistent": True}),
+                ]
+            )
+        # none of the tasks are left behind
+        self.assertFalse(_TASK_HANDLER.tasks)
+        self.assertFalse(ServerConfig.objects.filter(db_key__startswith="delayed_task_").exists())
+        self.assertEqual(_TASK_HANDLER.add(self.timedelay, dummy_func).get_id(), 1)
+
+    def test_load_legacy(self):
+        from evennia.server.models import ServerConfig
+        from evennia.utils.dbserialize import dbserialize
+
+        _TASK_HANDLER.clear()
+        ServerConfig.objects.conf(
+            "delayed_tasks",
+            {5: dbserialize((datetime.now(), dummy_func, [self.char1.dbref], {}))},
+        )
+        _TASK_HANDLER.load()
+        _TASK_HANDLER.create_delays()
+        self.assertEqual(list(_TASK_HANDLER.tasks), [5])
+        self.assertIsNone(ServerConfig.objects.conf("delayed_tasks"))
+        self.assertTrue(ServerConfig.objects.conf("delayed_task_5"))
+        _TASK_HANDLER.clock.advance(0)
+        self.assertEqual(self.char1.ndb.dummy_var, "dummy_func ran")
+
 
 class TestIntConversions(TestCase):
     def test_int2str(self):
@@ -404,6 +404,21 @@ class TextToHTMLparser(object):
         Returns:
             text (str): Parsed text.
 
+        Notes:
+            The result is cached together with the text's other renderings
+            in the ANSI parser's cache.
+
+        """
+        if not text:
+            return self._parse(text, strip_ansi=strip_ansi)
+        return ANSI_PARSER.cached_render(
+            text, (self.__class__, strip_ansi), lambda txt: self._parse(txt, strip_ansi=strip_ansi)
+        )
+
+    def _parse(self, text, strip_ansi=False):
+        """
+        Do the actual conversion for `parse`.
+
         """
         # parse everything to ansi first
         text = parse_ansi(text, strip_ansi=strip_ansi, xterm256=True, mxp=True, truecolor=True)